@@ -0,0 +1 @@
+"""Standalone performance benchmarks for the pipeline (run with ``python -m benchmarks.<name>``)."""
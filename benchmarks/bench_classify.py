@@ -0,0 +1,93 @@
+"""Benchmark: Aho-Corasick topic classifier vs. a per-keyword regex scan.
+
+Usage:
+    python -m benchmarks.bench_classify [--items N] [--keywords 50,500,5000]
+
+Tags N synthetic items (title + 400-character snippet) against topic sets
+of growing size, built from the real topics.yaml keywords plus synthetic
+ones, and prints the compile time and the per-item cost of:
+
+  * regex     — one word-bounded ``re.search`` per keyword per item
+  * automaton — ``pipeline.classify.KeywordClassifier`` (one pass per item)
+"""
+
+import argparse
+import random
+import re
+import time
+from typing import Dict, List, Tuple
+
+import yaml
+
+from pipeline.classify import KeywordClassifier
+
+WORDS = (
+    "agent model release update copilot server protocol azure preview support fix tool workflow "
+    "context eval benchmark extension insiders vscode foundry openai streaming api sdk build"
+).split()
+
+
+def topics(keyword_count: int, seed: int = 3) -> List[Dict]:
+    with open("topics/topics.yaml", encoding="utf-8") as fh:
+        real = yaml.safe_load(fh)["topics"]
+    rng = random.Random(seed)
+    out = [dict(t) for t in real]
+    have = sum(len(t.get("keywords", [])) for t in out)
+    i = 0
+    while have < keyword_count:
+        kws = [f"{rng.choice(WORDS)} {rng.choice(WORDS)}{i}-{j}" for j in range(10)]
+        out.append({"id": f"synthetic-{i}", "keywords": kws})
+        have += len(kws)
+        i += 1
+    return out
+
+
+def texts(n: int, seed: int = 5) -> List[Tuple[str, str]]:
+    rng = random.Random(seed)
+    out = []
+    for _ in range(n):
+        title = " ".join(rng.choice(WORDS) for _ in range(8)).title()
+        snippet = " ".join(rng.choice(WORDS) for _ in range(60))[:400]
+        out.append((title, snippet))
+    return out
+
+
+def regex_classifier(topics_config: List[Dict]):
+    compiled = [
+        (t["id"], [re.compile(rf"(?<!\w){re.escape(k.lower())}(?!\w)") for k in t.get("keywords", [])])
+        for t in topics_config
+    ]
+
+    def classify(*parts: str) -> List[str]:
+        texts = [" ".join(part.lower().split()) for part in parts]
+        return [tid for tid, patterns in compiled if any(p.search(t) for p in patterns for t in texts)]
+
+    return classify
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--items", type=int, default=1000)
+    parser.add_argument("--keywords", default="50,500,5000")
+    args = parser.parse_args()
+
+    corpus = texts(args.items)
+    print(f"{'keywords':>9}{'method':>11}{'compile':>10}{'us/item':>10}{'tagged':>8}")
+    for count in (int(k) for k in args.keywords.split(",")):
+        config = topics(count)
+        kw_total = sum(len(t.get("keywords", [])) for t in config)
+        for label, build in (
+            ("regex", regex_classifier),
+            ("automaton", lambda cfg: KeywordClassifier(cfg).classify),
+        ):
+            start = time.perf_counter()
+            classify = build(config)
+            compile_t = time.perf_counter() - start
+            start = time.perf_counter()
+            tagged = sum(1 for title, snippet in corpus if classify(title, snippet))
+            per_item = (time.perf_counter() - start) / len(corpus) * 1e6
+            print(f"{kw_total:>9}{label:>11}{compile_t * 1000:>8.1f}ms{per_item:>10.1f}{tagged:>8}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,80 @@
+"""Benchmark: MinHash/LSH near-duplicate detection vs. all-pairs Jaccard.
+
+Usage:
+    python -m benchmarks.bench_dedupe [--sizes 1000,10000,100000] [--dup-rate 0.1] [--threshold 0.8]
+
+Builds N synthetic items (9-word titles, ~60-word snippets) of which a
+fraction are copies of another item with one or two words changed, as when
+one announcement arrives from several sources, then prints the time of
+``pipeline.dedupe.near_duplicate_clusters`` and its recall of the planted
+copies.  For sizes up to --pairs-max it also times an exact all-pairs
+Jaccard scan over the same shingles, which grows quadratically.
+"""
+
+import argparse
+import random
+import time
+from itertools import combinations
+from typing import List, Set, Tuple
+
+from pipeline.dedupe import near_duplicate_clusters
+from pipeline.item import Item
+from pipeline.relevance import terms
+
+
+def items(n: int, dup_rate: float, seed: int = 2) -> Tuple[List[Item], List[Tuple[int, int]]]:
+    rng = random.Random(seed)
+    letters = "abcdefghijklmnopqrstuvwxyz"
+    vocab = ["".join(rng.choice(letters) for _ in range(rng.randint(3, 9))) for _ in range(20000)]
+    out: List[Item] = []
+    planted = []
+    for i in range(n):
+        if out and rng.random() < dup_rate:
+            src = rng.randrange(len(out))
+            words = (out[src].title + " " + out[src].snippet).split()
+            for _ in range(rng.randint(1, 2)):
+                words[rng.randrange(9, len(words))] = rng.choice(vocab)
+            planted.append((src, i))
+        else:
+            words = [rng.choice(vocab) for _ in range(9 + rng.randint(40, 70))]
+        out.append(Item(id=f"{i:016x}", title=" ".join(words[:9]), snippet=" ".join(words[9:])))
+    return out, planted
+
+
+def shingles(item: Item, k: int = 2) -> Set[tuple]:
+    words = terms(f"{item.title} {item.snippet}")
+    return {tuple(words[i:i + k]) for i in range(len(words))}
+
+
+def all_pairs(data: List[Item], threshold: float) -> int:
+    sets = [shingles(item) for item in data]
+    return sum(1 for a, b in combinations(sets, 2) if len(a & b) >= threshold * len(a | b))
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--sizes", default="1000,10000,100000")
+    parser.add_argument("--dup-rate", type=float, default=0.1)
+    parser.add_argument("--threshold", type=float, default=0.8)
+    parser.add_argument("--pairs-max", type=int, default=2000)
+    args = parser.parse_args()
+
+    print(f"{'items':>8}{'minhash/lsh':>13}{'us/item':>9}{'clusters':>10}{'recall':>8}{'all-pairs':>11}")
+    for n in (int(s) for s in args.sizes.split(",")):
+        data, planted = items(n, args.dup_rate)
+        start = time.perf_counter()
+        clusters = near_duplicate_clusters(data, threshold=args.threshold)
+        lsh_t = time.perf_counter() - start
+        cluster_of = {i: c for c, members in enumerate(clusters) for i in members}
+        found = sum(1 for a, b in planted if a in cluster_of and cluster_of.get(a) == cluster_of.get(b))
+        recall = found / len(planted) if planted else 1.0
+        pairs = "-"
+        if n <= args.pairs_max:
+            start = time.perf_counter()
+            all_pairs(data, args.threshold)
+            pairs = f"{time.perf_counter() - start:.3f}s"
+        print(f"{n:>8}{lsh_t:>12.3f}s{lsh_t / n * 1e6:>9.1f}{len(clusters):>10}{recall:>8.1%}{pairs:>11}")
+
+
+if __name__ == "__main__":
+    main()
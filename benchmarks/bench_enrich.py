@@ -0,0 +1,116 @@
+"""Benchmark: compiled enrichment rules vs. the per-item topic-map lookup.
+
+Usage:
+    python -m benchmarks.bench_enrich [--items N] [--topics 30,1000,10000] [--rules 20]
+
+Enriches N synthetic items (each tagged with 1-3 topics) against topic
+catalogs of growing size, built from the real topics.yaml entries plus
+synthetic ones, and prints the time per batch of:
+
+  * per-item — the original helpers, which rebuild ``{id: topic}`` for
+    every item and field (topic templates only)
+  * compiled — ``pipeline.enrichment.compile_rules(...).apply``, first call
+    (compile + apply) and a warm call on fresh items (topic templates only)
+  * +rules   — the compiled engine with R source/keyword rules added
+"""
+
+import argparse
+import random
+import time
+from typing import Dict, List
+
+import yaml
+
+from pipeline.enrichment import compile_rules, default_action, default_why
+from pipeline.item import Item
+
+SOURCE_TYPES = ("github_release", "rss", "rss_official", "reddit")
+WORDS = "agent model release update deprecated breaking change preview sdk server tool fix".split()
+
+
+def topics(count: int) -> List[Dict]:
+    with open("topics/topics.yaml", encoding="utf-8") as fh:
+        out = [dict(t) for t in yaml.safe_load(fh)["topics"]]
+    for i in range(len(out), count):
+        out.append({
+            "id": f"synthetic-{i}",
+            "why_matters_template": f"Synthetic topic {i} matters.",
+            "action_template": f"Act on synthetic topic {i}.",
+        })
+    return out
+
+
+def rules(count: int) -> List[Dict]:
+    out = [{"keywords": ["breaking change", "deprecated"], "priority": 10, "why": "Breaking.", "action": "Check."}]
+    for i in range(1, count):
+        out.append({"source": f"source-{i}", "why": f"From source {i}."})
+    return out
+
+
+def items(n: int, topics_config: List[Dict], seed: int = 7) -> List[Item]:
+    rng = random.Random(seed)
+    ids = [t["id"] for t in topics_config]
+    return [
+        Item(
+            title=" ".join(rng.choice(WORDS) for _ in range(8)),
+            snippet=" ".join(rng.choice(WORDS) for _ in range(40)),
+            source=f"source-{rng.randrange(40)}",
+            source_type=rng.choice(SOURCE_TYPES),
+            topics=rng.sample(ids, rng.randint(1, 3)),
+        )
+        for _ in range(n)
+    ]
+
+
+def per_item_enrich(batch: List[Item], topics_config: List[Dict]) -> None:
+    def lookup(item: Item, key: str, default) -> str:
+        topic_map = {t["id"]: t for t in topics_config}
+        for tid in item.get("topics", []):
+            tpl = topic_map.get(tid, {}).get(key, "")
+            if tpl:
+                return tpl
+        return default(item.get("source_type", ""))
+
+    for item in batch:
+        if not item.why_it_matters:
+            item.why_it_matters = lookup(item, "why_matters_template", default_why)
+        if not item.action:
+            item.action = lookup(item, "action_template", default_action)
+
+
+def timed(fn) -> float:
+    start = time.perf_counter()
+    fn()
+    return time.perf_counter() - start
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--items", type=int, default=10000)
+    parser.add_argument("--topics", default="30,1000,10000")
+    parser.add_argument("--rules", type=int, default=20)
+    args = parser.parse_args()
+
+    print(f"{'topics':>7}{'per-item':>11}{'compiled':>11}{'warm':>9}{'+rules':>9}{'speedup':>9}")
+    for count in (int(c) for c in args.topics.split(",")):
+        config = topics(count)
+        extra = rules(args.rules)
+        fresh = lambda: items(args.items, config)  # noqa: E731
+        old_t = timed(lambda b=fresh(): per_item_enrich(b, config))
+        cold_t = timed(lambda b=fresh(): compile_rules(config).apply(b))
+        warm_t = timed(lambda b=fresh(): compile_rules(config).apply(b))
+        compile_rules(config, extra)
+        rules_t = timed(lambda b=fresh(): compile_rules(config, extra).apply(b))
+
+        check_old, check_new = fresh(), fresh()
+        per_item_enrich(check_old, config)
+        compile_rules(config).apply(check_new)
+        assert [(i.why_it_matters, i.action) for i in check_old] == [(i.why_it_matters, i.action) for i in check_new]
+        print(
+            f"{len(config):>7}{old_t:>10.3f}s{cold_t:>10.3f}s{warm_t:>8.3f}s{rules_t:>8.3f}s"
+            f"{old_t / warm_t:>8.0f}x"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,125 @@
+"""Benchmark: streaming feed parser vs. the previous whole-document parse.
+
+Usage:
+    python -m benchmarks.bench_feed_parse [--items N] [--body-kb KB] [--cap N]
+
+Generates large RSS and Atom fixture feeds (full HTML bodies per entry, like
+github.blog) in a temp directory, then compares peak traced memory and parse
+time of:
+
+  * tree     — read the whole body, ``ET.fromstring`` and two ``findall`` passes
+  * stream   — ``pipeline.feeds.iter_entries`` over 64 KiB chunks
+  * capped   — the streaming parser with a per-feed item cap
+"""
+
+import argparse
+import re
+import tempfile
+import time
+import tracemalloc
+from pathlib import Path
+from xml.etree import ElementTree as ET
+from xml.sax.saxutils import escape
+
+from pipeline.feeds import iter_entries
+
+ATOM_NS = "http://www.w3.org/2005/Atom"
+CHUNK = 64 * 1024
+
+
+def _html_body(i: int, kb: int) -> str:
+    para = f"<p>Paragraph for post {i} with <a href='https://example.com/{i}'>a link</a> &amp; text.</p>"
+    return para * max(1, (kb * 1024) // len(para))
+
+
+def write_rss(path: Path, items: int, body_kb: int) -> None:
+    with open(path, "w", encoding="utf-8") as fh:
+        fh.write('<?xml version="1.0"?><rss version="2.0"><channel><title>Bench</title>')
+        for i in range(items):
+            fh.write(
+                f"<item><title>Post {i}</title><link>https://example.com/p/{i}</link>"
+                f"<pubDate>Mon, 02 Mar 2026 10:00:00 +0000</pubDate>"
+                f"<description>{escape(_html_body(i, body_kb))}</description></item>"
+            )
+        fh.write("</channel></rss>")
+
+
+def write_atom(path: Path, items: int, body_kb: int) -> None:
+    with open(path, "w", encoding="utf-8") as fh:
+        fh.write(f'<?xml version="1.0"?><feed xmlns="{ATOM_NS}"><title>Bench</title>')
+        for i in range(items):
+            fh.write(
+                f'<entry><title>Post {i}</title><link href="https://example.com/p/{i}"/>'
+                f"<published>2026-03-02T10:00:00Z</published>"
+                f'<summary type="html">{escape(_html_body(i, body_kb))}</summary></entry>'
+            )
+        fh.write("</feed>")
+
+
+def parse_tree(path: Path) -> int:
+    content = path.read_bytes()
+    root = ET.fromstring(content)
+    count = 0
+    for item in root.findall(".//item"):
+        re.sub(r"<[^>]+>", "", item.findtext("description") or "")[:400]
+        count += 1
+    for entry in root.findall(f".//{{{ATOM_NS}}}entry"):
+        summary = entry.find(f"{{{ATOM_NS}}}summary")
+        re.sub(r"<[^>]+>", "", summary.text if summary is not None else "")[:400]
+        count += 1
+    return count
+
+
+def _file_chunks(path: Path):
+    with open(path, "rb") as fh:
+        while True:
+            chunk = fh.read(CHUNK)
+            if not chunk:
+                return
+            yield chunk
+
+
+def parse_stream(path: Path, cap=None) -> int:
+    count = 0
+    for entry in iter_entries(_file_chunks(path), max_items=cap):
+        re.sub(r"<[^>]+>", "", entry["summary"])[:400]
+        count += 1
+    return count
+
+
+def measure(fn, *args):
+    tracemalloc.start()
+    start = time.perf_counter()
+    count = fn(*args)
+    elapsed = time.perf_counter() - start
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return count, elapsed, peak
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--items", type=int, default=500)
+    parser.add_argument("--body-kb", type=int, default=40)
+    parser.add_argument("--cap", type=int, default=50)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        fixtures = {"rss": Path(tmp) / "feed.rss", "atom": Path(tmp) / "feed.atom"}
+        write_rss(fixtures["rss"], args.items, args.body_kb)
+        write_atom(fixtures["atom"], args.items, args.body_kb)
+
+        print(f"{'feed':<6}{'size MB':>9}  {'parser':<8}{'items':>7}{'time s':>9}{'peak MB':>10}")
+        for kind, path in fixtures.items():
+            size_mb = path.stat().st_size / 1e6
+            for label, fn, extra in (
+                ("tree", parse_tree, ()),
+                ("stream", parse_stream, ()),
+                ("capped", parse_stream, (args.cap,)),
+            ):
+                count, elapsed, peak = measure(fn, path, *extra)
+                print(f"{kind:<6}{size_mb:>9.1f}  {label:<8}{count:>7}{elapsed:>9.3f}{peak / 1e6:>10.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,139 @@
+"""Benchmark: slotted ``Item`` records vs. plain dicts through the pipeline.
+
+Usage:
+    python -m benchmarks.bench_items [--items N] [--repeat N]
+
+Builds N synthetic raw items and pushes them through normalize, dedupe,
+rank and enrich twice: once as plain dicts (the previous ``normalize``
+output) and once as :class:`pipeline.item.Item` records.  Prints the
+retained memory per item (``tracemalloc``) and the best-of-N time of each
+stage.
+"""
+
+import argparse
+import gc
+import time
+import tracemalloc
+from datetime import datetime, timezone
+from typing import Callable, Dict, List
+
+from pipeline import urls
+from pipeline.dates import parse_timestamp
+from pipeline.dedupe import dedupe
+from pipeline.normalize import normalize_all
+from pipeline.publish import enrich
+from pipeline.rank import rank
+
+CONFIG = {
+    "topics": [
+        {"id": "mcp", "why_matters_template": "MCP changes affect tool integrations."},
+        {"id": "vscode-insiders"},
+        {"id": "azure-ai-foundry"},
+    ],
+}
+
+
+def raw_items(n: int) -> List[Dict]:
+    topics = [["mcp"], ["vscode-insiders", "mcp"], [], ["azure-ai-foundry"]]
+    return [
+        {
+            "title": f"Release {i % (n // 2 or 1)} of project {i % 997}",
+            "url": f"https://github.com/org{i % 97}/repo{i % 997}/releases/tag/v{i}",
+            "published_at": f"2026-02-{1 + i % 28:02d}T{i % 24:02d}:00:00Z",
+            "source": f"org{i % 97}/repo{i % 997}",
+            "source_type": ("github_release", "rss", "rss_official")[i % 3],
+            "topics": topics[i % 4],
+            "snippet": f"Changes in build {i}.",
+        }
+        for i in range(n)
+    ]
+
+
+def normalize_dicts(raws: List[Dict]) -> List[Dict]:
+    """The previous dict-per-item ``normalize`` output."""
+    out = []
+    for raw in raws:
+        url, uid = urls.canonical_with_id(raw.get("url", ""))
+        published_at = raw.get("published_at", "")
+        published_ts = parse_timestamp(published_at)
+        if not published_at:
+            published_at = datetime.now(tz=timezone.utc).isoformat()
+        out.append({
+            "id": uid,
+            "title": raw.get("title", "").strip(),
+            "url": url,
+            "published_at": published_at,
+            "published_ts": published_ts,
+            "source": raw.get("source", ""),
+            "source_type": raw.get("source_type", ""),
+            "topics": list(raw.get("topics", [])),
+            "snippet": raw.get("snippet", "").strip(),
+            "score": 0.0,
+            "why_it_matters": "",
+            "action": "",
+            "_schema_version": "1",
+        })
+    return out
+
+
+def bytes_per_item(build: Callable[[List[Dict]], List], raws: List[Dict]) -> float:
+    for raw in raws:  # canonical URLs and IDs live in the memo, shared by both forms
+        urls.canonical_with_id(raw["url"])
+    gc.collect()
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    items = build(raws)
+    after = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    del items
+    return (after - before) / len(raws)
+
+
+def stage_times(build: Callable[[List[Dict]], List], raws: List[Dict], repeat: int) -> Dict[str, float]:
+    best: Dict[str, float] = {}
+    now = datetime(2026, 3, 1, tzinfo=timezone.utc)
+    for _ in range(repeat):
+        timings = {}
+        start = time.perf_counter()
+        items = build(raws)
+        timings["normalize"] = time.perf_counter() - start
+        for name, stage in (
+            ("dedupe", dedupe),
+            ("rank", lambda xs: rank(xs, CONFIG, now=now)),
+            ("enrich", lambda xs: enrich(xs, CONFIG["topics"])),
+        ):
+            start = time.perf_counter()
+            items = stage(items)
+            timings[name] = time.perf_counter() - start
+        for name, seconds in timings.items():
+            best[name] = min(best.get(name, seconds), seconds)
+        del items
+        gc.collect()
+    best["total"] = sum(best.values())
+    return best
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--items", type=int, default=1_000_000)
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    raws = raw_items(args.items)
+    urls.configure({"cache_size": args.items})
+    results = {}
+    for label, build in (("dict", normalize_dicts), ("Item", normalize_all)):
+        results[label] = (bytes_per_item(build, raws), stage_times(build, raws, args.repeat))
+
+    stages = list(results["dict"][1])
+    print(f"{args.items} items\n")
+    print(f"{'record':<8}{'B/item':>8}" + "".join(f"{s:>11}" for s in stages))
+    for label, (size, times) in results.items():
+        print(f"{label:<8}{size:>8.0f}" + "".join(f"{times[s]:>10.2f}s" for s in stages))
+    (dsize, dtimes), (isize, itimes) = results["dict"], results["Item"]
+    print(f"{'change':<8}{(isize - dsize) / dsize:>+8.0%}"
+          + "".join(f"{(itimes[s] - dtimes[s]) / dtimes[s]:>+11.0%}" for s in stages))
+
+
+if __name__ == "__main__":
+    main()
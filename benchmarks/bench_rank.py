@@ -0,0 +1,125 @@
+"""Benchmark: per-item ranking loop vs. NumPy batch scoring.
+
+Usage:
+    python -m benchmarks.bench_rank [--sizes 10000,100000,1000000] [--repeat N]
+                                    [--top K] [--threshold SCORE]
+
+For each size ranks synthetic ``Item`` records with the per-item
+``score_item`` loop and with :class:`pipeline.rank.ItemBatch`, printing the
+best-of-N time of each (the batch time split into building the columns,
+vector scoring, and ordering) and checking that both produce the same
+scores and order.
+
+A second table compares what ``run()`` does before publishing: ranking
+and enriching every item, versus selecting the top K and the items above
+the watchlist threshold with :func:`pipeline.rank.score_all` and
+enriching only those.
+"""
+
+import argparse
+import random
+import time
+from datetime import datetime, timezone
+from typing import List
+
+import numpy as np
+
+import pipeline.rank as rank_module
+from pipeline.item import Item
+from pipeline.publish import enrich
+from pipeline.rank import ItemBatch, rank, score_all
+
+NOW = datetime(2026, 3, 1, tzinfo=timezone.utc)
+CONFIG = {
+    "topics": [{"id": t} for t in ("mcp", "vscode-insiders", "azure-ai-foundry", "github-copilot-chat")],
+    "ranking": {"recency_half_life_days": 3},
+}
+SOURCE_TYPES = ("github_release", "rss", "rss_official", "github_issue", "reddit", "other")
+
+
+def items(n: int, seed: int = 7) -> List[Item]:
+    rng = random.Random(seed)
+    topic_ids = [t["id"] for t in CONFIG["topics"]]
+    out = []
+    for i in range(n):
+        ts = None if rng.random() < 0.02 else NOW.timestamp() - rng.uniform(0, 30 * 86400)
+        out.append(Item(
+            id=f"{i:016x}",
+            published_ts=ts,
+            source_type=rng.choice(SOURCE_TYPES),
+            topics=rng.sample(topic_ids, rng.randint(0, 3)),
+        ))
+    return out
+
+
+def best(fn, repeat: int) -> float:
+    times = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        times.append(time.perf_counter() - start)
+    return min(times)
+
+
+def full_then_enrich(data: List[Item], k: int, threshold: float) -> int:
+    for item in data:
+        item.why_it_matters = item.action = ""
+    ranked = enrich(rank(data, CONFIG, now=NOW), CONFIG["topics"])
+    return len(ranked[:k]) + len([i for i in ranked if i.score >= threshold])
+
+
+def select_then_enrich(data: List[Item], k: int, threshold: float) -> int:
+    for item in data:
+        item.why_it_matters = item.action = ""
+    ranking = score_all(data, CONFIG, now=NOW)
+    top, watch = ranking.top(k), ranking.at_least(threshold)
+    enrich(top, CONFIG["topics"])
+    enrich(watch, CONFIG["topics"])
+    return len(top) + len(watch)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--sizes", default="10000,100000,1000000")
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--top", type=int, default=50)
+    parser.add_argument("--threshold", type=float, default=0.85)
+    args = parser.parse_args()
+    sizes = [int(s) for s in args.sizes.split(",")]
+
+    all_topics = [t["id"] for t in CONFIG["topics"]]
+    print(f"{'items':>9}{'loop':>9}{'batch':>9}{'columns':>9}{'score':>9}{'order':>9}{'speedup':>9}  same")
+    for n in sizes:
+        data = items(n)
+        rank_module.BATCH_MIN_ITEMS = 10 ** 12
+        loop_t = best(lambda: rank(data, CONFIG, now=NOW), args.repeat)
+        loop = [(i.id, i.score) for i in rank(data, CONFIG, now=NOW)]
+        rank_module.BATCH_MIN_ITEMS = 0
+        batch_t = best(lambda: rank(data, CONFIG, now=NOW), args.repeat)
+        batch = [(i.id, i.score) for i in rank(data, CONFIG, now=NOW)]
+
+        columns = ItemBatch(data)
+        build_t = best(lambda: ItemBatch(data), args.repeat)
+        scores = columns.scores(all_topics, half_life_days=3, now=NOW)
+        score_t = best(lambda: columns.scores(all_topics, half_life_days=3, now=NOW), args.repeat)
+        order_t = best(lambda: ItemBatch.order(scores), args.repeat)
+        same = "yes" if loop == batch else f"no ({np.mean([a != b for a, b in zip(loop, batch)]):.2%} differ)"
+        print(
+            f"{n:>9}{loop_t:>8.3f}s{batch_t:>8.3f}s{build_t:>8.3f}s{score_t:>8.3f}s{order_t:>8.3f}s"
+            f"{loop_t / batch_t:>8.1f}x  {same}"
+        )
+
+    print(f"\ntop {args.top} + items scoring >= {args.threshold}, including enrichment")
+    print(f"{'items':>9}{'full':>9}{'select':>9}{'speedup':>9}{'selected':>10}")
+    rank_module.BATCH_MIN_ITEMS = 512
+    for n in sizes:
+        data = items(n)
+        full_t = best(lambda: full_then_enrich(data, args.top, args.threshold), args.repeat)
+        select_t = best(lambda: select_then_enrich(data, args.top, args.threshold), args.repeat)
+        selected = select_then_enrich(data, args.top, args.threshold)
+        assert selected == full_then_enrich(data, args.top, args.threshold)
+        print(f"{n:>9}{full_t:>8.3f}s{select_t:>8.3f}s{full_t / select_t:>8.1f}x{selected:>10}")
+
+
+if __name__ == "__main__":
+    main()
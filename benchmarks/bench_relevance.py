@@ -0,0 +1,86 @@
+"""Benchmark: ranking with the ``topics`` vs. ``bm25`` relevance backend.
+
+Usage:
+    python -m benchmarks.bench_relevance [--sizes 10000,100000] [--keyword-rate 0.04] [--repeat N]
+
+Builds synthetic items whose titles (9 words) and snippets (up to 400
+characters) are filler words with a fraction of topics.yaml keyword terms
+mixed in, then times ``pipeline.rank.score_all`` with each backend and
+``pipeline.relevance.bm25_relevance`` on its own (best of N).
+"""
+
+import argparse
+import random
+import time
+from typing import Dict, List
+
+import yaml
+
+from pipeline.item import Item
+from pipeline.rank import score_all
+from pipeline.relevance import bm25_relevance, terms
+
+
+def load_config() -> Dict:
+    with open("topics/topics.yaml", encoding="utf-8") as fh:
+        return yaml.safe_load(fh)
+
+
+def items(n: int, config: Dict, keyword_rate: float, seed: int = 1) -> List[Item]:
+    rng = random.Random(seed)
+    letters = "abcdefghijklmnopqrstuvwxyz"
+    filler = ["".join(rng.choice(letters) for _ in range(rng.randint(2, 9))) for _ in range(3000)]
+    keyword_terms = [t for topic in config["topics"] for k in topic.get("keywords", []) for t in terms(k)]
+
+    def text(words: int) -> str:
+        return " ".join(
+            rng.choice(keyword_terms) if rng.random() < keyword_rate else rng.choice(filler) for _ in range(words)
+        )
+
+    return [
+        Item(
+            id=f"{i:016x}",
+            title=text(9).title(),
+            snippet=text(70)[:400],
+            published_ts=1.77e9 - rng.uniform(0, 30 * 86400),
+            source_type=rng.choice(("rss", "github_release", "rss_official")),
+            topics=[config["topics"][i % len(config["topics"])]["id"]],
+        )
+        for i in range(n)
+    ]
+
+
+def best(fn, repeat: int) -> float:
+    times = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        times.append(time.perf_counter() - start)
+    return min(times)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--sizes", default="10000,100000")
+    parser.add_argument("--keyword-rate", type=float, default=0.04)
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    config = load_config()
+    topics_cfg = dict(config, ranking=dict(config.get("ranking", {}), relevance="topics"))
+    bm25_cfg = dict(config, ranking=dict(config.get("ranking", {}), relevance="bm25"))
+    print(f"{'items':>8}{'rank/topics':>13}{'rank/bm25':>11}{'bm25 only':>11}{'us/item':>9}{'matched':>9}")
+    for n in (int(s) for s in args.sizes.split(",")):
+        data = items(n, config, args.keyword_rate)
+        topics_t = best(lambda: score_all(data, topics_cfg), args.repeat)
+        bm25_t = best(lambda: score_all(data, bm25_cfg), args.repeat)
+        rel_t = best(lambda: bm25_relevance(data, config["topics"]), args.repeat)
+        matched = sum(1 for r in bm25_relevance(data, config["topics"]) if r > 0)
+        print(
+            f"{n:>8}{topics_t:>12.3f}s{bm25_t:>10.3f}s{rel_t:>10.3f}s"
+            f"{rel_t / n * 1e6:>9.1f}{matched / n:>9.0%}"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,128 @@
+"""Benchmark: the full pipeline replayed offline from a recorded archive.
+
+Usage:
+    python -m benchmarks.bench_replay [--archive PATH] [--config PATH]
+                                      [--feeds N] [--items N] [--repeat N]
+
+With ``--archive`` (written by ``python -m pipeline.main --record PATH``) the
+sources in ``--config`` are replayed from real recorded payloads.  Without
+it, ``--feeds`` synthetic RSS feeds of ``--items`` entries each are served
+from a local HTTP server, recorded once, and then replayed.  Prints the
+time spent in each pipeline stage, averaged over ``--repeat`` replays.
+"""
+
+import argparse
+import tempfile
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+
+from pipeline import session
+from pipeline.dedupe import dedupe
+from pipeline.ingest import ingest_all
+from pipeline.main import DEFAULT_TOPICS_PATH, load_config
+from pipeline.normalize import normalize_all
+from pipeline.publish import enrich
+from pipeline.rank import rank
+from pipeline.replay import Recorder, Replayer
+
+WORDS = "model agent release copilot vscode mcp server preview update support api tool".split()
+
+
+def _feed(feed: int, items: int) -> bytes:
+    parts = ['<?xml version="1.0"?><rss version="2.0"><channel><title>Bench</title>']
+    for i in range(items):
+        words = " ".join(WORDS[(i + j) % len(WORDS)] for j in range(8))
+        parts.append(
+            f"<item><title>Feed {feed} post {i}: {words}</title>"
+            f"<link>https://example.com/{feed}/posts/{i}?utm_source=rss</link>"
+            f"<pubDate>Mon, {1 + i % 28:02d} Mar 2026 10:00:00 +0000</pubDate>"
+            f"<description>&lt;p&gt;{words} {words}&lt;/p&gt;</description></item>"
+        )
+    parts.append("</channel></rss>")
+    return "".join(parts).encode("utf-8")
+
+
+def synthesize(path: Path, feeds: int, items: int) -> dict:
+    """Record *feeds* synthetic feeds into *path*; return the matching config."""
+    bodies = {f"/feed/{n}": _feed(n, items) for n in range(feeds)}
+
+    class _Handler(BaseHTTPRequestHandler):
+        protocol_version = "HTTP/1.1"
+
+        def do_GET(self):  # noqa: N802
+            body = bodies.get(self.path, b"")
+            self.send_response(200 if body else 404)
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, *args):
+            pass
+
+    server = ThreadingHTTPServer(("127.0.0.1", 0), _Handler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    base = f"http://127.0.0.1:{server.server_address[1]}"
+    config = load_config(DEFAULT_TOPICS_PATH)
+    config["ingest"] = {"max_items_per_feed": items}
+    config["sources"] = {
+        "rss_feeds": [{"url": f"{base}{p}", "name": f"Feed {n}", "topics": []} for n, p in enumerate(bodies)],
+    }
+    try:
+        recorder = Recorder(path)
+        ingest_all(config, transport=recorder)
+        recorder.save()
+    finally:
+        server.shutdown()
+        server.server_close()
+    return config
+
+
+def replay_once(config: dict, archive: Path) -> dict:
+    timings = {}
+    start = time.perf_counter()
+    raw = ingest_all(config, transport=Replayer(archive))
+    timings["ingest"] = time.perf_counter() - start
+    for stage, fn in (
+        ("normalize", normalize_all),
+        ("dedupe", dedupe),
+        ("rank", lambda items: rank(items, config)),
+        ("enrich", lambda items: enrich(items, config.get("topics", []))),
+    ):
+        start = time.perf_counter()
+        raw = fn(raw)
+        timings[stage] = time.perf_counter() - start
+    timings["items"] = len(raw)
+    return timings
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--archive", default=None)
+    parser.add_argument("--config", default=str(DEFAULT_TOPICS_PATH))
+    parser.add_argument("--feeds", type=int, default=20)
+    parser.add_argument("--items", type=int, default=500)
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        if args.archive:
+            archive, config = Path(args.archive), load_config(Path(args.config))
+        else:
+            archive = Path(tmp) / "synthetic.zip"
+            config = synthesize(archive, args.feeds, args.items)
+        print(f"archive {archive.name}: {archive.stat().st_size / 1e6:.2f} MB")
+
+        runs = [replay_once(config, archive) for _ in range(args.repeat)]
+        session.close()
+
+    print(f"{'stage':<10}{'mean s':>10}{'min s':>10}")
+    for stage in ("ingest", "normalize", "dedupe", "rank", "enrich"):
+        values = [r[stage] for r in runs]
+        print(f"{stage:<10}{sum(values) / len(values):>10.3f}{min(values):>10.3f}")
+    print(f"items ranked: {runs[-1]['items']}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,93 @@
+"""Benchmark: memory-mapped seen-item index vs. a JSON ``{id: [first, last]}`` store.
+
+Usage:
+    python -m benchmarks.bench_seen [--history 100000,1000000,3000000] [--run-items 5000]
+
+For each history size, builds an index of that many item IDs and then
+times one pipeline run against it: open the store, observe --run-items
+items (half already known) and save.  The JSON baseline is the format the
+other state files use (``data/state/*.json``), which must be parsed and
+re-serialised whole on every run.  Also prints the file size and the time
+of a full compaction.
+"""
+
+import argparse
+import json
+import os
+import random
+import tempfile
+import time
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+from typing import List
+
+from pipeline.item import Item
+from pipeline.seen import SeenIndex
+
+NOW = datetime(2026, 3, 2, 12, tzinfo=timezone.utc)
+
+
+def ids(n: int, seed: int) -> List[str]:
+    rng = random.Random(seed)
+    return [f"{rng.getrandbits(64):016x}" for _ in range(n)]
+
+
+def json_run(path: Path, run_ids: List[str], ts: int) -> None:
+    store = json.loads(path.read_text(encoding="utf-8"))
+    for i in run_ids:
+        seen = store.get(i)
+        store[i] = [seen[0] if seen else ts, ts]
+    tmp = path.with_suffix(".tmp")
+    tmp.write_text(json.dumps(store), encoding="utf-8")
+    os.replace(tmp, path)
+
+
+def index_run(path: Path, run_ids: List[str], now: datetime) -> int:
+    index = SeenIndex(path)
+    new = sum(index.observe([Item(id=i) for i in run_ids], now))
+    index.save(now.timestamp())
+    index.close()
+    return new
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--history", default="100000,1000000,3000000")
+    parser.add_argument("--run-items", type=int, default=5000)
+    args = parser.parse_args()
+
+    print(f"{'history':>9}{'json run':>10}{'json MB':>9}{'index run':>11}{'index MB':>10}{'compact':>9}{'new':>6}")
+    with tempfile.TemporaryDirectory() as tmp:
+        for n in (int(s) for s in args.history.split(",")):
+            history = ids(n, seed=n)
+            run_ids = history[: args.run_items // 2] + ids(args.run_items - args.run_items // 2, seed=n + 1)
+            ts = int(NOW.timestamp())
+
+            json_path = Path(tmp) / f"seen-{n}.json"
+            json_path.write_text(json.dumps({i: [ts, ts] for i in history}), encoding="utf-8")
+            start = time.perf_counter()
+            json_run(json_path, run_ids, ts + 86400)
+            json_t = time.perf_counter() - start
+
+            index_path = Path(tmp) / f"seen-{n}.idx"
+            index = SeenIndex(index_path)
+            index.observe([Item(id=i) for i in history], NOW)
+            index.save(NOW.timestamp())
+            index.close()
+            start = time.perf_counter()
+            new = index_run(index_path, run_ids, NOW + timedelta(days=1))
+            index_t = time.perf_counter() - start
+
+            index = SeenIndex(index_path)
+            start = time.perf_counter()
+            index.compact(NOW.timestamp() + 2 * 86400)
+            compact_t = time.perf_counter() - start
+            index.close()
+            print(
+                f"{n:>9}{json_t:>9.3f}s{json_path.stat().st_size / 1e6:>9.1f}"
+                f"{index_t:>10.3f}s{index_path.stat().st_size / 1e6:>10.1f}{compact_t:>8.2f}s{new:>6}"
+            )
+
+
+if __name__ == "__main__":
+    main()
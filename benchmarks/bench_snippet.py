@@ -0,0 +1,95 @@
+"""Benchmark: single-pass snippet extraction vs. regex tag stripping.
+
+Usage:
+    python -m benchmarks.bench_snippet [--items N] [--body-kb KB] [--archive PATH]
+
+Compares, on large feed descriptions and release-note bodies:
+
+  * regex     — the previous ``re.sub(r"<[^>]+>", "", body)[:400]``
+  * snippet   — ``pipeline.text.html_snippet`` / ``markdown_snippet``
+
+Bodies are synthetic (github.blog-sized HTML posts and long markdown release
+notes) unless ``--archive`` points at an archive written with
+``python -m pipeline.main --record``, in which case the real recorded feed
+descriptions and release bodies are used.
+"""
+
+import argparse
+import json
+import re
+import time
+import zipfile
+from typing import List, Tuple
+
+from benchmarks.bench_feed_parse import _html_body
+from pipeline.feeds import iter_entries
+from pipeline.text import html_snippet, markdown_snippet
+
+LIMIT = 400
+_TAG_RE = re.compile(r"<[^>]+>")
+_ENTITY_RE = re.compile(r"&#?\w+;")
+
+
+def _markdown_body(i: int, kb: int) -> str:
+    section = (
+        f"## What's Changed in {i}\n\n"
+        "* Add **streaming** support to the `client` by @dev in https://github.com/o/r/pull/1\n"
+        "* Fix [timeouts](https://github.com/o/r/issues/2) when the &quot;proxy&quot; is slow\n\n"
+        "<details><summary>Full changelog</summary>\n\n| a | b |\n|---|---|\n</details>\n\n"
+    )
+    return section * max(1, (kb * 1024) // len(section))
+
+
+def synthetic(items: int, body_kb: int) -> Tuple[List[str], List[str]]:
+    return [_html_body(i, body_kb) for i in range(items)], [_markdown_body(i, body_kb) for i in range(items)]
+
+
+def from_archive(path: str) -> Tuple[List[str], List[str]]:
+    html, markdown = [], []
+    with zipfile.ZipFile(path) as zf:
+        for record in json.loads(zf.read("index.json"))["responses"]:
+            body = zf.read(record["body"])
+            if body.lstrip().startswith(b"<"):
+                html.extend(e["summary"] for e in iter_entries([body]) if e["summary"])
+            elif "/releases" in record["key"]:
+                try:
+                    markdown.extend(r.get("body") or "" for r in json.loads(body))
+                except (ValueError, AttributeError):
+                    continue
+    return html, markdown
+
+
+def regex_snippet(body: str) -> str:
+    return _TAG_RE.sub("", body)[:LIMIT].strip()
+
+
+def measure(fn, bodies: List[str]) -> Tuple[float, List[str]]:
+    start = time.perf_counter()
+    out = [fn(b) for b in bodies]
+    return time.perf_counter() - start, out
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--items", type=int, default=200)
+    parser.add_argument("--body-kb", type=int, default=40)
+    parser.add_argument("--archive", default=None)
+    args = parser.parse_args()
+
+    html, markdown = from_archive(args.archive) if args.archive else synthetic(args.items, args.body_kb)
+    print(f"{'corpus':<10}{'bodies':>7}{'avg KB':>8}  {'method':<9}{'ms/body':>9}{'entities left':>15}")
+    for corpus, bodies, fast in (("html", html, html_snippet), ("markdown", markdown, markdown_snippet)):
+        if not bodies:
+            continue
+        avg_kb = sum(len(b) for b in bodies) / len(bodies) / 1024
+        for label, fn in (("regex", regex_snippet), ("snippet", lambda b, f=fast: f(b, LIMIT))):
+            elapsed, out = measure(fn, bodies)
+            entities = sum(len(_ENTITY_RE.findall(s)) for s in out)
+            print(
+                f"{corpus:<10}{len(bodies):>7}{avg_kb:>8.1f}  {label:<9}"
+                f"{elapsed / len(bodies) * 1000:>9.3f}{entities:>15}"
+            )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,91 @@
+"""Benchmark: SQLite item store writes and queries over years of history.
+
+Usage:
+    python -m benchmarks.bench_store [--years 3] [--per-day 1000] [--topics 12] [--repeat N]
+
+Fills a temporary store with ``years * 365`` daily runs of *per-day*
+items (each tagged with one or two of *topics* topics), one upsert per
+run, then times a further run's upsert and typical queries (best of N):
+top items for one topic over the last 7 days, and over the last year,
+every topic's count over 7 days, and top items by source type.
+"""
+
+import argparse
+import os
+import random
+import tempfile
+import time
+from typing import List
+
+from pipeline.item import Item
+from pipeline.store import ItemStore
+
+DAY = 86400
+NOW = 1.77e9
+
+
+def run_items(day: int, per_day: int, topics: List[str], rng: random.Random) -> List[Item]:
+    ts0 = NOW - day * DAY
+    return [
+        Item(
+            id=f"{day:06x}{i:010x}",
+            title=f"Item {i} of day {day}",
+            url=f"https://example.com/{day}/{i}",
+            published_ts=ts0 + rng.uniform(0, DAY),
+            source=f"source-{rng.randrange(200)}",
+            source_type=rng.choice(("rss", "github_release", "rss_official")),
+            topics=rng.sample(topics, rng.choice((1, 1, 2))),
+            snippet="x" * rng.randint(50, 300),
+            score=round(rng.random(), 4),
+        )
+        for i in range(per_day)
+    ]
+
+
+def best(fn, repeat: int) -> float:
+    times = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        times.append(time.perf_counter() - start)
+    return min(times)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--years", type=float, default=3)
+    parser.add_argument("--per-day", type=int, default=1000)
+    parser.add_argument("--topics", type=int, default=12)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    rng = random.Random(1)
+    topics = [f"topic-{t}" for t in range(args.topics)]
+    days = int(args.years * 365)
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "items.sqlite")
+        with ItemStore(path) as store:
+            start = time.perf_counter()
+            for day in range(days, 0, -1):
+                store.upsert(run_items(day, args.per_day, topics, rng))
+            fill = time.perf_counter() - start
+            size_mb = os.path.getsize(path) / 1e6
+            print(f"{len(store)} items over {days} days: filled in {fill:.1f}s, {size_mb:.0f} MB")
+
+            today = run_items(0, args.per_day, topics, rng)
+            since_week, since_year = NOW - 7 * DAY, NOW - 365 * DAY
+            cases = [
+                ("upsert one run", lambda: store.upsert(today)),
+                ("top 20, topic, 7 days", lambda: store.query(topics[0], since=since_week)),
+                ("top 20, topic, 365 days", lambda: store.query(topics[0], since=since_year)),
+                ("topic counts, 7 days", lambda: store.topic_counts(since=since_week)),
+                ("top 20, source type, 7 days", lambda: store.query(source_type="rss", since=since_week)),
+                ("top 20, all time", lambda: store.query()),
+            ]
+            print(f"{'operation':<30}{'ms':>10}")
+            for name, fn in cases:
+                print(f"{name:<30}{best(fn, args.repeat) * 1e3:>10.2f}")
+
+
+if __name__ == "__main__":
+    main()
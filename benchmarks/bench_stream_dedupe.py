@@ -0,0 +1,67 @@
+"""Benchmark: streaming ``stream_dedupe`` vs. list-based ``dedupe``.
+
+Usage:
+    python -m benchmarks.bench_stream_dedupe [--sizes 100000,1000000] [--dup-rate 0.3] [--window 0,1000]
+
+Generates N items lazily (a fraction repeating an earlier URL or title)
+and prints, for ``dedupe`` over the materialised list and for
+``stream_dedupe`` over the generator with each window size, the wall time
+and the peak traced memory (``tracemalloc``, measured in a second pass),
+counting the input list for ``dedupe``.
+"""
+
+import argparse
+import random
+import time
+import tracemalloc
+from typing import Callable, Iterator
+
+from pipeline.dedupe import dedupe, stream_dedupe
+from pipeline.item import Item
+
+
+def generate(n: int, dup_rate: float, seed: int = 9) -> Iterator[Item]:
+    rng = random.Random(seed)
+    for i in range(n):
+        if i and rng.random() < dup_rate:
+            j = rng.randrange(max(0, i - 5000), i)  # copies arrive close to the original
+            url = f"https://example.com/post/{j}" if rng.random() < 0.5 else f"https://mirror.example.com/{i}"
+            title = f"Release notes {j}"
+        else:
+            url, title = f"https://example.com/post/{i}", f"Release notes {i}"
+        yield Item(id=f"{i:016x}", url=url, title=title, score=rng.random())
+
+
+def measure(fn: Callable[[], int]):
+    start = time.perf_counter()
+    kept = fn()
+    elapsed = time.perf_counter() - start
+    tracemalloc.start()
+    fn()
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    return elapsed, peak, kept
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--sizes", default="100000,1000000")
+    parser.add_argument("--dup-rate", type=float, default=0.3)
+    parser.add_argument("--window", default="0,1000")
+    args = parser.parse_args()
+
+    print(f"{'items':>9}{'method':>16}{'time':>9}{'peak MB':>9}{'kept':>9}")
+    for n in (int(s) for s in args.sizes.split(",")):
+        runs = [("dedupe(list)", lambda: len(dedupe(list(generate(n, args.dup_rate)))))]
+        for w in (int(s) for s in args.window.split(",")):
+            runs.append((
+                f"stream w={w}",
+                lambda w=w: sum(1 for _ in stream_dedupe(generate(n, args.dup_rate), window=w, capacity=n * 2)),
+            ))
+        for label, fn in runs:
+            elapsed, peak, kept = measure(fn)
+            print(f"{n:>9}{label:>16}{elapsed:>8.2f}s{peak / 1e6:>9.1f}{kept:>9}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,74 @@
+"""Benchmark: per-run cost of trends updates as the history grows.
+
+Usage:
+    python -m benchmarks.bench_trends [--days 30,365,1095] [--topics 1000] [--per-day 200] [--repeat N]
+
+For each history length, fills a temporary :class:`pipeline.trends.TrendsStore`
+with one record a day (*per-day* of *topics* topics counted each day), then
+times (best of N) recording one more day, exporting ``trends.json`` from the
+store, and the previous ``write_trends`` approach on the exported file:
+parse it, set today's counts, re-sum every topic's history and rewrite it.
+"""
+
+import argparse
+import json
+import random
+import tempfile
+import time
+from datetime import date, timedelta
+from pathlib import Path
+
+from pipeline.trends import TrendsStore
+
+
+def best(fn, repeat: int) -> float:
+    times = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        times.append(time.perf_counter() - start)
+    return min(times)
+
+
+def rewrite_json(path: Path, today: str, counts: dict) -> None:
+    """The pre-store update: whole-file parse, recompute and rewrite."""
+    data = json.loads(path.read_text(encoding="utf-8"))
+    for topic, count in counts.items():
+        info = data["topics"].setdefault(topic, {"total_items": 0, "daily": {}})
+        info["daily"][today] = count
+        info["total_items"] = sum(info["daily"].values())
+    path.write_text(json.dumps(data, indent=2, sort_keys=True), encoding="utf-8")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--days", default="30,365,1095")
+    parser.add_argument("--topics", type=int, default=1000)
+    parser.add_argument("--per-day", type=int, default=200)
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    rng = random.Random(1)
+    topics = [f"topic-{t}" for t in range(args.topics)]
+    start = date(2023, 1, 1)
+    print(f"{'days':>6}{'record':>10}{'export':>10}{'rewrite':>10}{'json MB':>9}")
+    for days in (int(d) for d in args.days.split(",")):
+        with tempfile.TemporaryDirectory() as tmp:
+            store = TrendsStore(Path(tmp) / "trends")
+            for day in range(days):
+                picked = rng.sample(topics, min(args.per_day, len(topics)))
+                store.record((start + timedelta(days=day)).isoformat(), {t: rng.randint(1, 40) for t in picked})
+            today = (start + timedelta(days=days)).isoformat()
+            counts = {t: rng.randint(1, 40) for t in rng.sample(topics, min(args.per_day, len(topics)))}
+            json_path = Path(tmp) / "trends.json"
+            json_path.write_text(json.dumps(store.export(), indent=2, sort_keys=True), encoding="utf-8")
+
+            record_t = best(lambda: store.record(today, counts), args.repeat)
+            export_t = best(lambda: json.dumps(store.export(), indent=2, sort_keys=True), args.repeat)
+            rewrite_t = best(lambda: rewrite_json(json_path, today, counts), args.repeat)
+            size = json_path.stat().st_size / 1e6
+            print(f"{days:>6}{record_t * 1e3:>8.1f}ms{export_t * 1e3:>8.0f}ms{rewrite_t * 1e3:>8.0f}ms{size:>9.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,154 @@
+"""On-disk HTTP validator cache (ETag / Last-Modified) for ingest fetches.
+
+Each entry stores the validators returned for a URL together with the items
+that were parsed from that response.  On the next run the validators are sent
+as ``If-None-Match`` / ``If-Modified-Since``; a ``304 Not Modified`` answer is
+served from the stored items without downloading or reparsing the body.
+Conditional requests answered with 304 do not count against GitHub's REST
+rate limit.
+
+The cache is bounded by entry count and serialized size; least-recently-used
+entries are evicted first when it is saved.
+"""
+
+import json
+import logging
+import os
+import threading
+import time
+from pathlib import Path
+from typing import Dict, List, Mapping, Optional
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_CACHE_PATH = Path(".cache/http_cache.json")
+DEFAULT_MAX_ENTRIES = 256
+DEFAULT_MAX_BYTES = 8 * 1024 * 1024
+CACHE_VERSION = "1"
+
+
+class ResponseCache:
+    """Validator + parsed-items cache keyed by URL."""
+
+    def __init__(
+        self,
+        path: Path = DEFAULT_CACHE_PATH,
+        max_entries: int = DEFAULT_MAX_ENTRIES,
+        max_bytes: int = DEFAULT_MAX_BYTES,
+    ):
+        self.path = Path(path)
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._lock = threading.Lock()
+        self._entries: Dict[str, Dict] = {}
+        self._load()
+
+    @classmethod
+    def from_config(cls, cache_cfg: Optional[Dict]) -> "ResponseCache":
+        """Build a cache from the ``ingest.cache`` section of topics.yaml."""
+        cache_cfg = cache_cfg or {}
+        return cls(
+            path=Path(cache_cfg.get("path", DEFAULT_CACHE_PATH)),
+            max_entries=int(cache_cfg.get("max_entries", DEFAULT_MAX_ENTRIES)),
+            max_bytes=int(cache_cfg.get("max_bytes", DEFAULT_MAX_BYTES)),
+        )
+
+    def _load(self) -> None:
+        if not self.path.exists():
+            return
+        try:
+            data = json.loads(self.path.read_text(encoding="utf-8"))
+        except (OSError, json.JSONDecodeError) as exc:
+            logger.warning("Ignoring unreadable HTTP cache %s: %s", self.path, exc)
+            return
+        if data.get("version") == CACHE_VERSION:
+            self._entries = data.get("entries", {})
+
+    def validators(self, url: str, variant: str = "") -> Dict[str, str]:
+        """Conditional request headers for *url*, or ``{}`` if nothing is cached.
+
+        *variant* identifies how the items were built (e.g. source name and
+        topics); an entry stored under a different variant is not reused.
+        """
+        with self._lock:
+            entry = self._entries.get(url)
+        if not entry or entry.get("variant", "") != variant:
+            return {}
+        headers = {}
+        if entry.get("etag"):
+            headers["If-None-Match"] = entry["etag"]
+        if entry.get("last_modified"):
+            headers["If-Modified-Since"] = entry["last_modified"]
+        return headers
+
+    def items(self, url: str) -> Optional[List[Dict]]:
+        """Return copies of the cached items for *url* (a 304 hit)."""
+        with self._lock:
+            entry = self._entries.get(url)
+            if entry is None:
+                self.misses += 1
+                return None
+            entry["last_used"] = time.time()
+            self.hits += 1
+            return [dict(item) for item in entry["items"]]
+
+    def store(self, url: str, headers: Mapping[str, str], items: List[Dict], variant: str = "") -> None:
+        """Remember the validators from *headers* and the parsed *items*."""
+        etag = headers.get("ETag")
+        last_modified = headers.get("Last-Modified")
+        with self._lock:
+            self.misses += 1
+            if not etag and not last_modified:
+                self._entries.pop(url, None)
+                return
+            self._entries[url] = {
+                "etag": etag,
+                "last_modified": last_modified,
+                "variant": variant,
+                "items": items,
+                "last_used": time.time(),
+            }
+
+    def _evict(self) -> List[str]:
+        """Drop least-recently-used entries until both bounds hold."""
+        ordered = sorted(self._entries.items(), key=lambda kv: kv[1].get("last_used", 0), reverse=True)
+        keep: Dict[str, Dict] = {}
+        total = 0
+        for url, entry in ordered:
+            size = len(json.dumps(entry, separators=(",", ":")))
+            if len(keep) >= self.max_entries or total + size > self.max_bytes:
+                continue
+            keep[url] = entry
+            total += size
+        evicted = [url for url in self._entries if url not in keep]
+        self._entries = keep
+        self.evictions += len(evicted)
+        return evicted
+
+    def save(self) -> None:
+        """Evict to the configured bounds and write the cache atomically."""
+        with self._lock:
+            self._evict()
+            payload = json.dumps(
+                {"version": CACHE_VERSION, "entries": self._entries},
+                separators=(",", ":"),
+            )
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = self.path.with_suffix(self.path.suffix + ".tmp")
+        tmp.write_text(payload, encoding="utf-8")
+        os.replace(tmp, self.path)
+
+    def stats(self) -> Dict[str, int]:
+        with self._lock:
+            return {
+                "entries": len(self._entries),
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+            }
+
+    def __len__(self) -> int:
+        return len(self._entries)
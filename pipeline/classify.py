@@ -0,0 +1,189 @@
+"""Keyword topic classification from the ``keywords`` of topics.yaml.
+
+Every keyword of every topic is compiled into one Aho-Corasick automaton,
+so tagging an item is a single pass over its case-folded title and
+snippet: the cost depends on the length of the text, not on how many
+topics or keywords are configured.  A keyword only matches as a whole word
+-- it may not start or end in the middle of a word -- and runs of
+whitespace in the text match a single space in a keyword.
+
+Compiled classifiers are cached by the topics they were built from, so
+repeated runs with the same config compile once.
+"""
+
+from collections import deque
+from typing import Dict, List, Optional, Sequence, Tuple
+
+from .item import Item, ItemLike
+
+DEFAULT_FIELDS = ("title", "snippet")
+_CACHE_SIZE = 8
+# Up to this many keywords, each keyword is searched for directly with
+# ``str.find``, which beats walking the automaton character by character.
+_SCAN_MAX = 32
+
+# (keyword length, check left boundary, check right boundary, topic indexes)
+_Output = Tuple[int, bool, bool, Tuple[int, ...]]
+
+
+def _fold(text: str) -> str:
+    return " ".join(text.casefold().split())
+
+
+def _is_word(ch: str) -> bool:
+    return ch.isalnum() or ch == "_"
+
+
+class KeywordClassifier:
+    """Tag text with the topics whose keywords occur in it."""
+
+    def __init__(self, topics_config: List[Dict]):
+        self.topic_ids: List[str] = []
+        keywords: Dict[str, set] = {}
+        for t in topics_config:
+            idx = len(self.topic_ids)
+            self.topic_ids.append(t["id"])
+            for kw in t.get("keywords") or []:
+                folded = _fold(str(kw))
+                if folded:
+                    keywords.setdefault(folded, set()).add(idx)
+        self.keyword_count = len(keywords)
+        self._scan: Optional[Tuple[Tuple[str, bool, bool, Tuple[int, ...]], ...]] = None
+        if len(keywords) <= _SCAN_MAX:
+            self._scan = tuple(
+                (kw, _is_word(kw[0]), _is_word(kw[-1]), tuple(sorted(topics))) for kw, topics in keywords.items()
+            )
+        self._build(keywords)
+
+    def _build(self, keywords: Dict[str, set]) -> None:
+        goto: List[Dict[str, int]] = [{}]
+        own: List[List[_Output]] = [[]]
+        for kw, topics in keywords.items():
+            state = 0
+            for ch in kw:
+                nxt = goto[state].get(ch)
+                if nxt is None:
+                    nxt = len(goto)
+                    goto[state][ch] = nxt
+                    goto.append({})
+                    own.append([])
+                state = nxt
+            own[state].append((len(kw), _is_word(kw[0]), _is_word(kw[-1]), tuple(sorted(topics))))
+
+        # Breadth-first failure links; each state's outputs include those of
+        # its failure state, so matching never walks a dictionary-suffix chain.
+        fail = [0] * len(goto)
+        out: List[Tuple[_Output, ...]] = [()] * len(goto)
+        queue = deque(goto[0].values())
+        while queue:
+            state = queue.popleft()
+            out[state] = tuple(own[state]) + out[fail[state]]
+            for ch, nxt in goto[state].items():
+                f = fail[state]
+                while f and ch not in goto[f]:
+                    f = fail[f]
+                target = goto[f].get(ch, 0)
+                fail[nxt] = target if target != nxt else 0
+                queue.append(nxt)
+        self._goto = goto
+        self._fail = fail
+        self._out = out
+
+    def classify(self, *texts: str) -> List[str]:
+        """Topic IDs matched in *texts*, in config order."""
+        goto, fail, out = self._goto, self._fail, self._out
+        found: set = set()
+        for raw in texts:
+            if not raw:
+                continue
+            text = _fold(raw)
+            if self._scan is not None:
+                self._find_each(text, found)
+                continue
+            n = len(text)
+            state = 0
+            for i, ch in enumerate(text):
+                while state and ch not in goto[state]:
+                    state = fail[state]
+                state = goto[state].get(ch, 0)
+                if not out[state]:
+                    continue
+                for length, left, right, topics in out[state]:
+                    start = i - length + 1
+                    if left and start > 0 and _is_word(text[start - 1]):
+                        continue
+                    if right and i + 1 < n and _is_word(text[i + 1]):
+                        continue
+                    found.update(topics)
+        return [self.topic_ids[i] for i in sorted(found)]
+
+    def _find_each(self, text: str, found: set) -> None:
+        n = len(text)
+        for kw, left, right, topics in self._scan:
+            start = text.find(kw)
+            while start >= 0:
+                end = start + len(kw)
+                if not (left and start > 0 and _is_word(text[start - 1])) and not (
+                    right and end < n and _is_word(text[end])
+                ):
+                    found.update(topics)
+                    break
+                start = text.find(kw, start + 1)
+
+
+_compiled: Dict[tuple, KeywordClassifier] = {}
+
+
+def compile_topics(topics_config: List[Dict]) -> KeywordClassifier:
+    """Classifier for *topics_config*, compiled once per distinct topic set."""
+    key = tuple((t["id"], tuple(t.get("keywords") or ())) for t in topics_config)
+    classifier = _compiled.get(key)
+    if classifier is None:
+        if len(_compiled) >= _CACHE_SIZE:
+            _compiled.pop(next(iter(_compiled)))
+        classifier = _compiled[key] = KeywordClassifier(topics_config)
+    return classifier
+
+
+def classify_all(
+    items: List[ItemLike],
+    topics_config: List[Dict],
+    fields: Sequence[str] = DEFAULT_FIELDS,
+    keep_source_topics: bool = True,
+) -> List[ItemLike]:
+    """Tag each item with the topics its *fields* mention, in place.
+
+    Matched topics are appended to the topics inherited from the source
+    (or replace them when *keep_source_topics* is false and something
+    matched).
+    """
+    classifier = compile_topics(topics_config)
+    if not classifier.keyword_count:
+        return items
+    for item in items:
+        matched = classifier.classify(*(str(item.get(f) or "") for f in fields))
+        if not matched:
+            continue
+        current = item.topics if isinstance(item, Item) else item.get("topics", [])
+        if keep_source_topics:
+            topics = list(current) + [t for t in matched if t not in current]
+        else:
+            topics = matched
+        if isinstance(item, Item):
+            item.topics = topics
+        else:
+            item["topics"] = topics
+    return items
+
+
+def classify_from_config(items: List[ItemLike], config: Dict) -> List[ItemLike]:
+    """Apply :func:`classify_all` as configured by the ``classify`` section."""
+    cfg = config.get("classify") or {}
+    if not cfg.get("enabled", True):
+        return items
+    return classify_all(
+        items,
+        config.get("topics", []),
+        fields=tuple(cfg.get("fields", DEFAULT_FIELDS)),
+        keep_source_topics=bool(cfg.get("keep_source_topics", True)),
+    )
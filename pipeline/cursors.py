@@ -0,0 +1,92 @@
+"""Persistent per-source high-water marks for incremental ingestion.
+
+Each source key (``github:owner/repo``, ``rss:Feed Name``) maps to the newest
+item already ingested from it::
+
+    {"github:microsoft/vscode": {"raw_id": "1234", "published_at": "2026-03-01T..."}}
+
+Fetchers walk pages / feed entries only until they reach that mark, so a
+normal daily run processes just the delta.
+"""
+
+import json
+import logging
+import os
+import threading
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, List, Optional
+
+from .dates import parse_timestamp, to_datetime
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_CURSORS_PATH = Path("data/state/cursors.json")
+
+
+def published_key(published_at: str) -> Optional[datetime]:
+    """Parse a timestamp for ordering; ``None`` if unparseable."""
+    return to_datetime(parse_timestamp(published_at))
+
+
+def is_past_cursor(raw_id: str, published_at: str, cursor: Optional[Dict]) -> bool:
+    """True if an item is at or older than *cursor* (i.e. already ingested)."""
+    if not cursor:
+        return False
+    if raw_id and raw_id == cursor.get("raw_id"):
+        return True
+    mark = published_key(cursor.get("published_at", ""))
+    item = published_key(published_at)
+    return mark is not None and item is not None and item <= mark
+
+
+class CursorStore:
+    """JSON-backed map of source key -> newest ingested ``raw_id``/``published_at``."""
+
+    def __init__(self, path: Path = DEFAULT_CURSORS_PATH):
+        self.path = Path(path)
+        self._lock = threading.Lock()
+        self._cursors: Dict[str, Dict[str, str]] = {}
+        self.advanced = 0
+        if self.path.exists():
+            try:
+                self._cursors = json.loads(self.path.read_text(encoding="utf-8"))
+            except (OSError, json.JSONDecodeError) as exc:
+                logger.warning("Ignoring unreadable cursor file %s: %s", self.path, exc)
+
+    def get(self, key: str) -> Optional[Dict[str, str]]:
+        with self._lock:
+            cursor = self._cursors.get(key)
+            return dict(cursor) if cursor else None
+
+    def advance(self, key: str, items: List[Dict]) -> None:
+        """Move the mark for *key* to the newest of *items*, never backwards."""
+        newest = None
+        for item in items:
+            ts = published_key(item.get("published_at", ""))
+            if ts is not None and (newest is None or ts > newest[0]):
+                newest = (ts, item)
+        if newest is None:
+            return
+        with self._lock:
+            current = published_key(self._cursors.get(key, {}).get("published_at", ""))
+            if current is not None and newest[0] <= current:
+                return
+            self._cursors[key] = {
+                "raw_id": newest[1].get("raw_id", ""),
+                "published_at": newest[1].get("published_at", ""),
+            }
+            self.advanced += 1
+
+    def clear(self) -> None:
+        """Forget every mark so the next fetch is a full backfill."""
+        with self._lock:
+            self._cursors = {}
+
+    def save(self) -> None:
+        with self._lock:
+            payload = json.dumps(self._cursors, indent=2, sort_keys=True)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = self.path.with_suffix(self.path.suffix + ".tmp")
+        tmp.write_text(payload, encoding="utf-8")
+        os.replace(tmp, self.path)
@@ -0,0 +1,191 @@
+"""Timestamp parsing for feed, release and pipeline dates.
+
+One parser for every date the pipeline sees: RFC 822 ``pubDate`` values,
+Atom / GitHub ISO 8601 timestamps and the ISO strings items carry after
+normalisation.  The two shapes that make up nearly all real input are
+parsed by hand with fixed offsets; everything else goes through tolerant
+regular expressions (missing seconds, fractional seconds, compact offsets,
+timezone abbreviations, two-digit years).  Results are memoised, since the
+same timestamps recur across pages, runs and pipeline stages.
+
+Unparseable input yields ``None`` -- never "now" -- so callers can decide
+how to treat an unknown date instead of silently making it look fresh.
+"""
+
+import re
+from datetime import datetime, timedelta, timezone
+from email.utils import parsedate_tz
+from functools import lru_cache
+from typing import Optional, Tuple
+
+DATE_CACHE_SIZE = 8192
+
+_MONTHS = {m: i for i, m in enumerate(
+    ("jan", "feb", "mar", "apr", "may", "jun", "jul", "aug", "sep", "oct", "nov", "dec"), 1
+)}
+_DAYS_IN_MONTH = (31, 29, 31, 30, 31, 30, 31, 31, 30, 31, 30, 31)
+
+# Offsets in seconds; military single letters other than Z are ignored as ambiguous.
+TZ_ABBREVIATIONS = {
+    "Z": 0, "UT": 0, "UTC": 0, "GMT": 0, "WET": 0,
+    "EST": -5 * 3600, "EDT": -4 * 3600, "CST": -6 * 3600, "CDT": -5 * 3600,
+    "MST": -7 * 3600, "MDT": -6 * 3600, "PST": -8 * 3600, "PDT": -7 * 3600,
+    "AKST": -9 * 3600, "AKDT": -8 * 3600, "HST": -10 * 3600,
+    "BST": 3600, "IST": 19800, "CET": 3600, "CEST": 7200, "WEST": 3600,
+    "EET": 7200, "EEST": 10800, "MSK": 10800, "SGT": 28800, "HKT": 28800,
+    "JST": 32400, "KST": 32400, "AEST": 36000, "AEDT": 39600, "NZST": 43200, "NZDT": 46800,
+}
+
+_ISO_RE = re.compile(
+    r"\s*(\d{4})-?(\d{2})-?(\d{2})"
+    r"(?:[Tt ](\d{2}):?(\d{2})(?::?(\d{2})(?:[.,]\d+)?)?)?"
+    r"\s*(?:([Zz])|([+-])(\d{2}):?(\d{2})?|([A-Za-z]{2,5}))?\s*$"
+)
+_RFC822_RE = re.compile(
+    r"\s*(?:[A-Za-z]{3,9},?\s+)?(\d{1,2})[\s-]+([A-Za-z]{3})[A-Za-z]*\.?[\s-]+(\d{2,4})"
+    r"\s+(\d{1,2}):(\d{2})(?::(\d{2}))?"
+    r"\s*(?:([+-])(\d{2}):?(\d{2})|([A-Za-z]{1,5}))?\s*(?:\([^)]*\))?\s*$"
+)
+
+
+def _days_from_civil(y: int, m: int, d: int) -> int:
+    """Days since 1970-01-01 for a proleptic Gregorian date."""
+    y -= m <= 2
+    era = (y if y >= 0 else y - 399) // 400
+    yoe = y - era * 400
+    doy = (153 * (m + (-3 if m > 2 else 9)) + 2) // 5 + d - 1
+    doe = yoe * 365 + yoe // 4 - yoe // 100 + doy
+    return era * 146097 + doe - 719468
+
+
+def _epoch(y: int, mo: int, d: int, h: int, mi: int, s: int, offset: int) -> Optional[float]:
+    if not (1 <= mo <= 12 and 1 <= d <= _DAYS_IN_MONTH[mo - 1] and h <= 23 and mi <= 59 and s <= 60):
+        return None
+    if mo == 2 and d == 29 and not (y % 4 == 0 and (y % 100 != 0 or y % 400 == 0)):
+        return None
+    return float(_days_from_civil(y, mo, d) * 86400 + h * 3600 + mi * 60 + min(s, 59) - offset)
+
+
+def _offset(sign: Optional[str], hh: Optional[str], mm: Optional[str], abbr: Optional[str]) -> Optional[int]:
+    if sign:
+        seconds = int(hh) * 3600 + int(mm or 0) * 60
+        return -seconds if sign == "-" else seconds
+    if abbr:
+        return TZ_ABBREVIATIONS.get(abbr.upper())
+    return 0  # no zone given: treat as UTC
+
+
+def _fast_iso(raw: str) -> Optional[float]:
+    """``YYYY-MM-DDTHH:MM:SS`` followed by nothing, ``Z`` or ``+HH:MM``."""
+    n = len(raw)
+    if n not in (19, 20, 25) or raw[4] != "-" or raw[7] != "-" or raw[10] not in "Tt " \
+            or raw[13] != ":" or raw[16] != ":":
+        return None
+    offset = 0
+    if n == 20:
+        if raw[19] not in "Zz":
+            return None
+    elif n == 25:
+        sign = raw[19]
+        if sign not in "+-" or raw[22] != ":":
+            return None
+        offset = int(raw[20:22]) * 3600 + int(raw[23:25]) * 60
+        if sign == "-":
+            offset = -offset
+    return _epoch(int(raw[0:4]), int(raw[5:7]), int(raw[8:10]),
+                  int(raw[11:13]), int(raw[14:16]), int(raw[17:19]), offset)
+
+
+def _fast_rfc822(raw: str) -> Optional[float]:
+    """``Ddd, DD Mon YYYY HH:MM:SS +ZZZZ`` or ``... GMT``."""
+    n = len(raw)
+    if n not in (29, 31) or raw[3] != "," or raw[19] != ":" or raw[22] != ":":
+        return None
+    month = _MONTHS.get(raw[8:11].lower())
+    if month is None:
+        return None
+    if n == 29:
+        if raw[26:] != "GMT":
+            return None
+        offset = 0
+    else:
+        sign = raw[26]
+        if sign not in "+-":
+            return None
+        offset = int(raw[27:29]) * 3600 + int(raw[29:31]) * 60
+        if sign == "-":
+            offset = -offset
+    return _epoch(int(raw[12:16]), month, int(raw[5:7]),
+                  int(raw[17:19]), int(raw[20:22]), int(raw[23:25]), offset)
+
+
+def _slow_path(raw: str) -> Optional[float]:
+    m = _ISO_RE.match(raw)
+    if m:
+        y, mo, d, h, mi, s, z, sign, oh, om, abbr = m.groups()
+        offset = 0 if z else _offset(sign, oh, om, abbr)
+        if offset is None:
+            return None
+        return _epoch(int(y), int(mo), int(d), int(h or 0), int(mi or 0), int(s or 0), offset)
+    m = _RFC822_RE.match(raw)
+    if m:
+        d, mon, y, h, mi, s, sign, oh, om, abbr = m.groups()
+        month = _MONTHS.get(mon.lower())
+        offset = _offset(sign, oh, om, abbr)
+        if month is None or offset is None:
+            return None
+        year = int(y)
+        if len(y) == 2:  # RFC 822 two-digit years, read as RFC 2822 does
+            year += 2000 if year < 50 else 1900
+        return _epoch(year, month, int(d), int(h), int(mi), int(s or 0), offset)
+    parsed = parsedate_tz(raw)
+    if parsed is None:
+        return None
+    y, mo, d, h, mi, s = parsed[:6]
+    return _epoch(y, mo, d, h, mi, s, parsed[9] or 0)
+
+
+@lru_cache(maxsize=DATE_CACHE_SIZE)
+def _parse(raw: str) -> Optional[float]:
+    try:
+        ts = _fast_iso(raw)
+        if ts is None:
+            ts = _fast_rfc822(raw)
+        if ts is None:
+            ts = _slow_path(raw)
+    except (ValueError, IndexError):
+        ts = None
+    return ts
+
+
+def parse_timestamp(raw: Optional[str]) -> Optional[float]:
+    """Epoch seconds (UTC) for an RFC 822 or ISO 8601 string, or ``None``."""
+    if not raw or not isinstance(raw, str):
+        return None
+    return _parse(raw.strip())
+
+
+def to_iso(ts: float) -> str:
+    """ISO 8601 in UTC, the form items carry in ``published_at``."""
+    return datetime.fromtimestamp(ts, tz=timezone.utc).isoformat()
+
+
+def normalize_date(raw: Optional[str]) -> str:
+    """Re-emit *raw* as a UTC ISO 8601 string; ``""`` if it cannot be parsed."""
+    ts = parse_timestamp(raw)
+    return to_iso(ts) if ts is not None else ""
+
+
+def to_datetime(ts: Optional[float]) -> Optional[datetime]:
+    return datetime.fromtimestamp(ts, tz=timezone.utc) if ts is not None else None
+
+
+def week_bounds(week: str) -> Tuple[datetime, datetime]:
+    """UTC ``[start, end)`` of report week *week* (``YYYY-WW``, weeks from Monday as in ``%Y-%W``)."""
+    start = datetime.strptime(f"{week}-1", "%Y-%W-%w").replace(tzinfo=timezone.utc)
+    return start, start + timedelta(days=7)
+
+
+def cache_info():
+    """Hit/miss statistics of the memo (``functools.lru_cache`` info)."""
+    return _parse.cache_info()
@@ -0,0 +1,44 @@
+"""Wall-clock budget for a pipeline run."""
+
+import time
+from typing import Callable, Optional
+
+MIN_REQUEST_TIMEOUT = 0.1
+
+
+class Deadline:
+    """A point in (monotonic) time by which work must be finished.
+
+    ``Deadline(None)`` never expires, so callers can hold one unconditionally.
+    *clock* is injectable for tests.
+    """
+
+    def __init__(self, seconds: Optional[float], clock: Callable[[], float] = time.monotonic):
+        self._clock = clock
+        self.at = None if seconds is None else clock() + float(seconds)
+
+    def remaining(self) -> Optional[float]:
+        """Seconds left (never negative), or ``None`` without a budget."""
+        if self.at is None:
+            return None
+        return max(self.at - self._clock(), 0.0)
+
+    def expired(self) -> bool:
+        return self.at is not None and self._clock() >= self.at
+
+    def clamp(self, timeout: float) -> float:
+        """*timeout*, shortened so a request cannot outlive the deadline."""
+        remaining = self.remaining()
+        if remaining is None:
+            return timeout
+        return max(min(timeout, remaining), MIN_REQUEST_TIMEOUT)
+
+    def reserve(self, seconds: float) -> "Deadline":
+        """An earlier deadline that leaves *seconds* of this one unspent.
+
+        At most a quarter of the remaining budget is held back.
+        """
+        earlier = Deadline(None, clock=self._clock)
+        if self.at is not None:
+            earlier.at = self.at - min(float(seconds), (self.remaining() or 0.0) / 4)
+        return earlier
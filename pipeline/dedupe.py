@@ -1,13 +1,30 @@
-"""Deduplication: remove duplicate items by URL and title."""
+"""Deduplication: remove duplicate items by URL and title, and near duplicates by text.
 
-from typing import Dict, List
+:func:`dedupe` works on a list; :func:`stream_dedupe` applies the same rules
+to an iterator in bounded memory.
+"""
+
+import random
+from collections import OrderedDict, defaultdict
+from itertools import count
+from pathlib import Path
+from typing import Dict, Iterable, Iterator, List, Optional, Sequence, Tuple
+
+try:
+    import numpy as np
+except ImportError:  # optional: signatures are then computed per item in Python
+    np = None
+
+from .item import Item, ItemLike
+from .membership import DEFAULT_CAPACITY, DEFAULT_FP_RATE, SpillSet, digest
+from .relevance import terms_of_texts
 
 
 def _norm_title(title: str) -> str:
     return title.lower().strip()
 
 
-def dedupe(items: List[Dict]) -> List[Dict]:
+def dedupe(items: List[ItemLike]) -> List[ItemLike]:
     """Remove duplicates by canonical URL or exact (case-insensitive) title.
 
     When duplicates are found the item with the *higher* score is retained.
@@ -15,17 +32,20 @@ def dedupe(items: List[Dict]) -> List[Dict]:
     """
     seen_urls: Dict[str, int] = {}   # url   -> index in result
     seen_titles: Dict[str, int] = {}  # title -> index in result
-    result: List[Dict] = []
+    scores: List[float] = []          # score of result[idx]
+    result: List[ItemLike] = []
 
     for item in items:
-        url = item.get("url", "")
-        title = _norm_title(item.get("title", ""))
+        if isinstance(item, Item):
+            url, title, score = item.url, _norm_title(item.title), item.score
+        else:
+            url, title, score = item.get("url", ""), _norm_title(item.get("title", "")), item.get("score", 0)
 
         # URL duplicate
         if url and url in seen_urls:
             idx = seen_urls[url]
-            if item.get("score", 0) > result[idx].get("score", 0):
-                result[idx] = item
+            if score > scores[idx]:
+                result[idx], scores[idx] = item, score
                 # Update title pointer if the replacement has a different title
                 if title and title not in seen_titles:
                     seen_titles[title] = idx
@@ -34,17 +54,321 @@ def dedupe(items: List[Dict]) -> List[Dict]:
         # Title duplicate (exact, case-insensitive)
         if title and title in seen_titles:
             idx = seen_titles[title]
-            if item.get("score", 0) > result[idx].get("score", 0):
-                result[idx] = item
+            if score > scores[idx]:
+                result[idx], scores[idx] = item, score
                 if url and url not in seen_urls:
                     seen_urls[url] = idx
             continue
 
         idx = len(result)
         result.append(item)
+        scores.append(score)
         if url:
             seen_urls[url] = idx
         if title:
             seen_titles[title] = idx
 
     return result
+
+
+# ---------------------------------------------------------------------------
+# Streaming dedupe: bounded memory for iterator input
+# ---------------------------------------------------------------------------
+
+def stream_dedupe(
+    items: Iterable[ItemLike],
+    window: int = 0,
+    capacity: int = DEFAULT_CAPACITY,
+    fp_rate: float = DEFAULT_FP_RATE,
+    spill_path: Optional[Path] = None,
+) -> Iterator[ItemLike]:
+    """Yield the items of *items* that :func:`dedupe` would keep, without a list.
+
+    URL and title keys of every kept item go to a :class:`SpillSet`: a
+    Bloom filter sized for *capacity* keys at *fp_rate* (about 1.2 MB per
+    million keys at 1%) backed by an exact SQLite file.  Memory is bounded
+    by that filter, SQLite's 2 MB cache and the window, not by the input.
+
+    With ``window=0`` the first copy of an item wins and is yielded at once.
+    Otherwise the last *window* survivors are held back, and a duplicate of
+    a held item with a higher score replaces it in place, as :func:`dedupe`
+    does; a duplicate of an item already yielded is dropped.  With a window
+    at least as long as the input the output equals :func:`dedupe`'s.
+    """
+    held: "OrderedDict[int, List]" = OrderedDict()  # slot -> [item, score, keys]
+    key_slot: Dict[str, int] = {}  # keys of held items
+    next_slot = 0
+    with SpillSet(capacity, fp_rate, spill_path) as seen:
+        for item in items:
+            if isinstance(item, Item):
+                url, title, score = item.url, _norm_title(item.title), item.score
+            else:
+                url, title, score = item.get("url", ""), _norm_title(item.get("title", "")), item.get("score", 0)
+            keys = [k for k in (url and "u:" + url, title and "t:" + title) if k]
+            digests = [digest(k) for k in keys]
+
+            # As in dedupe(): the URL decides before the title.
+            slot = duplicate = None
+            for key, d in zip(keys, digests):
+                slot = key_slot.get(key)
+                if slot is not None or seen.contains_digest(d):
+                    duplicate = True
+                    break
+            if duplicate:
+                if slot is not None and score > held[slot][1]:
+                    entry = held[slot]
+                    entry[0], entry[1] = item, score
+                    for key, d in zip(keys, digests):
+                        if key not in key_slot and not seen.contains_digest(d):
+                            seen.add_digest(d)
+                            key_slot[key] = slot
+                            entry[2].append(key)
+                continue
+
+            for key, d in zip(keys, digests):
+                seen.add_digest(d)
+                key_slot[key] = next_slot
+            held[next_slot] = [item, score, keys]
+            next_slot += 1
+            while len(held) > window:
+                _, (kept, _, kept_keys) = held.popitem(last=False)
+                for key in kept_keys:
+                    key_slot.pop(key, None)
+                yield kept
+        for kept, _, _ in held.values():
+            yield kept
+
+
+# ---------------------------------------------------------------------------
+# Near duplicates: MinHash signatures + locality-sensitive hashing
+# ---------------------------------------------------------------------------
+
+DEFAULT_THRESHOLD = 0.8
+DEFAULT_NUM_PERM = 64
+DEFAULT_SHINGLE_SIZE = 2
+DEFAULT_FIELDS = ("title", "snippet")
+
+_MASK64 = (1 << 64) - 1
+_SHINGLE_MULT = 0x9E3779B97F4A7C15
+_BLOCK_SHINGLES = 1 << 15
+
+
+def _hash_params(num_perm: int, seed: int) -> List[Tuple[int, int]]:
+    """``(a, b)`` of the multiply-shift hash ``((a * x + b) mod 2**64) >> 32`` per permutation."""
+    rng = random.Random(seed)
+    return [(rng.getrandbits(64) | 1, rng.getrandbits(64)) for _ in range(num_perm)]
+
+
+def lsh_shape(threshold: float, num_perm: int) -> Tuple[int, int]:
+    """``(bands, rows)`` with the most rows whose LSH threshold ``(1/bands) ** (1/rows)`` is within *threshold*.
+
+    Pairs below the LSH threshold are rarely compared, so it should sit at or
+    under the similarity threshold; candidates are verified afterwards.
+    """
+    best = (num_perm, 1)
+    for rows in range(1, num_perm + 1):
+        bands = num_perm // rows
+        if (1 / bands) ** (1 / rows) <= threshold:
+            best = (bands, rows)
+    return best
+
+
+def _word_ids(items: List[ItemLike], fields: Sequence[str], k: int) -> Tuple[List[int], List[int]]:
+    """Every item's terms as ids (from 1, by first appearance), each non-empty
+    item's followed by ``k - 1`` zeros so its last shingles end in padding;
+    and each item's term count."""
+    vocabulary: Dict[str, int] = defaultdict(count(1).__next__)
+    lookup = vocabulary.__getitem__
+    pad = [0] * (k - 1)
+    flat: List[int] = []
+    lengths: List[int] = []
+    texts = (
+        f"{item.title} {item.snippet}" if isinstance(item, Item) and fields == DEFAULT_FIELDS
+        else " ".join(str(item.get(f) or "") for f in fields)
+        for item in items
+    )
+    for toks in terms_of_texts(texts):
+        lengths.append(len(toks))
+        if toks:
+            flat.extend(map(lookup, toks))
+            flat.extend(pad)
+    return flat, lengths
+
+
+def _signatures_py(flat: List[int], lengths: List[int], k: int, params: List[Tuple[int, int]]) -> List[Optional[tuple]]:
+    out: List[Optional[tuple]] = []
+    pos = 0
+    for n in lengths:
+        if not n:
+            out.append(None)
+            continue
+        shingles = set()
+        for i in range(pos, pos + n):
+            x = flat[i]
+            for j in range(1, k):
+                x = (x * _SHINGLE_MULT + flat[i + j]) & _MASK64
+            shingles.add(x)
+        out.append(tuple(min(((a * x + b) & _MASK64) >> 32 for x in shingles) for a, b in params))
+        pos += n + k - 1
+    return out
+
+
+def _signatures_np(flat: List[int], lengths: List[int], k: int, params: List[Tuple[int, int]]):
+    """``(signature matrix, item of each row)``; the values of :func:`_signatures_py`."""
+    lengths = np.asarray(lengths, dtype=np.intp)
+    nonempty = np.flatnonzero(lengths)
+    if not len(nonempty):
+        return np.empty((0, len(params)), dtype=np.uint32), nonempty
+    words = np.asarray(flat, dtype=np.uint64)
+    starts = np.flatnonzero(words)  # every real word starts a shingle
+    shingles = words[starts]
+    mult = np.uint64(_SHINGLE_MULT)
+    for j in range(1, k):
+        shingles *= mult
+        shingles += words[starts + j]
+    offsets = np.concatenate(([0], np.cumsum(lengths[nonempty])))  # row r: offsets[r]:offsets[r + 1]
+    sig = np.empty((len(nonempty), len(params)), dtype=np.uint32)
+    # Rows are hashed a cache-sized block at a time; ">> 32" is monotonic,
+    # so it is applied to each minimum rather than to every hash.
+    lo = 0
+    while lo < len(nonempty):
+        hi = max(int(np.searchsorted(offsets, offsets[lo] + _BLOCK_SHINGLES, side="right")) - 1, lo + 1)
+        block = shingles[offsets[lo]:offsets[hi]]
+        bounds = offsets[lo:hi] - offsets[lo]
+        hashed = np.empty_like(block)
+        for p, (a, b) in enumerate(params):
+            np.multiply(block, np.uint64(a), out=hashed)
+            hashed += np.uint64(b)
+            sig[lo:hi, p] = np.minimum.reduceat(hashed, bounds) >> np.uint64(32)
+        lo = hi
+    return sig, nonempty
+
+
+# Each bucket member is compared with the bucket's first member and with its
+# predecessor, which keeps large buckets (many copies of one text) linear.
+
+def _bucket_pairs(groups: Iterable[List[int]]) -> Iterator[Tuple[int, int]]:
+    for members in groups:
+        first = members[0]
+        for prev, cur in zip(members, members[1:]):
+            yield first, cur
+            if prev != first:
+                yield prev, cur
+
+
+def _bucket_pairs_np(keys: "np.ndarray") -> Tuple["np.ndarray", "np.ndarray"]:
+    """:func:`_bucket_pairs` for the rows sharing each value of *keys*."""
+    order = np.argsort(keys, kind="stable")
+    sorted_keys = keys[order]
+    opens = np.ones(len(keys), dtype=bool)
+    opens[1:] = sorted_keys[1:] != sorted_keys[:-1]
+    first_of = order[np.flatnonzero(opens)][np.cumsum(opens) - 1]
+    rest = np.flatnonzero(~opens)
+    first, cur, prev = first_of[rest], order[rest], order[rest - 1]
+    chain = prev != first
+    return np.concatenate((first, prev[chain])), np.concatenate((cur, cur[chain]))
+
+
+def near_duplicate_clusters(
+    items: List[ItemLike],
+    threshold: float = DEFAULT_THRESHOLD,
+    num_perm: int = DEFAULT_NUM_PERM,
+    shingle_size: int = DEFAULT_SHINGLE_SIZE,
+    fields: Sequence[str] = DEFAULT_FIELDS,
+    seed: int = 1,
+) -> List[List[int]]:
+    """Groups (of two or more item indexes, ascending) whose texts are near duplicates.
+
+    Texts are compared as sets of *shingle_size*-word shingles.  Pairs that
+    share an LSH band are linked when their MinHash estimate of Jaccard
+    similarity is at least *threshold*, and clusters are the connected
+    components of those links.
+    """
+    params = _hash_params(num_perm, seed)
+    bands, rows = lsh_shape(threshold, num_perm)
+    flat, lengths = _word_ids(items, fields, shingle_size)
+
+    if np is not None:
+        sig, item_of = _signatures_np(flat, lengths, shingle_size, params)
+        mix = np.asarray([a for a, _ in _hash_params(rows, seed + 1)], dtype=np.uint64)
+        codes = []
+        for band in range(bands):
+            keys = sig[:, band * rows:(band + 1) * rows].astype(np.uint64) @ mix
+            left, right = _bucket_pairs_np(keys)
+            codes.append(left * len(sig) + right)
+        pairs = np.unique(np.concatenate(codes)) if codes else np.empty(0, dtype=np.intp)
+        left, right = np.divmod(pairs, max(len(sig), 1))
+        similar = (sig[left] == sig[right]).mean(axis=1) >= threshold
+        edges = zip(item_of[left[similar]].tolist(), item_of[right[similar]].tolist())
+    else:
+        signatures = _signatures_py(flat, lengths, shingle_size, params)
+        pairs = set()
+        for band in range(bands):
+            buckets: Dict[tuple, List[int]] = {}
+            for d, s in enumerate(signatures):
+                if s is not None:
+                    buckets.setdefault(s[band * rows:(band + 1) * rows], []).append(d)
+            pairs.update(_bucket_pairs(g for g in buckets.values() if len(g) > 1))
+        edges = (
+            (i, j) for i, j in sorted(pairs)
+            if sum(x == y for x, y in zip(signatures[i], signatures[j])) / num_perm >= threshold
+        )
+
+    parent = list(range(len(items)))
+
+    def find(i: int) -> int:
+        while parent[i] != i:
+            parent[i] = parent[parent[i]]
+            i = parent[i]
+        return i
+
+    for i, j in edges:
+        ri, rj = find(i), find(j)
+        if ri != rj:
+            parent[max(ri, rj)] = min(ri, rj)
+    clusters: Dict[int, List[int]] = {}
+    for i in range(len(items)):
+        clusters.setdefault(find(i), []).append(i)
+    return [c for c in clusters.values() if len(c) > 1]
+
+
+def merge_near_duplicates(items: List[ItemLike], scores=None, **params) -> List[int]:
+    """Indexes of the items to keep, in input order, after merging near duplicates.
+
+    The highest-scoring member of each cluster (the earliest on ties) is
+    kept and the IDs of the others are appended to its ``merged`` list.
+    *scores* defaults to each item's ``score``; *params* are passed to
+    :func:`near_duplicate_clusters`.
+    """
+    if scores is None:
+        scores = [item.get("score", 0) for item in items]
+    dropped = set()
+    for cluster in near_duplicate_clusters(items, **params):
+        keep = max(cluster, key=lambda i: (scores[i], -i))
+        keeper = items[keep]
+        merged = list(keeper.get("merged") or [])
+        for i in cluster:
+            if i != keep:
+                dropped.add(i)
+                merged.append(items[i].get("id", ""))
+                merged.extend(items[i].get("merged") or [])
+        keeper["merged"] = merged
+    return [i for i in range(len(items)) if i not in dropped]
+
+
+def near_dedupe(items: List[ItemLike], **params) -> List[ItemLike]:
+    """*items* without near duplicates, keeping the highest-scoring copy of each."""
+    return [items[i] for i in merge_near_duplicates(items, **params)]
+
+
+def near_params_from_config(config: Dict) -> Optional[Dict]:
+    """Keyword arguments for :func:`near_duplicate_clusters` from ``dedupe.near``, or None when disabled."""
+    cfg = (config.get("dedupe") or {}).get("near") or {}
+    if not cfg.get("enabled", False):
+        return None
+    return {
+        "threshold": float(cfg.get("threshold", DEFAULT_THRESHOLD)),
+        "num_perm": int(cfg.get("num_perm", DEFAULT_NUM_PERM)),
+        "shingle_size": int(cfg.get("shingle_size", DEFAULT_SHINGLE_SIZE)),
+        "fields": tuple(cfg.get("fields", DEFAULT_FIELDS)),
+    }
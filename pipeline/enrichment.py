@@ -0,0 +1,211 @@
+"""Compiled enrichment rules for ``why_it_matters`` and ``action``.
+
+Templates come from two places:
+
+* each topic's ``why_matters_template`` / ``action_template`` in
+  topics.yaml, applied to items tagged with the topic;
+* the ``enrichment.rules`` list, whose entries may match on ``source``,
+  ``source_type``, ``topic`` and ``keywords`` (in title or snippet; all
+  given conditions must hold) and carry a ``priority`` (default 0).
+
+For each field the highest-priority matching template wins.  Ties go to
+explicit rules in config order, then to topic templates in the order of
+the item's topics; items nothing matches get a generic line by source
+type.  With no ``enrichment.rules`` this is exactly the original "first
+tagged topic with a template wins" behaviour.
+
+Rules are compiled once into lookup tables keyed by source, source type
+and topic, plus one keyword automaton, and resolutions are memoised per
+item signature, so a batch costs one dictionary lookup per item in the
+common case.
+"""
+
+from typing import Dict, List, Optional, Tuple
+
+from .classify import KeywordClassifier
+from .item import Item, ItemLike
+
+FIELDS = ("why", "action")
+_TOPIC_FIELDS = {"why": "why_matters_template", "action": "action_template"}
+_MEMO_SIZE = 65536
+
+
+def default_why(source_type: str) -> str:
+    if "release" in source_type:
+        return "New release detected — review for breaking changes or new capabilities."
+    if "rss" in source_type:
+        return "Official announcement — may signal an upcoming feature or deprecation."
+    return "Monitor for downstream impact on your AI stack."
+
+
+def default_action(source_type: str) -> str:
+    if "release" in source_type:
+        return "Review the release notes and update your integration if needed."
+    return "Evaluate for impact; add to watchlist if actionable."
+
+
+class _Rule:
+    __slots__ = ("order", "priority", "source", "source_type", "topic", "keyword", "why", "action")
+
+    def __init__(self, order: int, cfg: Dict, keyword: bool):
+        self.order = order
+        self.priority = float(cfg.get("priority", 0))
+        self.source = cfg.get("source")
+        self.source_type = cfg.get("source_type")
+        self.topic = cfg.get("topic")
+        self.keyword = keyword
+        self.why = cfg.get("why", "")
+        self.action = cfg.get("action", "")
+
+    def holds(self, source: str, source_type: str, topics: List[str], keyword_hits: frozenset) -> bool:
+        return (
+            (self.source is None or self.source == source)
+            and (self.source_type is None or self.source_type == source_type)
+            and (self.topic is None or self.topic in topics)
+            and (not self.keyword or self.order in keyword_hits)
+        )
+
+
+class EnrichmentEngine:
+    """Topic templates and ``enrichment.rules`` compiled into lookup tables."""
+
+    def __init__(self, topics_config: List[Dict], rules: Optional[List[Dict]] = None):
+        # Topic templates: topic id -> {field: template}
+        self.topic_templates: Dict[str, Dict[str, str]] = {}
+        for t in topics_config:
+            templates = {f: t.get(key, "") for f, key in _TOPIC_FIELDS.items() if t.get(key)}
+            if templates and t["id"] not in self.topic_templates:
+                self.topic_templates[t["id"]] = templates
+
+        self.rules: List[_Rule] = []
+        keyword_topics = []
+        for cfg in rules or []:
+            order = len(self.rules)
+            keywords = cfg.get("keywords") or []
+            self.rules.append(_Rule(order, cfg, bool(keywords)))
+            if keywords:
+                keyword_topics.append({"id": order, "keywords": keywords})
+        self._keywords = KeywordClassifier(keyword_topics) if keyword_topics else None
+
+        # Each rule is indexed under its most selective condition and the
+        # remaining conditions are checked when it is looked up.
+        self._by_source: Dict[str, List[_Rule]] = {}
+        self._by_source_type: Dict[str, List[_Rule]] = {}
+        self._by_topic: Dict[str, List[_Rule]] = {}
+        self._by_keyword: Dict[int, _Rule] = {}
+        self._always: List[_Rule] = []
+        for rule in self.rules:
+            if rule.source is not None:
+                self._by_source.setdefault(rule.source, []).append(rule)
+            elif rule.source_type is not None:
+                self._by_source_type.setdefault(rule.source_type, []).append(rule)
+            elif rule.topic is not None:
+                self._by_topic.setdefault(rule.topic, []).append(rule)
+            elif rule.keyword:
+                self._by_keyword[rule.order] = rule
+            else:
+                self._always.append(rule)
+        self._memo: Dict[tuple, Tuple[str, str]] = {}
+
+    @classmethod
+    def from_config(cls, config: Dict) -> "EnrichmentEngine":
+        return cls(config.get("topics", []), (config.get("enrichment") or {}).get("rules"))
+
+    def _keyword_hits(self, item: ItemLike) -> frozenset:
+        if self._keywords is None:
+            return frozenset()
+        if isinstance(item, Item):
+            title, snippet = item.title, item.snippet
+        else:
+            title, snippet = item.get("title", ""), item.get("snippet", "")
+        return frozenset(self._keywords.classify(title or "", snippet or ""))
+
+    def resolve(self, source: str, source_type: str, topics: List[str], keyword_hits: frozenset) -> Tuple[str, str]:
+        """``(why, action)`` for an item with these attributes."""
+        key = (source, source_type, tuple(topics), keyword_hits)
+        hit = self._memo.get(key)
+        if hit is not None:
+            return hit
+
+        candidates = list(self._always)
+        candidates += self._by_source.get(source, ())
+        candidates += self._by_source_type.get(source_type, ())
+        for topic in topics:
+            candidates += self._by_topic.get(topic, ())
+        candidates += (self._by_keyword[k] for k in keyword_hits if k in self._by_keyword)
+        matched = sorted(
+            (r for r in candidates if r.holds(source, source_type, topics, keyword_hits)),
+            key=lambda r: (-r.priority, r.order),
+        )
+        resolved = []
+        for field in FIELDS:
+            best: Optional[Tuple[float, str]] = None
+            for rule in matched:
+                text = getattr(rule, field)
+                if text:
+                    best = (rule.priority, text)
+                    break
+            for topic in topics:  # topic templates rank at priority 0, after rules
+                text = self.topic_templates.get(topic, {}).get(field)
+                if text:
+                    if best is None or best[0] < 0:
+                        best = (0.0, text)
+                    break
+            if best is None:
+                best = (0.0, default_why(source_type) if field == "why" else default_action(source_type))
+            resolved.append(best[1])
+
+        result = (resolved[0], resolved[1])
+        if len(self._memo) >= _MEMO_SIZE:
+            self._memo.clear()
+        self._memo[key] = result
+        return result
+
+    def apply(self, items: List[ItemLike]) -> List[ItemLike]:
+        """Fill empty ``why_it_matters`` / ``action`` fields of *items* in place."""
+        for item in items:
+            if isinstance(item, Item):
+                if item.why_it_matters and item.action:
+                    continue
+                why, action = self.resolve(item.source, item.source_type, item.topics, self._keyword_hits(item))
+                if not item.why_it_matters:
+                    item.why_it_matters = why
+                if not item.action:
+                    item.action = action
+                continue
+            if item.get("why_it_matters") and item.get("action"):
+                continue
+            why, action = self.resolve(
+                item.get("source", ""), item.get("source_type", ""), item.get("topics", []), self._keyword_hits(item)
+            )
+            if not item.get("why_it_matters"):
+                item["why_it_matters"] = why
+            if not item.get("action"):
+                item["action"] = action
+        return items
+
+
+_compiled: Dict[tuple, EnrichmentEngine] = {}
+_CACHE_SIZE = 8
+
+
+def _freeze(value):
+    if isinstance(value, dict):
+        return tuple(sorted((k, _freeze(v)) for k, v in value.items()))
+    if isinstance(value, (list, tuple)):
+        return tuple(_freeze(v) for v in value)
+    return value
+
+
+def compile_rules(topics_config: List[Dict], rules: Optional[List[Dict]] = None) -> EnrichmentEngine:
+    """Engine for this configuration, compiled once and cached."""
+    key = (
+        tuple((t["id"], t.get("why_matters_template"), t.get("action_template")) for t in topics_config),
+        _freeze(rules or []),
+    )
+    engine = _compiled.get(key)
+    if engine is None:
+        if len(_compiled) >= _CACHE_SIZE:
+            _compiled.pop(next(iter(_compiled)))
+        engine = _compiled[key] = EnrichmentEngine(topics_config, rules)
+    return engine
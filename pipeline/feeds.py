@@ -0,0 +1,96 @@
+"""Streaming RSS 2.0 / Atom 1.0 parser built on incremental XML parsing.
+
+The feed body is fed to :class:`xml.etree.ElementTree.XMLPullParser` chunk by
+chunk.  Each ``<item>`` / ``<entry>`` is turned into a flat dict as soon as
+its closing tag arrives and is then detached from the tree, so memory stays
+bounded by the largest single entry rather than the whole document.  Parsing
+stops (and no further chunks are read) once *max_items* entries have been
+emitted.
+"""
+
+from typing import Dict, Iterable, Iterator, List, Optional
+from xml.etree import ElementTree as ET
+
+ATOM_NS = "{http://www.w3.org/2005/Atom}"
+_RSS_ITEM = "item"
+_ATOM_ENTRY = f"{ATOM_NS}entry"
+
+
+def _text(elem: Optional[ET.Element]) -> str:
+    return (elem.text or "").strip() if elem is not None else ""
+
+
+def _rss_fields(item: ET.Element) -> Dict[str, str]:
+    return {
+        "title": _text(item.find("title")),
+        "link": _text(item.find("link")),
+        "published": _text(item.find("pubDate")),
+        "summary": item.findtext("description") or "",
+        "format": "rss",
+    }
+
+
+def _atom_link(entry: ET.Element) -> str:
+    fallback = ""
+    for link in entry.iter(f"{ATOM_NS}link"):
+        href = (link.get("href") or "").strip()
+        if link.get("rel", "alternate") == "alternate" and href:
+            return href
+        fallback = fallback or href
+    return fallback
+
+
+def _atom_fields(entry: ET.Element) -> Dict[str, str]:
+    published = entry.find(f"{ATOM_NS}published")
+    if published is None:
+        published = entry.find(f"{ATOM_NS}updated")
+    summary = entry.find(f"{ATOM_NS}summary")
+    if summary is None:
+        summary = entry.find(f"{ATOM_NS}content")
+    return {
+        "title": _text(entry.find(f"{ATOM_NS}title")),
+        "link": _atom_link(entry),
+        "published": _text(published),
+        "summary": (summary.text or "") if summary is not None else "",
+        "format": "atom",
+    }
+
+
+def iter_entries(chunks: Iterable[bytes], max_items: Optional[int] = None) -> Iterator[Dict[str, str]]:
+    """Yield ``title/link/published/summary/format`` dicts from a feed body.
+
+    *chunks* is any iterable of bytes (e.g. ``resp.iter_content()``).  RSS
+    items and Atom entries are recognised in the same pass.  Raises
+    :class:`xml.etree.ElementTree.ParseError` on malformed XML; entries
+    already yielded before the error remain valid.
+    """
+    if max_items is not None and max_items <= 0:
+        return
+    parser = ET.XMLPullParser(events=("start", "end"))
+    stack: List[ET.Element] = []
+    emitted = 0
+
+    for chunk in chunks:
+        if not chunk:
+            continue
+        parser.feed(chunk)
+        for event, elem in parser.read_events():
+            if event == "start":
+                stack.append(elem)
+                continue
+            stack.pop()
+            if elem.tag == _RSS_ITEM:
+                fields = _rss_fields(elem)
+            elif elem.tag == _ATOM_ENTRY:
+                fields = _atom_fields(elem)
+            else:
+                continue
+            # Detach the finished entry so the tree never holds more than one.
+            if stack:
+                stack[-1].remove(elem)
+            elem.clear()
+            yield fields
+            emitted += 1
+            if max_items is not None and emitted >= max_items:
+                return
+    parser.close()
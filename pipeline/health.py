@@ -0,0 +1,184 @@
+"""Persistent per-source health: latency, failures, adaptive timeouts, circuit breaker.
+
+Each source key (``github:owner/repo``, ``rss:Feed Name``) maps to::
+
+    {"ewma_latency": 0.42, "latencies": [...], "successes": 31, "failures": 2,
+     "consecutive_failures": 0, "open_until": null, "last_error": ""}
+
+Request timeouts are derived from the p95 of the recent latencies, so a
+normally fast host no longer gets the full 10 s to fail.  After
+``failure_threshold`` consecutive failed runs the circuit opens and the
+source is skipped until ``open_until``; the first run after the cool-down
+tries it once more, and another failure reopens the circuit immediately.
+"""
+
+import json
+import logging
+import math
+import os
+import threading
+import time
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Callable, Dict, List, Optional
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_HEALTH_PATH = Path("data/state/source_health.json")
+DEFAULT_EWMA_ALPHA = 0.3
+DEFAULT_WINDOW = 20  # latencies kept per source for the p95
+DEFAULT_MIN_SAMPLES = 5  # below this the default timeout is used
+DEFAULT_TIMEOUT_FACTOR = 3.0
+DEFAULT_MIN_TIMEOUT = 2.0
+DEFAULT_MAX_TIMEOUT = 10.0
+DEFAULT_FAILURE_THRESHOLD = 3
+DEFAULT_COOLDOWN_HOURS = 24.0
+
+
+def _iso(ts: float) -> str:
+    return datetime.fromtimestamp(ts, tz=timezone.utc).isoformat()
+
+
+def _epoch(iso: Optional[str]) -> Optional[float]:
+    try:
+        return datetime.fromisoformat(iso).timestamp() if iso else None
+    except ValueError:
+        return None
+
+
+def p95(values: List[float]) -> float:
+    """Nearest-rank 95th percentile of *values* (which must be non-empty)."""
+    ordered = sorted(values)
+    return ordered[max(math.ceil(0.95 * len(ordered)) - 1, 0)]
+
+
+class HealthStore:
+    """JSON-backed per-source health records with a circuit breaker.
+
+    *clock* returns epoch seconds and is injectable for tests.
+    """
+
+    def __init__(
+        self,
+        path: Path = DEFAULT_HEALTH_PATH,
+        alpha: float = DEFAULT_EWMA_ALPHA,
+        window: int = DEFAULT_WINDOW,
+        timeout_factor: float = DEFAULT_TIMEOUT_FACTOR,
+        min_timeout: float = DEFAULT_MIN_TIMEOUT,
+        max_timeout: float = DEFAULT_MAX_TIMEOUT,
+        failure_threshold: int = DEFAULT_FAILURE_THRESHOLD,
+        cooldown_hours: float = DEFAULT_COOLDOWN_HOURS,
+        clock: Callable[[], float] = time.time,
+    ):
+        self.path = Path(path)
+        self.alpha = alpha
+        self.window = window
+        self.timeout_factor = timeout_factor
+        self.min_timeout = min_timeout
+        self.max_timeout = max_timeout
+        self.failure_threshold = failure_threshold
+        self.cooldown = cooldown_hours * 3600
+        self._clock = clock
+        self._lock = threading.Lock()
+        self._sources: Dict[str, Dict] = {}
+        self.skipped: List[str] = []
+        self.opened: List[str] = []
+        if self.path.exists():
+            try:
+                self._sources = json.loads(self.path.read_text(encoding="utf-8"))
+            except (OSError, json.JSONDecodeError) as exc:
+                logger.warning("Ignoring unreadable source health file %s: %s", self.path, exc)
+
+    @classmethod
+    def from_config(cls, cfg: Optional[Dict]) -> "HealthStore":
+        """Build a store from the ``ingest.health`` section of topics.yaml."""
+        cfg = cfg or {}
+        return cls(
+            path=Path(cfg.get("path", DEFAULT_HEALTH_PATH)),
+            alpha=float(cfg.get("ewma_alpha", DEFAULT_EWMA_ALPHA)),
+            window=int(cfg.get("window", DEFAULT_WINDOW)),
+            timeout_factor=float(cfg.get("timeout_factor", DEFAULT_TIMEOUT_FACTOR)),
+            min_timeout=float(cfg.get("min_timeout_seconds", DEFAULT_MIN_TIMEOUT)),
+            max_timeout=float(cfg.get("max_timeout_seconds", DEFAULT_MAX_TIMEOUT)),
+            failure_threshold=int(cfg.get("failure_threshold", DEFAULT_FAILURE_THRESHOLD)),
+            cooldown_hours=float(cfg.get("cooldown_hours", DEFAULT_COOLDOWN_HOURS)),
+        )
+
+    def get(self, key: str) -> Optional[Dict]:
+        with self._lock:
+            record = self._sources.get(key)
+            return dict(record) if record else None
+
+    def timeout(self, key: str) -> float:
+        """Request timeout for *key*: p95 latency x factor, within the bounds."""
+        with self._lock:
+            latencies = list(self._sources.get(key, {}).get("latencies", []))
+        if len(latencies) < DEFAULT_MIN_SAMPLES:
+            return self.max_timeout
+        return min(max(p95(latencies) * self.timeout_factor, self.min_timeout), self.max_timeout)
+
+    def allow(self, key: str) -> bool:
+        """False while the circuit for *key* is open; the skip is recorded."""
+        with self._lock:
+            open_until = _epoch(self._sources.get(key, {}).get("open_until"))
+            if open_until is not None and self._clock() < open_until:
+                self.skipped.append(key)
+                return False
+        return True
+
+    def record(self, key: str, latencies: List[float], error: Optional[str] = None) -> None:
+        """Fold one fetch of *key* into its record.
+
+        *latencies* are the per-request response times observed; *error* is
+        set when any request of the fetch failed.
+        """
+        with self._lock:
+            rec = self._sources.setdefault(key, {
+                "ewma_latency": None,
+                "latencies": [],
+                "successes": 0,
+                "failures": 0,
+                "consecutive_failures": 0,
+                "open_until": None,
+                "last_error": "",
+            })
+            for latency in latencies:
+                prev = rec["ewma_latency"]
+                rec["ewma_latency"] = round(
+                    latency if prev is None else self.alpha * latency + (1 - self.alpha) * prev, 4
+                )
+                rec["latencies"] = (rec["latencies"] + [round(latency, 4)])[-self.window:]
+            if error is None:
+                rec["successes"] += 1
+                rec["consecutive_failures"] = 0
+                rec["open_until"] = None
+                return
+            rec["failures"] += 1
+            rec["consecutive_failures"] += 1
+            rec["last_error"] = error[:200]
+            if rec["consecutive_failures"] >= self.failure_threshold:
+                rec["open_until"] = _iso(self._clock() + self.cooldown)
+                self.opened.append(key)
+                logger.warning(
+                    "Circuit open for %s after %d failures (until %s)",
+                    key, rec["consecutive_failures"], rec["open_until"],
+                )
+
+    def summary(self) -> Dict:
+        with self._lock:
+            return {
+                "skipped_sources": sorted(set(self.skipped)),
+                "opened": sorted(set(self.opened)),
+                "open_circuits": sorted(
+                    key for key, rec in self._sources.items()
+                    if (_epoch(rec.get("open_until")) or 0) > self._clock()
+                ),
+            }
+
+    def save(self) -> None:
+        with self._lock:
+            payload = json.dumps(self._sources, indent=2, sort_keys=True)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = self.path.with_suffix(self.path.suffix + ".tmp")
+        tmp.write_text(payload, encoding="utf-8")
+        os.replace(tmp, self.path)
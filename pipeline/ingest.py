@@ -2,16 +2,45 @@
 
 import logging
 import os
-import re
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, wait
 from datetime import datetime, timezone
-from typing import Dict, List, Optional
+from typing import Callable, Dict, Iterable, List, NamedTuple, Optional
+from urllib.parse import urlparse
 from xml.etree import ElementTree as ET
 
 import requests
 
+from . import dates, feeds, session, text
+from .cache import ResponseCache
+from .cursors import CursorStore, is_past_cursor, published_key
+from .deadline import Deadline
+from .health import HealthStore
+from .ratelimit import GitHubScheduler
+
 logger = logging.getLogger(__name__)
 
 GITHUB_API = "https://api.github.com"
+DEFAULT_MAX_WORKERS = 8
+DEFAULT_PER_HOST_LIMIT = 4
+DEFAULT_MAX_ITEMS_PER_FEED = 50
+DEFAULT_MAX_PAGES = 10
+RELEASES_PER_PAGE = 100
+GRAPHQL_BATCH_SIZE = 20
+GRAPHQL_RELEASES_PER_REPO = 20
+GRAPHQL_TIMEOUT = 30.0
+_GRAPHQL_RELEASE_FIELDS = "databaseId name tagName url publishedAt createdAt description"
+FEED_CHUNK_SIZE = 64 * 1024
+REQUEST_TIMEOUT = 10.0
+CANCEL_GRACE_SECONDS = 2.0  # time in-flight fetches get to hand back partial items
+
+# Per-run state set by ingest_all (None = disabled).
+_cache: Optional[ResponseCache] = None
+_scheduler: Optional[GitHubScheduler] = None
+# Per-source request timeout, run deadline and observed latencies/errors, set by _timed_fetch.
+_fetch_context = threading.local()
+
 _SESSION_HEADERS = {
     "Accept": "application/vnd.github+json",
     "X-GitHub-Api-Version": "2022-11-28",
@@ -26,121 +55,657 @@ def _github_headers() -> Dict[str, str]:
     return headers
 
 
+def _request_timeout() -> float:
+    timeout = getattr(_fetch_context, "timeout", REQUEST_TIMEOUT)
+    deadline = getattr(_fetch_context, "deadline", None)
+    return deadline.clamp(timeout) if deadline is not None else timeout
+
+
+def _out_of_time() -> bool:
+    deadline = getattr(_fetch_context, "deadline", None)
+    return deadline is not None and deadline.expired()
+
+
+def _until_out_of_time(chunks: Iterable[bytes]) -> Iterable[bytes]:
+    """Stop a streamed body once the run deadline has passed."""
+    for chunk in chunks:
+        if _out_of_time():
+            return
+        yield chunk
+
+
+def _observe(resp: Optional[requests.Response] = None, error: Optional[str] = None) -> None:
+    """Note a response time or failure against the source being fetched."""
+    observed = getattr(_fetch_context, "observed", None)
+    if observed is None:
+        return
+    if resp is not None:
+        observed["latencies"].append(resp.elapsed.total_seconds())
+    if error is not None:
+        observed["error"] = error
+
+
+def _mark_incomplete() -> None:
+    """Note that the source being fetched stopped short of its cursor."""
+    observed = getattr(_fetch_context, "observed", None)
+    if observed is not None:
+        observed["incomplete"] = True
+
+
 def _get(url: str, **kwargs) -> Optional[requests.Response]:
+    if _out_of_time():
+        return None
     try:
-        resp = requests.get(url, timeout=10, **kwargs)
+        resp = session.get_session().get(url, timeout=_request_timeout(), **kwargs)
+        _observe(resp)
         resp.raise_for_status()
         return resp
     except Exception as exc:  # noqa: BLE001
         logger.warning("GET %s failed: %s", url, exc)
+        _observe(error=str(exc))
+        return None
+
+
+def _github_get(url: str, key: str = "", **kwargs) -> Optional[requests.Response]:
+    """GET a GitHub API URL through the run's rate-limit scheduler, if any."""
+    scheduler = _scheduler
+    if scheduler is None:
+        return _get(url, **kwargs)
+    if _out_of_time():
         return None
+    resp = scheduler.get(url, key=key, timeout=_request_timeout(), **kwargs)
+    if resp is not None:
+        _observe(resp)
+    elif (key or url) not in scheduler.refused:  # a budget refusal says nothing about the host
+        _observe(error=f"GET {url} failed")
+    return resp
+
 
+class _TruncatedBody(Exception):
+    """A streamed body broke off; *items* were parsed before it did."""
 
-def fetch_github_releases(owner: str, repo: str, topics: List[str]) -> List[Dict]:
-    """Fetch the latest GitHub releases for a repository."""
-    url = f"{GITHUB_API}/repos/{owner}/{repo}/releases?per_page=10"
-    resp = _get(url, headers=_github_headers())
-    if not resp:
+    def __init__(self, items: List[Dict]):
+        super().__init__()
+        self.items = items
+
+
+def _fetch_cached(
+    url: str,
+    parse: Callable[[requests.Response], List[Dict]],
+    variant: str = "",
+    headers: Optional[Dict[str, str]] = None,
+    stream: bool = False,
+    get: Callable[..., Optional[requests.Response]] = _get,
+) -> List[Dict]:
+    """GET *url* conditionally and parse it, serving 304s from the cache."""
+    cache = _cache
+    headers = dict(headers or {})
+    if cache is not None:
+        headers.update(cache.validators(url, variant))
+    resp = get(url, headers=headers, stream=stream)
+    if resp is None:
         return []
+    with resp:
+        if resp.status_code == 304 and cache is not None:
+            cached = cache.items(url)
+            if cached is not None:
+                logger.info("Not modified, using cached items: %s", url)
+                return cached
+        try:
+            items = parse(resp)
+        except (requests.RequestException, _TruncatedBody) as exc:
+            # A dropped or stalled body: keep what was parsed, never cache it.
+            cause = exc.__cause__ if isinstance(exc, _TruncatedBody) else exc
+            partial = exc.items if isinstance(exc, _TruncatedBody) else []
+            logger.warning("Reading %s failed after %d items: %s", url, len(partial), cause)
+            _observe(error=str(cause))
+            return partial
+    if cache is not None and not _out_of_time():  # a body cut off by the deadline is incomplete
+        cache.store(url, resp.headers, items, variant)
+    return items
+
+
+def fetch_github_releases(
+    owner: str,
+    repo: str,
+    topics: List[str],
+    since: Optional[Dict] = None,
+    max_pages: int = DEFAULT_MAX_PAGES,
+) -> List[Dict]:
+    """Fetch GitHub releases for a repository, newest first.
+
+    Follows ``Link: rel="next"`` pagination until the *since* cursor (a
+    ``raw_id``/``published_at`` high-water mark) is reached or *max_pages*
+    pages have been read.  Without a cursor this is a full backfill.
+
+    If a page fails, or *max_pages* runs out before the cursor is reached,
+    the pages read so far are returned and the fetch is marked incomplete,
+    so :func:`ingest_all` leaves the cursor where it was.
+    """
+    base = url = f"{GITHUB_API}/repos/{owner}/{repo}/releases?per_page={RELEASES_PER_PAGE}"
+    key = f"github:{owner}/{repo}"
+    items: List[Dict] = []
+    complete = False
+    for number in range(1, max_pages + 1):
+        page: Dict = {"parsed": False, "next": None}
+
+        def _parse(resp: requests.Response) -> List[Dict]:
+            page["parsed"] = True
+            page["next"] = resp.links.get("next", {}).get("url")
+            return _parse_releases(resp.json(), owner, repo, topics)
+
+        batch = _fetch_cached(
+            url,
+            _parse,
+            variant=repr(sorted(topics)),
+            headers=_github_headers(),
+            get=lambda u, **kw: _github_get(u, key=key, **kw),
+        )
+        fresh = [i for i in batch if not is_past_cursor(i["raw_id"], i["published_at"], since)]
+        items.extend(fresh)
+        if len(fresh) < len(batch):  # reached the cursor
+            complete = True
+            break
+        if page["parsed"]:
+            if not page["next"]:
+                complete = True
+                break
+            url = page["next"]
+        elif batch:  # served from the cache on a 304, which carries no Link header
+            if len(batch) < RELEASES_PER_PAGE:
+                complete = True
+                break
+            url = f"{base}&page={number + 1}"
+        else:  # the request failed, was refused or ran out of time
+            break
+    else:
+        complete = since is None  # a backfill stops at max_pages by design
+    if not complete:
+        logger.warning("Releases of %s/%s stopped before the last run's cursor; keeping it", owner, repo)
+        _mark_incomplete()
+    return items
+
+
+def _parse_releases(releases: List[Dict], owner: str, repo: str, topics: List[str]) -> List[Dict]:
     items = []
-    for rel in resp.json():
+    for rel in releases:
         items.append({
             "raw_id": str(rel.get("id", "")),
             "title": (rel.get("name") or rel.get("tag_name", "")).strip(),
             "url": rel.get("html_url", ""),
-            "published_at": rel.get("published_at") or rel.get("created_at", ""),
+            "published_at": dates.normalize_date(rel.get("published_at") or rel.get("created_at")),
             "source": f"{owner}/{repo}",
             "source_type": "github_release",
             "topics": list(topics),
-            "snippet": (rel.get("body") or "")[:400],
+            "snippet": text.markdown_snippet(rel.get("body") or ""),
         })
     return items
 
 
-def _parse_rss_date(raw: str) -> str:
-    """Parse RSS pubDate into ISO 8601; fall back to now on failure."""
-    for fmt in ("%a, %d %b %Y %H:%M:%S %z", "%a, %d %b %Y %H:%M:%S GMT"):
+def _graphql_query(count: int, per_repo: int) -> str:
+    """One aliased query fetching the newest releases of *count* repositories."""
+    params = ", ".join(f"$o{i}: String!, $n{i}: String!" for i in range(count))
+    repos = "\n".join(
+        f"  r{i}: repository(owner: $o{i}, name: $n{i}) {{ "
+        f"releases(first: {per_repo}, orderBy: {{field: CREATED_AT, direction: DESC}}) {{ "
+        f"pageInfo {{ hasNextPage }} nodes {{ {_GRAPHQL_RELEASE_FIELDS} }} }} }}"
+        for i in range(count)
+    )
+    return f"query({params}) {{\n{repos}\n  rateLimit {{ cost remaining }}\n}}"
+
+
+def _graphql_release(node: Dict) -> Dict:
+    """Map a GraphQL Release node onto the REST release shape."""
+    return {
+        "id": node.get("databaseId"),
+        "name": node.get("name"),
+        "tag_name": node.get("tagName") or "",
+        "html_url": node.get("url", ""),
+        "published_at": node.get("publishedAt"),
+        "created_at": node.get("createdAt", ""),
+        "body": node.get("description"),
+    }
+
+
+def fetch_github_releases_graphql(
+    repos: List[Dict],
+    batch_size: int = GRAPHQL_BATCH_SIZE,
+    per_repo: int = GRAPHQL_RELEASES_PER_REPO,
+    stats: Optional[Dict] = None,
+    deadline: Optional[Deadline] = None,
+) -> List[Optional[List[Dict]]]:
+    """Fetch the newest releases of many repositories with batched GraphQL queries.
+
+    *repos* is a list of ``{"owner", "repo", "topics", "since"}`` dicts.  Each
+    batch of *batch_size* repos is one aliased query against
+    ``{GITHUB_API}/graphql``.  Returns, per input repo, the same raw item
+    dicts as :func:`fetch_github_releases` -- or ``None`` where the caller
+    must fall back to REST: the batch failed, the repo could not be
+    resolved, or more than *per_repo* new releases exist (only REST
+    pagination can reach further back).
+
+    With a *deadline*, each query's timeout is clamped to it and no further
+    batches are sent once it has passed; their repos are left to REST.
+    """
+    results: List[Optional[List[Dict]]] = [None] * len(repos)
+    if not os.getenv("GITHUB_TOKEN"):
+        logger.info("GraphQL requires GITHUB_TOKEN; using REST for all repositories")
+        return results
+
+    for start in range(0, len(repos), batch_size):
+        if deadline is not None and deadline.expired():
+            logger.warning("Deadline reached; %d repositories left to REST", len(repos) - start)
+            break
+        batch = repos[start:start + batch_size]
+        variables = {}
+        for i, r in enumerate(batch):
+            variables[f"o{i}"], variables[f"n{i}"] = r["owner"], r["repo"]
         try:
-            return datetime.strptime(raw, fmt).isoformat()
-        except ValueError:
-            continue
-    return datetime.now(tz=timezone.utc).isoformat()
+            resp = session.get_session().post(
+                f"{GITHUB_API}/graphql",
+                json={"query": _graphql_query(len(batch), per_repo), "variables": variables},
+                headers=_github_headers(),
+                timeout=deadline.clamp(GRAPHQL_TIMEOUT) if deadline is not None else GRAPHQL_TIMEOUT,
+            )
+            resp.raise_for_status()
+            payload = resp.json()
+            data = payload.get("data") or {}
+        except Exception as exc:  # noqa: BLE001
+            logger.warning("GraphQL batch of %d repos failed: %s", len(batch), exc)
+            data, payload = {}, {}
+        for err in payload.get("errors", []) or []:
+            logger.warning("GraphQL error: %s", err.get("message", err))
+        if stats is not None:
+            stats["batches"] = stats.get("batches", 0) + 1
+            stats["cost"] = stats.get("cost", 0) + ((data.get("rateLimit") or {}).get("cost") or 0)
 
+        for i, r in enumerate(batch):
+            releases = (data.get(f"r{i}") or {}).get("releases")
+            if releases is None:
+                continue
+            since = r.get("since")
+            items = _parse_releases(
+                [_graphql_release(n) for n in releases.get("nodes", [])], r["owner"], r["repo"], r["topics"]
+            )
+            fresh = [it for it in items if not is_past_cursor(it["raw_id"], it["published_at"], since)]
+            reached_cursor = since is not None and len(fresh) < len(items)
+            if releases.get("pageInfo", {}).get("hasNextPage") and not reached_cursor:
+                continue
+            results[start + i] = fresh
 
-def _parse_atom_date(raw: str) -> str:
-    """Parse Atom/ISO date into ISO 8601; fall back to now on failure."""
-    try:
-        return datetime.fromisoformat(raw.replace("Z", "+00:00")).isoformat()
-    except (ValueError, AttributeError):
-        return datetime.now(tz=timezone.utc).isoformat()
+    if stats is not None:
+        stats["fallbacks"] = stats.get("fallbacks", 0) + sum(1 for r in results if r is None)
+    return results
 
 
-def fetch_rss(url: str, name: str, topics: List[str]) -> List[Dict]:
-    """Fetch and parse an RSS 2.0 or Atom feed."""
-    resp = _get(url)
-    if not resp:
-        return []
+def fetch_rss(
+    url: str,
+    name: str,
+    topics: List[str],
+    max_items: Optional[int] = None,
+    since: Optional[Dict] = None,
+) -> List[Dict]:
+    """Fetch and parse an RSS 2.0 or Atom feed.
+
+    The body is streamed and parsed incrementally; at most *max_items* entries
+    are kept and the download stops as soon as that many have been read, or
+    when the entry recorded in the *since* cursor is reached.
+    """
+    items = _fetch_cached(
+        url,
+        lambda resp: _parse_feed(
+            _until_out_of_time(resp.iter_content(FEED_CHUNK_SIZE)), url, name, topics, max_items, since
+        ),
+        variant=repr((name, sorted(topics), max_items)),
+        stream=True,
+    )
+    return [i for i in items if not is_past_cursor(i["raw_id"], i["published_at"], since)]
+
+
+def _parse_feed(
+    chunks: Iterable[bytes],
+    url: str,
+    name: str,
+    topics: List[str],
+    max_items: Optional[int] = None,
+    since: Optional[Dict] = None,
+) -> List[Dict]:
+    stop_at = since.get("raw_id") if since else None
+    items: List[Dict] = []
     try:
-        root = ET.fromstring(resp.content)
+        for entry in feeds.iter_entries(chunks):
+            link = entry["link"]
+            if not link:
+                continue
+            if link == stop_at:
+                break
+            items.append({
+                "raw_id": link,
+                "title": entry["title"],
+                "url": link,
+                "published_at": dates.normalize_date(entry["published"]),
+                "source": name,
+                "source_type": "rss",
+                "topics": list(topics),
+                "snippet": text.html_snippet(entry["summary"]),
+            })
+            if max_items is not None and len(items) >= max_items:
+                break
     except ET.ParseError as exc:
-        logger.warning("RSS parse error for %s: %s", url, exc)
-        return []
+        logger.warning("RSS parse error for %s after %d items: %s", url, len(items), exc)
+    except requests.RequestException as exc:
+        raise _TruncatedBody(items) from exc
+    return items
 
-    items: List[Dict] = []
 
-    # RSS 2.0
-    for item in root.findall(".//item"):
-        link = (item.findtext("link") or "").strip()
-        if not link:
-            continue
-        desc = re.sub(r"<[^>]+>", "", item.findtext("description") or "")
-        items.append({
-            "raw_id": link,
-            "title": (item.findtext("title") or "").strip(),
-            "url": link,
-            "published_at": _parse_rss_date((item.findtext("pubDate") or "").strip()),
-            "source": name,
-            "source_type": "rss",
-            "topics": list(topics),
-            "snippet": desc[:400].strip(),
-        })
+class SourceTask(NamedTuple):
+    """A single configured source: a stable key, its host, and a fetch thunk.
 
-    # Atom 1.0
-    atom_ns = "http://www.w3.org/2005/Atom"
-    for entry in root.findall(f".//{{{atom_ns}}}entry"):
-        link_el = entry.find(f"{{{atom_ns}}}link")
-        link = (link_el.get("href") if link_el is not None else "").strip()
-        if not link:
-            continue
-        title_el = entry.find(f"{{{atom_ns}}}title")
-        pub_el = entry.find(f"{{{atom_ns}}}published") or entry.find(f"{{{atom_ns}}}updated")
-        summary_el = entry.find(f"{{{atom_ns}}}summary")
-        snippet = re.sub(r"<[^>]+>", "", (summary_el.text if summary_el is not None else ""))[:400]
-        items.append({
-            "raw_id": link,
-            "title": (title_el.text if title_el is not None else "").strip(),
-            "url": link,
-            "published_at": _parse_atom_date((pub_el.text if pub_el is not None else "").strip()),
-            "source": name,
-            "source_type": "rss",
-            "topics": list(topics),
-            "snippet": snippet.strip(),
-        })
+    *value* is the expected value of fetching it, used to decide which
+    GitHub sources get the rate-limit budget when it runs short.  *src* and
+    *since* keep the config entry and cursor the thunk was built from.
+    """
 
-    return items
+    key: str
+    host: str
+    fetch: Callable[[], List[Dict]]
+    value: float = 1.0
+    src: Optional[Dict] = None
+    since: Optional[Dict] = None
+
+
+def _expected_value(src: Dict, since: Optional[Dict]) -> float:
+    """Configured priority x topic breadth x recent activity of a source.
+
+    Activity halves for every 30 days since the source's newest known item;
+    a source that has never been fetched counts as fully active.
+    """
+    priority = float(src.get("priority", 1.0))
+    breadth = 1 + len(src.get("topics", []))
+    last = published_key(since.get("published_at", "")) if since else None
+    if last is None:
+        return priority * breadth
+    age_days = max((datetime.now(tz=timezone.utc) - last).total_seconds() / 86400, 0)
+    return priority * breadth * 0.5 ** (age_days / 30)
 
 
-def ingest_all(config: Dict) -> List[Dict]:
-    """Ingest items from all configured sources."""
+def _source_tasks(config: Dict, cursors: Optional[CursorStore] = None) -> List[SourceTask]:
+    """Build fetch tasks for every configured source, in config order.
+
+    When *cursors* is given each fetch only walks back to that source's
+    high-water mark; otherwise it performs a full backfill.
+    """
     sources = config.get("sources", {})
-    items: List[Dict] = []
+    ingest_cfg = config.get("ingest", {}) or {}
+    tasks: List[SourceTask] = []
+    github_host = urlparse(GITHUB_API).netloc
+    max_pages = int(ingest_cfg.get("max_pages", DEFAULT_MAX_PAGES))
+
+    def _since(key: str) -> Optional[Dict]:
+        return cursors.get(key) if cursors is not None else None
 
     for src in sources.get("github_releases", []):
-        logger.info("Fetching GitHub releases: %s/%s", src["owner"], src["repo"])
-        items.extend(fetch_github_releases(src["owner"], src["repo"], src.get("topics", [])))
+        owner, repo, topics = src["owner"], src["repo"], src.get("topics", [])
+        key = f"github:{owner}/{repo}"
+        tasks.append(SourceTask(
+            key=key,
+            host=github_host,
+            fetch=lambda o=owner, r=repo, t=topics, s=_since(key): fetch_github_releases(
+                o, r, t, since=s, max_pages=max_pages
+            ),
+            value=_expected_value(src, _since(key)),
+            src=src,
+            since=_since(key),
+        ))
 
+    default_cap = ingest_cfg.get("max_items_per_feed", DEFAULT_MAX_ITEMS_PER_FEED)
     for src in sources.get("rss_feeds", []):
-        logger.info("Fetching RSS: %s", src["name"])
-        items.extend(fetch_rss(src["url"], src["name"], src.get("topics", [])))
+        url, name, topics = src["url"], src["name"], src.get("topics", [])
+        key = f"rss:{name}"
+        cap = src.get("max_items", default_cap)
+        tasks.append(SourceTask(
+            key=key,
+            host=urlparse(url).netloc,
+            fetch=lambda u=url, n=name, t=topics, c=cap, s=_since(key): fetch_rss(
+                u, n, t, max_items=c, since=s
+            ),
+            src=src,
+            since=_since(key),
+        ))
+
+    return tasks
+
+
+def _timed_fetch(
+    task: SourceTask,
+    host_slots: Dict[str, threading.BoundedSemaphore],
+    health: Optional[HealthStore] = None,
+    deadline: Optional[Deadline] = None,
+) -> tuple:
+    """Run one source fetch; returns ``(items, elapsed, cut_short, incomplete)``.
+
+    *cut_short* is True when the deadline passed before the fetch finished,
+    in which case *items* may be incomplete.  *incomplete* is True when the
+    fetch itself stopped short of the source's cursor.
+    """
+    with host_slots[task.host]:
+        if deadline is not None and deadline.expired():
+            return [], 0.0, True, False
+        logger.info("Fetching %s", task.key)
+        _fetch_context.timeout = health.timeout(task.key) if health is not None else REQUEST_TIMEOUT
+        _fetch_context.deadline = deadline
+        _fetch_context.observed = observed = {"latencies": [], "error": None, "incomplete": False}
+        start = time.perf_counter()
+        try:
+            items = task.fetch()
+        finally:
+            elapsed = time.perf_counter() - start
+            del _fetch_context.timeout, _fetch_context.deadline, _fetch_context.observed
+        cut_short = deadline is not None and deadline.expired()
+        # A fetch aborted by the deadline says nothing about the host's health.
+        if health is not None and not cut_short:
+            health.record(task.key, observed["latencies"], observed["error"])
+        return items, elapsed, cut_short, observed["incomplete"]
+
+
+def _prioritise(
+    tasks: List[SourceTask],
+    scheduler: Optional[GitHubScheduler],
+    health: Optional[HealthStore] = None,
+) -> List[int]:
+    """Order task indices for submission, dropping skipped sources.
+
+    Sources whose circuit breaker is open are left out first.  GitHub tasks
+    are submitted highest expected value first.  If the scheduler knows the
+    remaining budget and it cannot give every GitHub source at least one
+    request, the lowest-value ones are left out and recorded as refused.
+    """
+    github_host = urlparse(GITHUB_API).netloc
+    allowed = [i for i, t in enumerate(tasks) if health is None or health.allow(t.key)]
+    github = [i for i in allowed if tasks[i].host == github_host]
+    others = [i for i in allowed if tasks[i].host != github_host]
+    if scheduler is None:
+        return github + others
+
+    if github:
+        scheduler.refresh(GITHUB_API, _github_headers())
+    github.sort(key=lambda i: tasks[i].value, reverse=True)
+    budget = scheduler.affordable()
+    if budget is not None and budget < len(github):
+        for i in github[budget:]:
+            logger.warning("GitHub budget too low; skipping %s", tasks[i].key)
+            scheduler.refused.append(tasks[i].key)
+        github = github[:budget]
+    return github + others
+
+
+def _use_graphql(
+    tasks: List[SourceTask],
+    run_order: List[int],
+    ingest_cfg: Dict,
+    stats: Dict,
+    deadline: Optional[Deadline] = None,
+) -> None:
+    """Prefetch scheduled GitHub sources via batched GraphQL, in place.
+
+    Each GitHub task that GraphQL could serve gets a thunk returning the
+    prefetched items; the others keep their REST fetch as the fallback.
+    """
+    github_host = urlparse(GITHUB_API).netloc
+    indices = [i for i in run_order if tasks[i].host == github_host]
+    repos = [
+        {
+            "owner": tasks[i].src["owner"],
+            "repo": tasks[i].src["repo"],
+            "topics": tasks[i].src.get("topics", []),
+            "since": tasks[i].since,
+        }
+        for i in indices
+    ]
+    fetched = fetch_github_releases_graphql(
+        repos,
+        batch_size=int(ingest_cfg.get("graphql_batch_size", GRAPHQL_BATCH_SIZE)),
+        per_repo=int(ingest_cfg.get("graphql_releases_per_repo", GRAPHQL_RELEASES_PER_REPO)),
+        stats=stats,
+        deadline=deadline,
+    )
+    for i, items in zip(indices, fetched):
+        if items is not None:
+            tasks[i] = tasks[i]._replace(fetch=lambda found=items: found)
+
+
+def ingest_all(
+    config: Dict,
+    stats: Optional[Dict] = None,
+    cache: Optional[ResponseCache] = None,
+    cursors: Optional[CursorStore] = None,
+    scheduler: Optional[GitHubScheduler] = None,
+    transport=None,
+    health: Optional[HealthStore] = None,
+    deadline: Optional[Deadline] = None,
+) -> List[Dict]:
+    """Ingest items from all configured sources.
+
+    Sources are fetched on a bounded worker pool (``ingest.max_workers``) with
+    at most ``ingest.per_host_limit`` requests in flight per host.  Items are
+    returned in config order regardless of completion order.  Set
+    ``max_workers: 1`` to fetch sequentially.
+
+    All fetches share one pooled keep-alive session sized to the per-host
+    limit (``ingest.host_pool_sizes`` overrides it for individual hosts).
+
+    With a *cache*, fetches are conditional GETs and 304s are served from
+    it.  With *cursors*, each source is only walked back to its high-water
+    mark and the marks are advanced in memory; the caller saves both stores
+    once the run has been published.
+
+    With a *scheduler*, GitHub requests are paced against the API rate
+    limit.  When the known budget cannot cover every GitHub source, the
+    sources with the highest expected value are fetched and the rest are
+    skipped (and listed in the stats).
+
+    With *health*, each source's request timeout is derived from its
+    recent latencies, its outcome is recorded, and sources whose circuit
+    breaker is open are skipped (and listed in the stats).
+
+    With a *deadline*, fetches still outstanding when it passes are
+    abandoned: queued ones are cancelled and in-flight ones stop at their
+    next request or chunk and hand back what they have.  Those sources are
+    listed under ``cut_short`` in the stats and their cursors are not
+    advanced, so the next run picks up where this one stopped.  The same
+    goes for sources whose pagination stopped before their cursor (a failed
+    page or ``max_pages``), listed under ``incomplete``.
+
+    *transport* (a :class:`pipeline.replay.Recorder` or ``Replayer``) is
+    installed on the shared session to archive or replay raw responses.
+
+    If *stats* is given it is filled with timing information, including the
+    wall-clock time saved compared with fetching every source one by one.
+    """
+    global _cache, _scheduler
+    ingest_cfg = config.get("ingest", {}) or {}
+    max_workers = max(int(ingest_cfg.get("max_workers", DEFAULT_MAX_WORKERS)), 1)
+    per_host_limit = max(int(ingest_cfg.get("per_host_limit", DEFAULT_PER_HOST_LIMIT)), 1)
+
+    session.configure(
+        pool_maxsize=per_host_limit,
+        host_pool_sizes=ingest_cfg.get("host_pool_sizes"),
+        transport=transport,
+    )
+
+    tasks = _source_tasks(config, cursors)
+    host_slots = {t.host: threading.BoundedSemaphore(per_host_limit) for t in tasks}
+    run_order = _prioritise(tasks, scheduler, health)
+    backend = ingest_cfg.get("github_backend", "rest")
+
+    if scheduler is not None and deadline is not None and deadline.remaining() is not None:
+        scheduler.max_wait = min(scheduler.max_wait, deadline.remaining())
+
+    _cache, _scheduler = cache, scheduler
+    graphql_stats: Dict = {}
+    start = time.perf_counter()
+    try:
+        if backend == "graphql":
+            _use_graphql(tasks, run_order, ingest_cfg, graphql_stats, deadline)
+        results: Dict[int, tuple] = {}
+        if max_workers == 1 or len(run_order) <= 1:
+            for i in run_order:
+                results[i] = _timed_fetch(tasks[i], host_slots, health, deadline)
+        else:
+            pool = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="ingest")
+            pending: set = set()
+            try:
+                futures = {
+                    i: pool.submit(_timed_fetch, tasks[i], host_slots, health, deadline) for i in run_order
+                }
+                remaining = deadline.remaining() if deadline is not None else None
+                _, pending = wait(futures.values(), timeout=remaining)
+                if pending:
+                    logger.warning("Deadline reached with %d source(s) outstanding", len(pending))
+                    for future in pending:
+                        future.cancel()
+                    wait(pending, timeout=CANCEL_GRACE_SECONDS)
+                for i, future in futures.items():
+                    if future.done() and not future.cancelled():
+                        results[i] = future.result()
+            finally:
+                pool.shutdown(wait=not pending)
+    finally:
+        _cache, _scheduler = None, None
+    wall = time.perf_counter() - start
+
+    items: List[Dict] = []
+    cut_short: List[str] = []
+    incomplete: List[str] = []
+    for i, task in enumerate(tasks):
+        source_items, _, cut, partial = results.get(i, ([], 0.0, i in run_order, False))
+        items.extend(source_items)
+        if cut:
+            cut_short.append(task.key)
+        elif partial:
+            incomplete.append(task.key)
+        elif cursors is not None:
+            cursors.advance(task.key, source_items)
+
+    if stats is not None:
+        sequential = sum(result[1] for result in results.values())
+        stats.update({
+            "sources": len(tasks),
+            "max_workers": max_workers,
+            "per_host_limit": per_host_limit,
+            "wall_seconds": round(wall, 3),
+            "sequential_seconds": round(sequential, 3),
+            "saved_seconds": round(max(sequential - wall, 0.0), 3),
+            "connections": session.connection_stats(),
+            "cache": cache.stats() if cache is not None else None,
+            "incremental": cursors is not None,
+            "cursors_advanced": cursors.advanced if cursors is not None else 0,
+            "github": scheduler.summary() if scheduler is not None else None,
+            "github_backend": backend,
+            "graphql": graphql_stats or None,
+            "health": health.summary() if health is not None else None,
+            "cut_short": cut_short,
+            "incomplete": incomplete,
+        })
 
     return items
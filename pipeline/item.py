@@ -0,0 +1,144 @@
+"""Compact record type for items flowing through the pipeline.
+
+:class:`Item` stores the normalised schema in ``__slots__`` instead of a
+per-item dict, which roughly quarters the memory of an item and makes
+field reads plain attribute lookups.  It is also a ``MutableMapping``, so
+``item["score"]``, ``item.get("topics", [])``, ``"id" in item`` and
+``dict(item)`` keep working for every stage, test and caller written
+against plain dicts.  Keys outside the schema go to a lazily created
+``extra`` dict.
+
+Stages accept either form (:data:`ItemLike`); :func:`as_item` converts a
+dict when a stage wants attribute access.
+"""
+
+from collections.abc import MutableMapping
+from typing import Any, Dict, Iterator, List, Optional, Union
+
+SCHEMA_VERSION = "1"
+
+FIELDS = (
+    "id", "title", "url", "published_at", "published_ts", "source", "source_type",
+    "topics", "snippet", "score", "why_it_matters", "action", "_schema_version",
+)
+_FIELD_SET = frozenset(FIELDS)
+_UNSET = object()
+
+
+class Item(MutableMapping):
+    """One normalised item; attribute access or dict-style access."""
+
+    __slots__ = FIELDS + ("extra",)
+
+    def __init__(
+        self,
+        id: str = "",
+        title: str = "",
+        url: str = "",
+        published_at: str = "",
+        published_ts: Optional[float] = None,
+        source: str = "",
+        source_type: str = "",
+        topics: Optional[List[str]] = None,
+        snippet: str = "",
+        score: float = 0.0,
+        why_it_matters: str = "",
+        action: str = "",
+        _schema_version: str = SCHEMA_VERSION,
+        **extra: Any,
+    ):
+        self.id = id
+        self.title = title
+        self.url = url
+        self.published_at = published_at
+        self.published_ts = published_ts
+        self.source = source
+        self.source_type = source_type
+        self.topics = topics if topics is not None else []
+        self.snippet = snippet
+        self.score = score
+        self.why_it_matters = why_it_matters
+        self.action = action
+        self._schema_version = _schema_version
+        self.extra: Optional[Dict[str, Any]] = extra or None
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "Item":
+        """Build an item from a dict; keys missing from *data* stay unset."""
+        item = cls.__new__(cls)
+        item.extra = None
+        for key, value in data.items():
+            item[key] = value
+        return item
+
+    def to_dict(self) -> Dict[str, Any]:
+        return dict(self.items())
+
+    # -- mapping protocol ---------------------------------------------------
+
+    def __getitem__(self, key: str) -> Any:
+        if key in _FIELD_SET:
+            value = getattr(self, key, _UNSET)
+            if value is not _UNSET:
+                return value
+        elif self.extra is not None and key in self.extra:
+            return self.extra[key]
+        raise KeyError(key)
+
+    def get(self, key: str, default: Any = None) -> Any:
+        if key in _FIELD_SET:
+            return getattr(self, key, default)
+        return self.extra.get(key, default) if self.extra is not None else default
+
+    def __setitem__(self, key: str, value: Any) -> None:
+        if key in _FIELD_SET:
+            setattr(self, key, value)
+        elif self.extra is None:
+            self.extra = {key: value}
+        else:
+            self.extra[key] = value
+
+    def __delitem__(self, key: str) -> None:
+        if key in _FIELD_SET:
+            try:
+                delattr(self, key)
+            except AttributeError:
+                raise KeyError(key) from None
+        elif self.extra is not None and key in self.extra:
+            del self.extra[key]
+        else:
+            raise KeyError(key)
+
+    def __contains__(self, key: object) -> bool:
+        if key in _FIELD_SET:
+            return hasattr(self, key)  # type: ignore[arg-type]
+        return self.extra is not None and key in self.extra
+
+    def __iter__(self) -> Iterator[str]:
+        for key in FIELDS:
+            if hasattr(self, key):
+                yield key
+        if self.extra:
+            yield from self.extra
+
+    def __len__(self) -> int:
+        return sum(1 for _ in self)
+
+    def __repr__(self) -> str:
+        return f"Item({self.to_dict()!r})"
+
+    def __getstate__(self) -> Dict[str, Any]:
+        return self.to_dict()
+
+    def __setstate__(self, state: Dict[str, Any]) -> None:
+        self.extra = None
+        for key, value in state.items():
+            self[key] = value
+
+
+ItemLike = Union[Item, Dict[str, Any]]
+
+
+def as_item(item: ItemLike) -> Item:
+    """Return *item* itself if it is an :class:`Item`, else a converted copy."""
+    return item if isinstance(item, Item) else Item.from_dict(item)
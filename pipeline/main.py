@@ -2,28 +2,73 @@
 
 Usage:
     python -m pipeline.main [--dry-run] [--date YYYY-MM-DD] [--week YYYY-WW]
+                            [--no-cache] [--full-resync]
+                            [--record PATH | --replay PATH | --weekly] [--deadline SECONDS]
+                            [--output-dir DIR]
 
 Options:
     --dry-run   Use deterministic sample data; no network calls.
     --date      Override the report date (default: today UTC).
-    --week      Override the report week (default: current ISO week, YYYY-WW).
+    --week      Override the report week (default: current ISO week, YYYY-WW;
+                with --weekly, the last complete one).
     --config    Path to topics YAML (default: topics/topics.yaml).
+    --no-cache  Skip the conditional-GET validator cache and refetch every source.
+    --full-resync
+                Ignore saved per-source cursors and backfill every source.
+    --record    Archive every raw HTTP response of the ingest to PATH (a zip).
+                Combine with --full-resync to capture complete feeds.
+    --replay    Serve ingest responses from an archive written by --record;
+                no network calls, no state (cursors, cache, health, seen
+                index, item store) is read or saved, and reports and trends
+                go to a scratch directory unless --output-dir is given.
+    --weekly    Build the weekly report (daily runs do not write it) from the
+                items earlier runs put in the item store (no ingest, no
+                network calls), and re-export data/trends.json from the
+                trends store.  The week defaults to the last complete one.
+    --deadline  Wall-clock budget for the whole run, in seconds.  Fetches still
+                outstanding when it runs low are abandoned and the reports are
+                published from what arrived, marked partial.
+    --output-dir
+                Write reports/ and data/ under this directory.  Replays default
+                to a fresh scratch directory so they never touch the real history.
 """
 
 import argparse
 import json
 import logging
 import sys
-from datetime import datetime, timezone
+import tempfile
+from datetime import datetime, timedelta, timezone
 from pathlib import Path
+from typing import Optional
 
 import yaml
 
-from .dedupe import dedupe
+from . import urls
+from .dates import week_bounds
+from .cache import ResponseCache
+from .classify import classify_from_config
+from .cursors import DEFAULT_CURSORS_PATH, CursorStore
+from .deadline import Deadline
+from .dedupe import dedupe, merge_near_duplicates, near_params_from_config
+from .health import HealthStore
 from .ingest import ingest_all
 from .normalize import normalize_all
-from .publish import enrich, write_daily, write_narrative, write_trends, write_watchlist, write_weekly
-from .rank import rank
+from .publish import (
+    enrich,
+    export_trends,
+    write_daily,
+    write_narrative,
+    write_trends,
+    write_watchlist,
+    write_weekly,
+)
+from .rank import score_all
+from .ratelimit import GitHubScheduler
+from .replay import Recorder, Replayer
+from .seen import SeenIndex
+from .store import DEFAULT_STORE_PATH, ItemStore
+from .trends import DEFAULT_TRENDS_DIR
 
 logging.basicConfig(
     level=logging.INFO,
@@ -33,6 +78,7 @@ logging.basicConfig(
 logger = logging.getLogger(__name__)
 
 DEFAULT_TOPICS_PATH = Path("topics/topics.yaml")
+DEFAULT_DEADLINE_RESERVE_SECONDS = 30.0  # kept back from ingest for ranking and publishing
 
 
 def load_config(path: Path = DEFAULT_TOPICS_PATH) -> dict:
@@ -61,46 +107,249 @@ def _sample_items(config: dict, date: str) -> list:
     return items
 
 
-def run(config: dict, date: str, week: str, dry_run: bool = False) -> dict:
-    """Execute the full pipeline and return a summary dict."""
+def run(
+    config: dict,
+    date: str,
+    week: str,
+    dry_run: bool = False,
+    use_cache: bool = True,
+    full_resync: bool = False,
+    record: Optional[Path] = None,
+    replay: Optional[Path] = None,
+    deadline: Optional[float] = None,
+    output_dir: Optional[Path] = None,
+) -> dict:
+    """Execute the full pipeline and return a summary dict.
+
+    Live runs are incremental: each source is read back only to the cursor
+    saved by the previous run.  *full_resync* ignores the cursors (and the
+    validator cache) and backfills every source; the cursors are still
+    advanced afterwards.  Cursors and cache are saved only once the reports
+    have been written, so a failed run is simply retried on the next day.
+    Per-source health (latency, failures, open circuit breakers) is kept
+    the same way, and sources skipped by the breaker or the GitHub budget
+    are listed under ``skipped_sources``.  So is the seen-item index, which
+    records when each item was first ingested: trends count an item only on
+    that day, and ``items_new`` reports how many were first seen this run.
+    The trends are therefore always written, even past the deadline.
+    Every ranked item is also upserted into the SQLite item store
+    (``items_stored``), which keeps the history for later queries.
+
+    *record* archives every raw response to that path (the validator cache
+    is bypassed so the archive holds full bodies).  *replay* serves the
+    ingest from such an archive instead of the network, without reading or
+    saving any state (cursors, cache, health, seen index, item store) and,
+    unless *output_dir* says otherwise, with the reports and trends written
+    to a fresh scratch directory rather than over the real history.
+
+    *output_dir* is the directory ``reports/`` and ``data/`` are written
+    under (default: the working directory).
+
+    *deadline* is a wall-clock budget in seconds.  Ingest stops early enough
+    to leave ``ingest.deadline_reserve_seconds`` for the rest of the run and
+    publishes whatever arrived; the daily and narrative reports are always
+    written, as are the trends, while the watchlist is skipped once the
+    budget is spent.  The weekly report is left to :func:`run_weekly`.  Reports from such a run carry a partial banner and
+    the summary lists the sources and stages under ``cut_short``.
+    """
+    budget = Deadline(deadline)
+    if output_dir is None and replay is not None:
+        output_dir = Path(tempfile.mkdtemp(prefix="replay-"))
+        logger.info("Replay: writing reports and trends under %s", output_dir)
+    root = Path(output_dir) if output_dir is not None else Path(".")
+    ingest_cfg = config.get("ingest", {}) or {}
+    reserve = float(ingest_cfg.get("deadline_reserve_seconds", DEFAULT_DEADLINE_RESERVE_SECONDS))
+    cache = cursors = transport = health = seen = store = None
+    ingest_stats: dict = {}
     if dry_run:
         logger.info("Dry-run mode: using sample data")
         raw = _sample_items(config, date)
     else:
-        raw = ingest_all(config)
+        if replay is not None:
+            logger.info("Replaying ingest from %s", replay)
+            transport = Replayer(replay)
+        else:
+            if record is not None:
+                transport = Recorder(record)
+            if use_cache and not full_resync and transport is None:
+                cache = ResponseCache.from_config(ingest_cfg.get("cache"))
+            cursors = CursorStore(Path(ingest_cfg.get("cursors_path", DEFAULT_CURSORS_PATH)))
+            health = HealthStore.from_config(ingest_cfg.get("health"))
+            seen_cfg = config.get("seen") or {}
+            if seen_cfg.get("enabled", True):
+                seen = SeenIndex.from_config(seen_cfg)
+            store_cfg = config.get("store") or {}
+            if store_cfg.get("enabled", True):
+                store = ItemStore.from_config(store_cfg)
+            if full_resync:
+                logger.info("Full resync: ignoring saved cursors")
+                cursors.clear()
+        raw = ingest_all(
+            config,
+            stats=ingest_stats,
+            cache=cache,
+            cursors=cursors,
+            scheduler=GitHubScheduler.from_config(ingest_cfg.get("github")),
+            transport=transport,
+            health=health,
+            deadline=budget.reserve(reserve),
+        )
+        if isinstance(transport, Recorder):
+            transport.save()
+        elif transport is not None:
+            ingest_stats["replay"] = transport.stats()
+        logger.info(
+            "Ingest took %.2fs (%.2fs sequential, %.2fs saved)",
+            ingest_stats["wall_seconds"],
+            ingest_stats["sequential_seconds"],
+            ingest_stats["saved_seconds"],
+        )
 
     logger.info("Ingested %d raw items", len(raw))
 
-    normalized = normalize_all(raw)
+    urls.configure(config.get("urls"))
+    normalized = classify_from_config(normalize_all(raw), config)
     deduped = dedupe(normalized)
     logger.info("After dedupe: %d items", len(deduped))
 
-    ranked = rank(deduped, config)
-    enriched = enrich(ranked, config.get("topics", []))
-
     ranking_cfg = config.get("ranking", {})
     top_n_daily = int(ranking_cfg.get("top_n_daily", 20))
-    top_n_weekly = int(ranking_cfg.get("top_n_weekly", 50))
     watchlist_threshold = float(ranking_cfg.get("watchlist_threshold", 0.70))
 
-    daily_path = write_daily(enriched[:top_n_daily], date)
-    weekly_path = write_weekly(enriched[:top_n_weekly], week)
-    trends_path = write_trends(enriched)
-    watchlist_path = write_watchlist(enriched, threshold=watchlist_threshold)
-    narrative_path = write_narrative(enriched[:top_n_daily], date)
+    # Only the published items are ordered and enriched; trends counts topics
+    # over every item and needs neither.
+    ranking = score_all(deduped, config)
+    near_params = near_params_from_config(config)
+    if near_params is not None:
+        ranking = ranking.subset(merge_near_duplicates(deduped, ranking.scores, **near_params))
+        logger.info("After near-duplicate merge: %d items", len(ranking))
+    new_count = None
+    if seen is not None:
+        # Marks each item's first sighting; trends count an item only on that day.
+        new_count = sum(seen.observe(ranking.items))
+        logger.info("New since earlier runs: %d of %d items (%d IDs indexed)", new_count, len(ranking), len(seen))
+    top = ranking.top(top_n_daily)
+    watch = ranking.at_least(watchlist_threshold)
+    topics_cfg = config.get("topics", [])
+    enrichment_rules = (config.get("enrichment") or {}).get("rules")
+    enrich(top, topics_cfg, enrichment_rules)
+    enrich(watch, topics_cfg, enrichment_rules)  # items already in ``top`` are skipped
+    enriched_count = len({id(item) for item in top} | {id(item) for item in watch})
+
+    cut_sources = ingest_stats.get("cut_short", [])
+    partial = ""
+    if cut_sources:
+        partial = (
+            f"the run deadline was reached before {len(cut_sources)} source(s) finished: "
+            + ", ".join(cut_sources)
+        )
+        logger.warning("Publishing partial results: %s", partial)
+
+    trends_cfg = config.get("trends") or {}
+    trends_dir = trends_cfg.get("dir")
+    writers = [
+        ("daily", True, lambda: write_daily(
+            top, date, out_dir=str(root / "reports/daily"), partial=partial
+        )),
+        ("narrative", True, lambda: write_narrative(
+            top, date, out_dir=str(root / "reports/narrative"), partial=partial
+        )),
+        ("watchlist", False, lambda: write_watchlist(
+            watch, watchlist_threshold, watchlist_path=str(root / "reports/watchlist.md"), partial=partial
+        )),
+        # Essential: the seen index and cursors saved below assume these items were counted.
+        ("trends", True, lambda: write_trends(
+            ranking.items,
+            trends_path=str(root / "data/trends.json"),
+            store_dir=str(root / trends_dir) if trends_dir else None,
+            export=trends_cfg.get("export_json", False),
+        )),
+    ]
+    outputs: dict = {}
+    cut_stages = []
+    for name, essential, write in writers:
+        if not essential and budget.expired():
+            logger.warning("Deadline reached; skipping %s output", name)
+            cut_stages.append(name)
+            outputs[name] = None
+            continue
+        outputs[name] = str(write())
+
+    if cursors is not None:
+        cursors.save()
+    if cache is not None:
+        cache.save()
+    if health is not None:
+        health.save()
+    if seen is not None:
+        seen.save()
+    stored_count = None
+    if store is not None:
+        with store:
+            stored_count = store.upsert(ranking.items)
+        logger.info("Stored %d items in %s", stored_count, store.path)
 
     return {
         "date": date,
         "week": week,
         "items_ingested": len(raw),
         "items_after_dedupe": len(deduped),
-        "outputs": {
-            "daily": str(daily_path),
-            "weekly": str(weekly_path),
-            "trends": str(trends_path),
-            "watchlist": str(watchlist_path),
-            "narrative": str(narrative_path),
+        "near_duplicates_merged": len(deduped) - len(ranking),
+        "items_new": new_count,
+        "items_stored": stored_count,
+        "items_enriched": enriched_count,
+        "skipped_sources": {
+            "circuit_open": (ingest_stats.get("health") or {}).get("skipped_sources", []),
+            "rate_limited": (ingest_stats.get("github") or {}).get("skipped_sources", []),
         },
+        "partial": bool(cut_sources or cut_stages),
+        "cut_short": {"sources": cut_sources, "stages": cut_stages},
+        "ingest": ingest_stats,
+        "outputs": outputs,
+    }
+
+
+def run_weekly(config: dict, week: str, now: Optional[datetime] = None) -> dict:
+    """Build the weekly report for *week* from the item store; return a summary dict.
+
+    Every stored item published in the week is reranked as of the end of
+    the week (or *now*, if earlier), so rebuilding a finished week gives the
+    same report.  Near-duplicates from different days are merged as in
+    :func:`run`.  Nothing is fetched and the store is opened read-only.
+
+    The daily runs only append to the trends store; ``data/trends.json``,
+    which means reading its whole history, is re-exported here once a week.
+    """
+    start, end = week_bounds(week)
+    now = min(end, now or datetime.now(tz=timezone.utc))
+    store_cfg = config.get("store") or {}
+    path = Path(store_cfg.get("path", DEFAULT_STORE_PATH))
+    items: list = []
+    if path.exists():
+        with ItemStore(path, readonly=True) as store:
+            items = store.query(since=start, until=end, limit=None)
+    else:
+        logger.warning("No item store at %s; the weekly report will be empty", path)
+    logger.info("Loaded %d stored items for week %s", len(items), week)
+
+    ranking_cfg = config.get("ranking", {})
+    top_n_weekly = int(ranking_cfg.get("top_n_weekly", 50))
+    ranking = score_all(items, config, now=now)
+    near_params = near_params_from_config(config)
+    if near_params is not None:
+        ranking = ranking.subset(merge_near_duplicates(ranking.items, ranking.scores, **near_params))
+    top = ranking.top(top_n_weekly)
+    enrich(top, config.get("topics", []), (config.get("enrichment") or {}).get("rules"))
+
+    outputs = {"weekly": str(write_weekly(top, week)), "trends": None}
+    trends_dir = Path((config.get("trends") or {}).get("dir", DEFAULT_TRENDS_DIR))
+    if trends_dir.is_dir():
+        outputs["trends"] = str(export_trends(store=str(trends_dir)))
+    return {
+        "week": week,
+        "items_in_week": len(items),
+        "near_duplicates_merged": len(items) - len(ranking),
+        "outputs": outputs,
     }
 
 
@@ -114,15 +363,48 @@ def main() -> None:
     parser.add_argument(
         "--dry-run", action="store_true", help="Use sample data; no network calls"
     )
+    parser.add_argument(
+        "--no-cache", action="store_true", help="Ignore the HTTP validator cache; refetch everything"
+    )
+    parser.add_argument(
+        "--full-resync", action="store_true", help="Ignore saved source cursors and backfill every source"
+    )
+    mode = parser.add_mutually_exclusive_group()
+    mode.add_argument("--record", default=None, help="Archive raw ingest responses to this zip file")
+    mode.add_argument("--replay", default=None, help="Serve ingest responses from a recorded zip archive")
+    mode.add_argument(
+        "--weekly", action="store_true", help="Build the weekly report from the item store; no ingest"
+    )
+    parser.add_argument(
+        "--deadline", type=float, default=None, help="Wall-clock budget for the run in seconds"
+    )
+    parser.add_argument(
+        "--output-dir", default=None, help="Write reports/ and data/ under this directory (replay: a scratch dir)"
+    )
     args = parser.parse_args()
 
     config = load_config(Path(args.config))
 
     now = datetime.now(tz=timezone.utc)
     date = args.date or now.strftime("%Y-%m-%d")
+    if args.weekly:
+        week = args.week or (now - timedelta(days=7)).strftime("%Y-%W")
+        print(json.dumps(run_weekly(config, week, now=now), indent=2))
+        return
     week = args.week or now.strftime("%Y-%W")
 
-    result = run(config, date=date, week=week, dry_run=args.dry_run)
+    result = run(
+        config,
+        date=date,
+        week=week,
+        dry_run=args.dry_run,
+        use_cache=not args.no_cache,
+        full_resync=args.full_resync,
+        record=Path(args.record) if args.record else None,
+        replay=Path(args.replay) if args.replay else None,
+        deadline=args.deadline,
+        output_dir=Path(args.output_dir) if args.output_dir else None,
+    )
     print(json.dumps(result, indent=2))
 
 
@@ -0,0 +1,153 @@
+"""Bounded-memory set membership for streaming stages.
+
+:class:`BloomFilter` answers "definitely not seen" or "maybe seen" from a
+fixed bit array sized for an expected number of keys and a false-positive
+rate.  :class:`SpillSet` puts one in front of an exact set kept in a SQLite
+file, so only the filter's "maybe" answers touch the disk and the answers
+are exact (keys are stored as 128-bit prefixes of BLAKE2b digests).
+"""
+
+import hashlib
+import math
+import os
+import sqlite3
+import struct
+import tempfile
+from pathlib import Path
+from typing import Optional, Set
+
+DEFAULT_CAPACITY = 1_000_000
+DEFAULT_FP_RATE = 0.01
+MAX_HASHES = 16
+_FLUSH_EVERY = 4096
+_SQLITE_CACHE_KB = 2048
+_WORDS = struct.Struct(f"<{MAX_HASHES}I")
+
+
+def digest(key: str) -> bytes:
+    """64-byte BLAKE2b digest of *key*: Bloom positions come from its 32-bit words."""
+    return hashlib.blake2b(key.encode()).digest()
+
+
+class BloomFilter:
+    """Fixed-size Bloom filter over :func:`digest` values.
+
+    Each of the ``hashes`` bit positions is one 32-bit word of the digest
+    modulo the filter size, so a lookup hashes the key once and stops at
+    the first clear bit.  At most 16 positions are used, which caps the
+    false-positive rate near 1.5e-5; the size is capped at 2**32 bits.
+    """
+
+    def __init__(self, capacity: int = DEFAULT_CAPACITY, fp_rate: float = DEFAULT_FP_RATE):
+        if capacity <= 0 or not 0 < fp_rate < 1:
+            raise ValueError("capacity must be positive and fp_rate in (0, 1)")
+        self.capacity = capacity
+        self.fp_rate = fp_rate
+        self.bits = min(1 << 32, max(8, math.ceil(-capacity * math.log(fp_rate) / math.log(2) ** 2)))
+        self.hashes = min(MAX_HASHES, max(1, round(self.bits / capacity * math.log(2))))
+        self.count = 0
+        self._array = bytearray((self.bits + 7) // 8)
+
+    @property
+    def nbytes(self) -> int:
+        return len(self._array)
+
+    def add_digest(self, key_digest: bytes) -> None:
+        array, bits = self._array, self.bits
+        for word in _WORDS.unpack(key_digest)[:self.hashes]:
+            pos = word % bits
+            array[pos >> 3] |= 1 << (pos & 7)
+        self.count += 1
+
+    def may_contain_digest(self, key_digest: bytes) -> bool:
+        array, bits = self._array, self.bits
+        for word in _WORDS.unpack(key_digest)[:self.hashes]:
+            pos = word % bits
+            if not array[pos >> 3] >> (pos & 7) & 1:
+                return False
+        return True
+
+    def add(self, key: str) -> None:
+        self.add_digest(digest(key))
+
+    def __contains__(self, key: str) -> bool:
+        return self.may_contain_digest(digest(key))
+
+
+class SpillSet:
+    """Exact string set: a :class:`BloomFilter` in memory, the keys in SQLite.
+
+    Memory stays at the filter's ``nbytes`` plus SQLite's page cache (2 MB)
+    and at most 4096 unflushed digests, whatever the number of keys.  Past
+    *capacity* keys the filter's false-positive rate rises, which costs
+    extra disk lookups but never wrong answers.  *path* is scratch storage
+    (any keys already in it are cleared); without it the keys go to a
+    temporary file removed by :meth:`close`.
+    """
+
+    def __init__(
+        self,
+        capacity: int = DEFAULT_CAPACITY,
+        fp_rate: float = DEFAULT_FP_RATE,
+        path: Optional[Path] = None,
+    ):
+        self.bloom = BloomFilter(capacity, fp_rate)
+        self.disk_lookups = 0
+        self._owned: Optional[str] = None
+        if path is None:
+            fd, self._owned = tempfile.mkstemp(prefix="spill-", suffix=".sqlite")
+            os.close(fd)
+            path = Path(self._owned)
+        self._db = sqlite3.connect(str(path))
+        self._db.execute("PRAGMA journal_mode=OFF")
+        self._db.execute("PRAGMA synchronous=OFF")
+        self._db.execute(f"PRAGMA cache_size=-{_SQLITE_CACHE_KB}")
+        self._db.execute("CREATE TABLE IF NOT EXISTS keys (k BLOB PRIMARY KEY) WITHOUT ROWID")
+        self._db.execute("DELETE FROM keys")
+        self._pending: Set[bytes] = set()
+
+    def __len__(self) -> int:
+        return self.bloom.count
+
+    def __contains__(self, key: str) -> bool:
+        return self.contains_digest(digest(key))
+
+    def add(self, key: str) -> None:
+        self.add_digest(digest(key))
+
+    def contains_digest(self, key_digest: bytes) -> bool:
+        if not self.bloom.may_contain_digest(key_digest):
+            return False
+        exact = key_digest[:16]
+        if exact in self._pending:
+            return True
+        self.disk_lookups += 1
+        return self._db.execute("SELECT 1 FROM keys WHERE k = ?", (exact,)).fetchone() is not None
+
+    def add_digest(self, key_digest: bytes) -> None:
+        """Add a key by digest; callers check membership first, so it is new."""
+        self.bloom.add_digest(key_digest)
+        self._pending.add(key_digest[:16])
+        if len(self._pending) >= _FLUSH_EVERY:
+            self._flush()
+
+    def _flush(self) -> None:
+        # Sorted batches insert into neighbouring B-tree pages.
+        self._db.executemany("INSERT OR IGNORE INTO keys VALUES (?)", ((d,) for d in sorted(self._pending)))
+        self._db.commit()
+        self._pending.clear()
+
+    def close(self) -> None:
+        self._db.close()
+        if self._owned is not None:
+            try:
+                os.remove(self._owned)
+            except OSError:
+                pass
+            self._owned = None
+
+    def __enter__(self) -> "SpillSet":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
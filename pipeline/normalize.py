@@ -1,56 +1,44 @@
 """Normalize raw ingested items to a common schema."""
 
-import hashlib
-import re
 from datetime import datetime, timezone
 from typing import Dict, List
 
-SCHEMA_VERSION = "1"
+from . import urls
+from .dates import parse_timestamp
+from .item import SCHEMA_VERSION, Item  # noqa: F401  (SCHEMA_VERSION re-exported)
 
-# Tracking / referral query params to strip for canonical URLs
-_TRACKING_RE = re.compile(
-    r"[?&]("
-    r"utm_source|utm_medium|utm_campaign|utm_content|utm_term"
-    r"|ref|s|src|from"
-    r")=[^&]*",
-    re.IGNORECASE,
-)
+# Kept here for existing importers; see pipeline.urls.
+item_id = urls.item_id
 
 
 def canonical_url(url: str) -> str:
-    """Strip common tracking query parameters from a URL."""
-    cleaned = _TRACKING_RE.sub("", url)
-    return cleaned.rstrip("?&")
+    """Canonical form of a URL: tracking parameters, fragments and other noise removed."""
+    return urls.canonical_url(url)
 
 
-def item_id(url: str) -> str:
-    """Derive a short stable ID from a canonical URL."""
-    return hashlib.sha256(url.encode()).hexdigest()[:16]
-
-
-def normalize(raw: Dict) -> Dict:
+def normalize(raw: Dict) -> Item:
     """Map a raw ingested item to the standard pipeline schema."""
-    url = canonical_url(raw.get("url", ""))
+    url, uid = urls.canonical_with_id(raw.get("url", ""))
     published_at = raw.get("published_at", "")
+    # ``published_ts`` is None for a missing or unparseable date, so ranking
+    # treats it as unknown rather than brand new.
+    published_ts = parse_timestamp(published_at)
     if not published_at:
         published_at = datetime.now(tz=timezone.utc).isoformat()
 
-    return {
-        "id": item_id(url),
-        "title": raw.get("title", "").strip(),
-        "url": url,
-        "published_at": published_at,
-        "source": raw.get("source", ""),
-        "source_type": raw.get("source_type", ""),
-        "topics": list(raw.get("topics", [])),
-        "snippet": raw.get("snippet", "").strip(),
-        "score": 0.0,
-        "why_it_matters": "",
-        "action": "",
-        "_schema_version": SCHEMA_VERSION,
-    }
-
-
-def normalize_all(raw_items: List[Dict]) -> List[Dict]:
+    return Item(
+        id=uid,
+        title=raw.get("title", "").strip(),
+        url=url,
+        published_at=published_at,
+        published_ts=published_ts,
+        source=raw.get("source", ""),
+        source_type=raw.get("source_type", ""),
+        topics=list(raw.get("topics", [])),
+        snippet=raw.get("snippet", "").strip(),
+    )
+
+
+def normalize_all(raw_items: List[Dict]) -> List[Item]:
     """Normalize a list of raw items."""
     return [normalize(item) for item in raw_items]
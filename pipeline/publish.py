@@ -1,9 +1,14 @@
 """Publish ranked, enriched items to markdown reports and data files."""
 
 import json
+import os
 from datetime import datetime, timezone
 from pathlib import Path
-from typing import Dict, List
+from typing import Dict, List, Optional, Union
+
+from .enrichment import compile_rules
+from .item import ItemLike
+from .trends import TrendsStore
 
 # Emoji labels by source type for narrative output
 _SOURCE_EMOJI = {
@@ -13,51 +18,20 @@ _SOURCE_EMOJI = {
 _DEFAULT_EMOJI = "📌"
 
 
-# ---------------------------------------------------------------------------
-# Enrichment helpers
-# ---------------------------------------------------------------------------
+def enrich(items: List[ItemLike], topics_config: List[Dict], rules: Optional[List[Dict]] = None) -> List[ItemLike]:
+    """Fill `why_it_matters` and `action` fields from topic templates and enrichment *rules*.
 
-def _why_it_matters(item: Dict, topics_config: List[Dict]) -> str:
-    topic_map = {t["id"]: t for t in topics_config}
-    for tid in item.get("topics", []):
-        tpl = topic_map.get(tid, {}).get("why_matters_template", "")
-        if tpl:
-            return tpl
-    src_type = item.get("source_type", "")
-    if "release" in src_type:
-        return "New release detected — review for breaking changes or new capabilities."
-    if "rss" in src_type:
-        return "Official announcement — may signal an upcoming feature or deprecation."
-    return "Monitor for downstream impact on your AI stack."
-
-
-def _action(item: Dict, topics_config: List[Dict]) -> str:
-    topic_map = {t["id"]: t for t in topics_config}
-    for tid in item.get("topics", []):
-        tpl = topic_map.get(tid, {}).get("action_template", "")
-        if tpl:
-            return tpl
-    src_type = item.get("source_type", "")
-    if "release" in src_type:
-        return "Review the release notes and update your integration if needed."
-    return "Evaluate for impact; add to watchlist if actionable."
-
-
-def enrich(items: List[Dict], topics_config: List[Dict]) -> List[Dict]:
-    """Fill `why_it_matters` and `action` fields based on topic templates."""
-    for item in items:
-        if not item.get("why_it_matters"):
-            item["why_it_matters"] = _why_it_matters(item, topics_config)
-        if not item.get("action"):
-            item["action"] = _action(item, topics_config)
-    return items
+    See :mod:`pipeline.enrichment`; the rule tables are compiled once per
+    configuration and existing values are never overwritten.
+    """
+    return compile_rules(topics_config, rules).apply(items)
 
 
 # ---------------------------------------------------------------------------
 # Markdown formatting helpers
 # ---------------------------------------------------------------------------
 
-def _fmt_item_md(item: Dict, idx: int) -> str:
+def _fmt_item_md(item: ItemLike, idx: int) -> str:
     topics_str = ", ".join(item.get("topics", [])) or "—"
     snippet = (item.get("snippet") or "").strip()
     snippet_line = f"> {snippet[:200]}\n\n" if snippet else ""
@@ -75,12 +49,17 @@ def _fmt_item_md(item: Dict, idx: int) -> str:
     )
 
 
+def _partial_banner(partial: str) -> List[str]:
+    """Header lines flagging a report built from an incomplete run."""
+    return [f"> ⚠️ **Partial report:** {partial}\n"] if partial else []
+
+
 # ---------------------------------------------------------------------------
 # Writers
 # ---------------------------------------------------------------------------
 
-def write_daily(items: List[Dict], date: str, out_dir: str = "reports/daily") -> Path:
-    """Write the daily markdown report."""
+def write_daily(items: List[ItemLike], date: str, out_dir: str = "reports/daily", partial: str = "") -> Path:
+    """Write the daily markdown report; a non-empty *partial* reason flags it as incomplete."""
     Path(out_dir).mkdir(parents=True, exist_ok=True)
     path = Path(out_dir) / f"{date}.md"
 
@@ -91,6 +70,7 @@ def write_daily(items: List[Dict], date: str, out_dir: str = "reports/daily") ->
         f"# Daily AI Intelligence Report — {date}\n",
         f"_Generated: {datetime.now(tz=timezone.utc).strftime('%Y-%m-%dT%H:%M:%SZ')}"
         f" | Items: {len(items)}_\n",
+        *_partial_banner(partial),
         "## Summary\n",
         f"Tracking **{len(unique_topics)} topics** across **{len(unique_sources)} sources**.\n",
         "## Top Items\n",
@@ -102,12 +82,12 @@ def write_daily(items: List[Dict], date: str, out_dir: str = "reports/daily") ->
     return path
 
 
-def write_weekly(items: List[Dict], week: str, out_dir: str = "reports/weekly") -> Path:
+def write_weekly(items: List[ItemLike], week: str, out_dir: str = "reports/weekly", partial: str = "") -> Path:
     """Write the weekly markdown report grouped by topic."""
     Path(out_dir).mkdir(parents=True, exist_ok=True)
     path = Path(out_dir) / f"{week}.md"
 
-    topic_groups: Dict[str, List[Dict]] = {}
+    topic_groups: Dict[str, List[ItemLike]] = {}
     for item in items:
         for t in item.get("topics", []):
             topic_groups.setdefault(t, []).append(item)
@@ -116,6 +96,7 @@ def write_weekly(items: List[Dict], week: str, out_dir: str = "reports/weekly")
         f"# Weekly AI Intelligence Report — Week {week}\n",
         f"_Generated: {datetime.now(tz=timezone.utc).strftime('%Y-%m-%dT%H:%M:%SZ')}"
         f" | Items: {len(items)}_\n",
+        *_partial_banner(partial),
         "## This Week by Topic\n",
     ]
     for topic_id, topic_items in sorted(topic_groups.items()):
@@ -129,45 +110,68 @@ def write_weekly(items: List[Dict], week: str, out_dir: str = "reports/weekly")
     return path
 
 
-def write_trends(items: List[Dict], trends_path: str = "data/trends.json") -> Path:
-    """Update the rolling trends JSON with today's topic counts."""
+def write_trends(
+    items: List[ItemLike],
+    trends_path: str = "data/trends.json",
+    store_dir: Optional[str] = None,
+    export: bool = True,
+) -> Path:
+    """Record today's topic counts in the trends store and export ``trends.json``.
+
+    Items carrying a ``first_seen`` date (set by :mod:`pipeline.seen`) are
+    counted only on that day, so items re-ingested on later runs do not
+    inflate the counts.  The counts go to a :class:`~pipeline.trends.TrendsStore`
+    in *store_dir* (default: ``trends/`` beside *trends_path*), whose history
+    is seeded from an existing *trends_path* the first time.  With *export*
+    false the JSON file is left alone and the store directory is returned.
+    """
     out_path = Path(trends_path)
     out_path.parent.mkdir(parents=True, exist_ok=True)
+    store = TrendsStore(Path(store_dir) if store_dir else out_path.parent / "trends")
 
-    existing: Dict = {}
-    if out_path.exists():
+    if not len(store) and out_path.exists():
         try:
-            existing = json.loads(out_path.read_text(encoding="utf-8"))
+            store.import_json(json.loads(out_path.read_text(encoding="utf-8")))
         except json.JSONDecodeError:
-            existing = {}
+            pass
 
     today = datetime.now(tz=timezone.utc).strftime("%Y-%m-%d")
     today_counts: Dict[str, int] = {}
     for item in items:
+        first_seen = item.get("first_seen")
+        if first_seen and first_seen[:10] != today:
+            continue
         for t in item.get("topics", []):
             today_counts[t] = today_counts.get(t, 0) + 1
+    store.record(today, today_counts)
+
+    if not export:
+        return store.path
+    return export_trends(trends_path, store)
+
+
+def export_trends(trends_path: str = "data/trends.json", store: Union[TrendsStore, str, None] = None) -> Path:
+    """Write the whole trends history to ``trends.json``; return its path.
 
-    topics_data: Dict = existing.get("topics", {})
-    for topic_id, count in today_counts.items():
-        if topic_id not in topics_data:
-            topics_data[topic_id] = {"total_items": 0, "daily": {}}
-        topics_data[topic_id].setdefault("daily", {})[today] = count
-        # Recalculate total from the daily history so re-runs are idempotent
-        topics_data[topic_id]["total_items"] = sum(topics_data[topic_id]["daily"].values())
-
-    trends = {
-        "last_updated": today,
-        "schema_version": "1",
-        "topics": topics_data,
-    }
-    out_path.write_text(json.dumps(trends, indent=2, sort_keys=True), encoding="utf-8")
+    This reads every segment of the store, so it runs on demand (the weekly
+    build) rather than on every daily run.  *store* defaults to ``trends/``
+    beside *trends_path*.
+    """
+    out_path = Path(trends_path)
+    out_path.parent.mkdir(parents=True, exist_ok=True)
+    if not isinstance(store, TrendsStore):
+        store = TrendsStore(Path(store) if store else out_path.parent / "trends")
+    tmp = out_path.with_suffix(out_path.suffix + ".tmp")
+    tmp.write_text(json.dumps(store.export(), indent=2, sort_keys=True), encoding="utf-8")
+    os.replace(tmp, out_path)
     return out_path
 
 
 def write_watchlist(
-    items: List[Dict],
+    items: List[ItemLike],
     threshold: float = 0.70,
     watchlist_path: str = "reports/watchlist.md",
+    partial: str = "",
 ) -> Path:
     """Write the high-signal watchlist markdown report."""
     Path(watchlist_path).parent.mkdir(parents=True, exist_ok=True)
@@ -179,6 +183,7 @@ def write_watchlist(
         "# AI Intelligence Watchlist\n",
         f"_Updated: {datetime.now(tz=timezone.utc).strftime('%Y-%m-%dT%H:%M:%SZ')}"
         f" | High-signal items (score ≥ {threshold})_\n",
+        *_partial_banner(partial),
         "Items that warrant immediate attention based on recency, source quality, and topic relevance.\n",
         "| Title | Source | Topics | Score | Date |",
         "|-------|--------|--------|-------|------|",
@@ -209,7 +214,7 @@ def write_watchlist(
 # Narrative report
 # ---------------------------------------------------------------------------
 
-def _fmt_item_narrative(item: Dict, idx: int, collapse: bool = True) -> str:
+def _fmt_item_narrative(item: ItemLike, idx: int, collapse: bool = True) -> str:
     """Format a single item as a narrative block, optionally collapsible."""
     emoji = _SOURCE_EMOJI.get(item.get("source_type", ""), _DEFAULT_EMOJI)
     title = item["title"]
@@ -242,9 +247,10 @@ def _fmt_item_narrative(item: Dict, idx: int, collapse: bool = True) -> str:
 
 
 def write_narrative(
-    items: List[Dict],
+    items: List[ItemLike],
     date: str,
     out_dir: str = "reports/narrative",
+    partial: str = "",
 ) -> Path:
     """Write a human-readable narrative report optimised for mobile viewing.
 
@@ -260,6 +266,7 @@ def write_narrative(
     lines: List[str] = [
         f"# AI Updates — {date}\n",
         f"_Generated: {generated} | {len(items)} item(s)_\n",
+        *_partial_banner(partial),
         (
             "Tap any item below to expand. "
             "Top story is shown in full; the rest are collapsible.\n"
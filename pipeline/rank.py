@@ -1,9 +1,35 @@
-"""Rank normalized items by recency, source quality, and topic relevance."""
+"""Rank normalized items by recency, source quality, and topic relevance.
 
+Large batches are scored column-wise with NumPy when it is installed
+(:class:`ItemBatch`); otherwise, and for small batches, every item goes
+through :func:`score_item`.  Both paths produce the same scores.
+
+Topic relevance is the share of configured topics an item is tagged with,
+or with ``ranking.relevance: bm25`` its BM25 match against the topics'
+keywords (:mod:`pipeline.relevance`).
+
+:func:`rank` returns every item in score order.  Callers that only publish
+the best few use :func:`score_all`, whose :class:`Ranking` selects the top
+K or the items above a threshold without sorting the rest.
+"""
+
+import heapq
 import math
 from datetime import datetime, timezone
 from typing import Dict, List, Optional
 
+try:
+    import numpy as np
+except ImportError:  # optional: scoring falls back to the per-item loop
+    np = None
+
+from .dates import parse_timestamp
+from .item import Item, ItemLike
+from .relevance import relevance_from_config
+
+# Below this many items the per-item loop is as fast as building arrays.
+BATCH_MIN_ITEMS = 512
+
 DEFAULT_SOURCE_QUALITY: Dict[str, float] = {
     "github_release": 0.90,
     "github_issue": 0.60,
@@ -30,16 +56,20 @@ def recency_score(
     Returns 1.0 for a brand-new item, approaching 0 for very old items.
     Exactly one half-life old → 0.5.
     """
+    return recency_score_ts(parse_timestamp(published_at), half_life_days=half_life_days, now=now)
+
+
+def recency_score_ts(
+    published_ts: Optional[float],
+    half_life_days: float = 3.0,
+    now: Optional[datetime] = None,
+) -> float:
+    """:func:`recency_score` for an epoch timestamp; 0.5 when it is unknown."""
+    if published_ts is None:
+        return 0.5
     if now is None:
         now = datetime.now(tz=timezone.utc)
-    try:
-        dt = datetime.fromisoformat(published_at.replace("Z", "+00:00"))
-        if dt.tzinfo is None:
-            dt = dt.replace(tzinfo=timezone.utc)
-    except (ValueError, AttributeError):
-        return 0.5
-
-    age_days = max((now - dt).total_seconds() / 86400, 0)
+    age_days = max((now.timestamp() - published_ts) / 86400, 0)
     return math.exp(-age_days * math.log(2) / half_life_days)
 
 
@@ -65,35 +95,200 @@ def topic_relevance_score(topics: List[str], all_topics: List[str]) -> float:
 
 
 def score_item(
-    item: Dict,
+    item: ItemLike,
     all_topics: List[str],
     weights: Optional[Dict[str, float]] = None,
     quality_map: Optional[Dict[str, float]] = None,
     half_life_days: float = 3.0,
     now: Optional[datetime] = None,
+    relevance: Optional[float] = None,
 ) -> float:
-    """Compute a composite score for a single item."""
+    """Compute a composite score for a single item.
+
+    Uses the item's precomputed ``published_ts`` when present (as set by
+    normalize) and only parses ``published_at`` for items without one.
+    A given *relevance* (e.g. from :mod:`pipeline.relevance`) replaces
+    :func:`topic_relevance_score`.
+    """
     w = weights if weights is not None else DEFAULT_WEIGHTS
-    r = recency_score(item.get("published_at", ""), half_life_days=half_life_days, now=now)
-    q = source_quality_score(item.get("source_type", ""), quality_map)
-    t = topic_relevance_score(item.get("topics", []), all_topics)
+    if isinstance(item, Item):
+        published_ts, source_type, topics = item.published_ts, item.source_type, item.topics
+    else:
+        if "published_ts" in item:
+            published_ts = item["published_ts"]
+        else:
+            published_ts = parse_timestamp(item.get("published_at", ""))
+        source_type, topics = item.get("source_type", ""), item.get("topics", [])
+    r = recency_score_ts(published_ts, half_life_days=half_life_days, now=now)
+    q = source_quality_score(source_type, quality_map)
+    t = topic_relevance_score(topics, all_topics) if relevance is None else relevance
     return r * w.get("recency", 0.4) + q * w.get("source_quality", 0.4) + t * w.get("topic_relevance", 0.2)
 
 
-def rank(
-    items: List[Dict],
+class ItemBatch:
+    """Columnar view of a list of items for vectorised scoring.
+
+    Holds the published epochs (NaN when unknown), source-type codes and
+    topic counts as NumPy arrays; requires NumPy.
+    """
+
+    def __init__(self, items: List[ItemLike]):
+        n = len(items)
+        codes: Dict[str, int] = {}
+        published = np.empty(n, dtype=np.float64)
+        source_code = np.empty(n, dtype=np.int32)
+        topic_count = np.empty(n, dtype=np.int32)
+        for i, item in enumerate(items):
+            if isinstance(item, Item):
+                ts, source_type, topics = item.published_ts, item.source_type, item.topics
+            else:
+                ts = item["published_ts"] if "published_ts" in item else parse_timestamp(item.get("published_at", ""))
+                source_type, topics = item.get("source_type", ""), item.get("topics", [])
+            published[i] = np.nan if ts is None else ts
+            code = codes.get(source_type)
+            if code is None:
+                code = codes[source_type] = len(codes)
+            source_code[i] = code
+            topic_count[i] = len(topics)
+        self.items = items
+        self.published = published
+        self.source_code = source_code
+        self.source_types = list(codes)
+        self.topic_count = topic_count
+
+    def __len__(self) -> int:
+        return len(self.items)
+
+    def scores(
+        self,
+        all_topics: List[str],
+        weights: Optional[Dict[str, float]] = None,
+        quality_map: Optional[Dict[str, float]] = None,
+        half_life_days: float = 3.0,
+        now: Optional[datetime] = None,
+        relevance: Optional[List[float]] = None,
+    ) -> "np.ndarray":
+        """Scores of every item, rounded as :func:`rank` stores them."""
+        w = weights if weights is not None else DEFAULT_WEIGHTS
+        if now is None:
+            now = datetime.now(tz=timezone.utc)
+        age_days = np.maximum((now.timestamp() - self.published) / 86400, 0)
+        recency = np.exp(-age_days * (math.log(2) / half_life_days))
+        recency[np.isnan(self.published)] = 0.5
+        per_type = [source_quality_score(t, quality_map) for t in self.source_types]
+        quality = np.asarray(per_type, dtype=np.float64)[self.source_code] if per_type else np.zeros(0)
+        if relevance is not None:
+            relevance = np.asarray(relevance, dtype=np.float64)
+        elif not all_topics:
+            relevance = np.full(len(self), 0.5)
+        else:
+            relevance = np.minimum(self.topic_count / len(all_topics), 1.0)
+        total = (
+            recency * w.get("recency", 0.4)
+            + quality * w.get("source_quality", 0.4)
+            + relevance * w.get("topic_relevance", 0.2)
+        )
+        return np.round(total, 4)
+
+    @staticmethod
+    def order(scores: "np.ndarray", k: Optional[int] = None) -> "np.ndarray":
+        """Indices by descending score, ties in input order; only the best *k* if given."""
+        keys = -scores
+        if k is not None and k < len(keys):
+            if k <= 0:
+                return np.zeros(0, dtype=np.intp)
+            top = np.argpartition(keys, k - 1)[:k]
+            # argpartition does not keep ties in input order: widen to every
+            # item tied with the k-th score, then take the first k stably.
+            cutoff = keys[top].max()
+            top = np.flatnonzero(keys <= cutoff)
+            return top[np.argsort(keys[top], kind="stable")][:k]
+        return np.argsort(keys, kind="stable")
+
+
+class Ranking:
+    """Scored items with ordered views that avoid a full sort.
+
+    Orders are by descending score with ties in input order, exactly as
+    :func:`rank` sorts.
+    """
+
+    def __init__(self, items: List[ItemLike], scores):
+        self.items = items
+        self.scores = scores  # list, or a NumPy array on the batch path
+
+    def __len__(self) -> int:
+        return len(self.items)
+
+    def subset(self, indexes: List[int]) -> "Ranking":
+        """The ranking restricted to the items at *indexes* (ascending)."""
+        if np is not None and isinstance(self.scores, np.ndarray):
+            scores = self.scores[np.asarray(indexes, dtype=np.intp)]
+        else:
+            scores = [self.scores[i] for i in indexes]
+        return Ranking([self.items[i] for i in indexes], scores)
+
+    def top(self, k: Optional[int] = None) -> List[ItemLike]:
+        """The *k* best items (all of them when *k* is None), best first."""
+        n = len(self.items)
+        if k is not None and k >= n:
+            k = None
+        if np is not None and isinstance(self.scores, np.ndarray):
+            order = ItemBatch.order(self.scores, k).tolist()
+        elif k is None:
+            order = sorted(range(n), key=self.scores.__getitem__, reverse=True)
+        else:
+            scores = self.scores
+            order = heapq.nsmallest(max(k, 0), range(n), key=lambda i: (-scores[i], i))
+        return [self.items[i] for i in order]
+
+    def at_least(self, threshold: float) -> List[ItemLike]:
+        """Items scoring *threshold* or more, best first."""
+        if np is not None and isinstance(self.scores, np.ndarray):
+            idx = np.flatnonzero(self.scores >= threshold)
+            order = idx[np.argsort(-self.scores[idx], kind="stable")].tolist()
+        else:
+            scores = self.scores
+            order = sorted((i for i, s in enumerate(scores) if s >= threshold), key=lambda i: -scores[i])
+        return [self.items[i] for i in order]
+
+
+def score_all(
+    items: List[ItemLike],
     config: Dict,
     now: Optional[datetime] = None,
-) -> List[Dict]:
-    """Score every item and return them sorted by score descending."""
+) -> Ranking:
+    """Score every item in place and return a :class:`Ranking` over them."""
     ranking_cfg = config.get("ranking", {})
     weights = ranking_cfg.get("weights", DEFAULT_WEIGHTS)
     quality_map = config.get("source_quality", DEFAULT_SOURCE_QUALITY)
     half_life = float(ranking_cfg.get("recency_half_life_days", 3.0))
     all_topics = [t["id"] for t in config.get("topics", [])]
+    if now is None:
+        now = datetime.now(tz=timezone.utc)
+    backend = ranking_cfg.get("relevance", "topics")
+    if backend == "bm25":
+        relevance: Optional[List[float]] = relevance_from_config(items, config)
+    elif backend == "topics":
+        relevance = None
+    else:
+        raise ValueError(f"Unknown ranking.relevance backend {backend!r} (expected 'topics' or 'bm25')")
+
+    if np is not None and len(items) >= BATCH_MIN_ITEMS:
+        batch_scores = ItemBatch(items).scores(
+            all_topics, weights=weights, quality_map=quality_map, half_life_days=half_life, now=now,
+            relevance=relevance,
+        )
+        for item, score in zip(items, batch_scores.tolist()):
+            if isinstance(item, Item):
+                item.score = score
+            else:
+                item["score"] = score
+        return Ranking(items, batch_scores)
 
-    for item in items:
-        item["score"] = round(
+    scores: List[float] = []
+    for i, item in enumerate(items):
+        score = round(
             score_item(
                 item,
                 all_topics,
@@ -101,8 +296,19 @@ def rank(
                 quality_map=quality_map,
                 half_life_days=half_life,
                 now=now,
+                relevance=None if relevance is None else relevance[i],
             ),
             4,
         )
+        item["score"] = score
+        scores.append(score)
+    return Ranking(items, scores)
 
-    return sorted(items, key=lambda x: x["score"], reverse=True)
+
+def rank(
+    items: List[ItemLike],
+    config: Dict,
+    now: Optional[datetime] = None,
+) -> List[ItemLike]:
+    """Score every item and return them sorted by score descending."""
+    return score_all(items, config, now=now).top()
@@ -0,0 +1,245 @@
+"""Rate-limit-aware request scheduler for the GitHub REST API.
+
+GitHub reports the primary budget on every response (``X-RateLimit-Limit``,
+``-Remaining``, ``-Reset``) and signals secondary limits with a 403/429 and a
+``Retry-After`` header.  :class:`GitHubScheduler` tracks that budget across
+the whole ingest run, refuses requests it cannot afford instead of burning
+them on errors, waits out short limit windows, and retries transient
+failures with jittered exponential backoff drawn from a run-wide retry
+budget.
+"""
+
+import logging
+import random
+import threading
+import time
+from typing import Callable, Dict, List, Optional
+
+import requests
+
+from . import session
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_RETRY_BUDGET = 6
+DEFAULT_MAX_RETRIES = 3
+DEFAULT_BACKOFF_SECONDS = 1.0
+DEFAULT_MAX_WAIT_SECONDS = 60.0
+DEFAULT_RESERVE = 0
+DEFAULT_TIMEOUT = 10.0
+SECONDARY_LIMIT_WAIT = 60.0  # GitHub's advice when no Retry-After is given
+
+
+def _int_header(resp: requests.Response, name: str) -> Optional[int]:
+    try:
+        return int(resp.headers[name])
+    except (KeyError, ValueError):
+        return None
+
+
+def _is_rate_limited(resp: requests.Response) -> bool:
+    """Whether a 403/429 is a primary or secondary rate limit, not a permission error."""
+    return (
+        resp.status_code == 429
+        or _int_header(resp, "Retry-After") is not None
+        or _int_header(resp, "X-RateLimit-Remaining") == 0
+        or "rate limit" in resp.text.lower()
+    )
+
+
+class GitHubScheduler:
+    """Gate, pace and retry GitHub API requests within the rate-limit budget.
+
+    *reserve* requests are always left unspent.  Waits longer than
+    *max_wait* seconds are never taken; the request is refused instead and
+    the caller skips the source.  *sleep* and *clock* are injectable for
+    tests.
+    """
+
+    def __init__(
+        self,
+        retry_budget: int = DEFAULT_RETRY_BUDGET,
+        max_retries: int = DEFAULT_MAX_RETRIES,
+        backoff: float = DEFAULT_BACKOFF_SECONDS,
+        max_wait: float = DEFAULT_MAX_WAIT_SECONDS,
+        reserve: int = DEFAULT_RESERVE,
+        sleep: Callable[[float], None] = time.sleep,
+        clock: Callable[[], float] = time.time,
+    ):
+        self.retry_budget = retry_budget
+        self.max_retries = max_retries
+        self.backoff = backoff
+        self.max_wait = max_wait
+        self.reserve = reserve
+        self._sleep = sleep
+        self._clock = clock
+        self._lock = threading.Lock()
+
+        self.limit: Optional[int] = None
+        self.remaining: Optional[int] = None
+        self.reset_at: Optional[float] = None
+        self.remaining_at_start: Optional[int] = None
+        self.blocked_until = 0.0
+        self.requests_sent = 0
+        self.retries = 0
+        self.waited = 0.0
+        self.refused: List[str] = []
+
+    @classmethod
+    def from_config(cls, cfg: Optional[Dict]) -> "GitHubScheduler":
+        """Build a scheduler from the ``ingest.github`` section of topics.yaml."""
+        cfg = cfg or {}
+        return cls(
+            retry_budget=int(cfg.get("retry_budget", DEFAULT_RETRY_BUDGET)),
+            max_retries=int(cfg.get("max_retries", DEFAULT_MAX_RETRIES)),
+            backoff=float(cfg.get("backoff_seconds", DEFAULT_BACKOFF_SECONDS)),
+            max_wait=float(cfg.get("max_wait_seconds", DEFAULT_MAX_WAIT_SECONDS)),
+            reserve=int(cfg.get("reserve", DEFAULT_RESERVE)),
+        )
+
+    # ------------------------------------------------------------------
+    # Budget tracking
+    # ------------------------------------------------------------------
+
+    def observe(self, resp: requests.Response) -> None:
+        """Update the known budget from a response's rate-limit headers."""
+        remaining = _int_header(resp, "X-RateLimit-Remaining")
+        limit = _int_header(resp, "X-RateLimit-Limit")
+        reset = _int_header(resp, "X-RateLimit-Reset")
+        with self._lock:
+            if remaining is not None:
+                self.remaining = remaining
+                if self.remaining_at_start is None:
+                    self.remaining_at_start = remaining + 1
+            if limit is not None:
+                self.limit = limit
+            if reset is not None:
+                self.reset_at = float(reset)
+
+    def refresh(self, api_base: str, headers: Dict[str, str]) -> None:
+        """Read the current core budget from ``/rate_limit`` (which is free)."""
+        try:
+            resp = session.get_session().get(f"{api_base}/rate_limit", headers=headers, timeout=10)
+            core = resp.json()["resources"]["core"]
+        except Exception as exc:  # noqa: BLE001
+            logger.info("Could not read GitHub rate limit: %s", exc)
+            return
+        with self._lock:
+            self.limit = int(core["limit"])
+            self.remaining = int(core["remaining"])
+            self.reset_at = float(core["reset"])
+            self.remaining_at_start = self.remaining
+
+    def affordable(self) -> Optional[int]:
+        """Requests that can still be spent now, or ``None`` if unknown."""
+        with self._lock:
+            if self.remaining is None:
+                return None
+            return max(self.remaining - self.reserve, 0)
+
+    def _acquire(self) -> bool:
+        """Reserve one request, waiting out a short block; False if refused."""
+        while True:
+            now = self._clock()
+            with self._lock:
+                wait = self.blocked_until - now
+                if wait <= 0 and self.remaining is not None and self.remaining <= self.reserve:
+                    reset_wait = (self.reset_at or now) - now
+                    if reset_wait <= 0:
+                        self.remaining = None  # window rolled over; budget unknown again
+                    else:
+                        wait = reset_wait
+                if wait <= 0:
+                    if self.remaining is not None:
+                        self.remaining -= 1
+                    self.requests_sent += 1
+                    return True
+                if wait > self.max_wait:
+                    return False
+                self.waited += wait
+            logger.info("GitHub rate limit: waiting %.1fs", wait)
+            self._sleep(wait)
+
+    # ------------------------------------------------------------------
+    # Retry policy
+    # ------------------------------------------------------------------
+
+    def _retry_delay(self, resp: Optional[requests.Response], attempt: int) -> Optional[float]:
+        """Seconds to wait before retrying, or ``None`` to give up."""
+        if resp is not None and resp.status_code in (403, 429):
+            if not _is_rate_limited(resp):
+                return None  # a genuine permission error; retrying cannot help
+            retry_after = _int_header(resp, "Retry-After")
+            if retry_after is not None:
+                delay = float(retry_after)
+            elif _int_header(resp, "X-RateLimit-Remaining") == 0:
+                delay = (self.reset_at or self._clock()) - self._clock()
+            else:
+                delay = SECONDARY_LIMIT_WAIT * (2 ** attempt)
+            with self._lock:
+                self.blocked_until = max(self.blocked_until, self._clock() + delay)
+            delay += random.uniform(0, 1)
+        elif resp is None or resp.status_code >= 500:
+            delay = self.backoff * (2 ** attempt) * random.uniform(0.5, 1.5)
+        else:
+            return None
+        if delay > self.max_wait:
+            return None
+        with self._lock:
+            if attempt >= self.max_retries or self.retry_budget <= 0:
+                return None
+            self.retry_budget -= 1
+            self.retries += 1
+        return delay
+
+    def get(self, url: str, key: str = "", **kwargs) -> Optional[requests.Response]:
+        """GET *url* within the budget; ``None`` if refused or failed for good.
+
+        *key* names the source in :attr:`refused` when the budget cannot
+        cover the request.  *timeout* applies to each attempt.
+        """
+        timeout = kwargs.pop("timeout", DEFAULT_TIMEOUT)
+        attempt = 0
+        while True:
+            if not self._acquire():
+                logger.warning("GitHub budget exhausted; skipping %s", key or url)
+                with self._lock:
+                    self.refused.append(key or url)
+                return None
+            try:
+                resp = session.get_session().get(url, timeout=timeout, **kwargs)
+            except requests.RequestException as exc:
+                logger.warning("GET %s failed: %s", url, exc)
+                resp = None
+            if resp is not None:
+                self.observe(resp)
+                if resp.status_code < 400:
+                    return resp
+                logger.warning("GET %s returned %s", url, resp.status_code)
+            delay = self._retry_delay(resp, attempt)
+            if delay is None:
+                if resp is not None and resp.status_code in (403, 429) and _is_rate_limited(resp):
+                    with self._lock:
+                        self.refused.append(key or url)
+                return None
+            with self._lock:
+                self.waited += delay
+            self._sleep(delay)
+            attempt += 1
+
+    def summary(self) -> Dict:
+        with self._lock:
+            used = None
+            if self.remaining_at_start is not None and self.remaining is not None:
+                used = max(self.remaining_at_start - self.remaining, 0)
+            return {
+                "limit": self.limit,
+                "remaining_at_start": self.remaining_at_start,
+                "remaining": self.remaining,
+                "budget_used": used,
+                "requests_sent": self.requests_sent,
+                "retries": self.retries,
+                "retry_budget_left": self.retry_budget,
+                "waited_seconds": round(self.waited, 2),
+                "skipped_sources": sorted(set(self.refused)),
+            }
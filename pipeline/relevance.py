@@ -0,0 +1,182 @@
+"""BM25 topic relevance over an inverted index of item text.
+
+Each topic's ``keywords`` form a query profile (the set of their terms).
+An inverted index of item titles and snippets is built for just the
+profile vocabulary in one pass over each item's terms, and every topic is
+scored by walking the postings of its own terms.  Without NumPy the
+scoring cost grows with the number of term occurrences rather than with
+items x topics; with NumPy each topic also fills a dense array of one
+score per item, which is cheap per item but is items x topics.
+
+A topic score is normalised by the score an average-length item would get
+for mentioning the topic's strongest keyword once, and capped at 1.0; an
+item's relevance is its best topic score.  Selected with
+``ranking.relevance: bm25`` in topics.yaml.
+"""
+
+import math
+import string
+from typing import Dict, Iterable, Iterator, List, Sequence, Tuple
+
+try:
+    import numpy as np
+except ImportError:  # optional: postings are then accumulated in dicts
+    np = None
+
+from .item import Item, ItemLike
+
+DEFAULT_K1 = 1.2
+DEFAULT_B = 0.75
+DEFAULT_FIELDS = ("title", "snippet")
+
+# Punctuation separates terms ("multi-agent" -> "multi", "agent"); "_" stays a word character.
+_TERM_SEPARATORS = str.maketrans({c: " " for c in string.punctuation if c != "_"})
+_DOC_SEPARATOR = "\x00"
+_CHUNK_DOCS = 2048
+
+
+def terms(text: str) -> List[str]:
+    """Case-folded terms of *text*, split on whitespace and punctuation."""
+    return text.casefold().translate(_TERM_SEPARATORS).split()
+
+
+def terms_of_texts(texts: Iterable[str]) -> Iterator[List[str]]:
+    """:func:`terms` of each text, folding and translating a chunk of texts per call."""
+    chunk: List[str] = []
+    for text in texts:
+        chunk.append(text.replace(_DOC_SEPARATOR, " ") if _DOC_SEPARATOR in text else text)
+        if len(chunk) == _CHUNK_DOCS:
+            yield from _split_chunk(chunk)
+            chunk = []
+    if chunk:
+        yield from _split_chunk(chunk)
+
+
+def _split_chunk(chunk: List[str]) -> Iterator[List[str]]:
+    for doc in _DOC_SEPARATOR.join(chunk).casefold().translate(_TERM_SEPARATORS).split(_DOC_SEPARATOR):
+        yield doc.split()
+
+
+def _profiles(topics_config: List[Dict]) -> List[Tuple[str, List[List[str]]]]:
+    """``(topic id, [terms of each keyword])`` for topics that have keywords."""
+    out = []
+    for t in topics_config:
+        keywords = [terms(str(k)) for k in t.get("keywords") or []]
+        keywords = [k for k in keywords if k]
+        if keywords:
+            out.append((t["id"], keywords))
+    return out
+
+
+class InvertedIndex:
+    """Postings ``term -> ([doc], [term frequency])`` restricted to *vocabulary*."""
+
+    def __init__(self, docs: Iterable[List[str]], vocabulary: frozenset):
+        postings: Dict[str, Tuple[List[int], List[int]]] = {term: ([], []) for term in vocabulary}
+        doc_len: List[int] = []
+        in_vocabulary = vocabulary.__contains__
+        for d, toks in enumerate(docs):
+            doc_len.append(len(toks))
+            tfs: Dict[str, int] = {}
+            for term in filter(in_vocabulary, toks):  # one pass per document
+                tfs[term] = tfs.get(term, 0) + 1
+            for term, tf in tfs.items():
+                post = postings[term]
+                post[0].append(d)
+                post[1].append(tf)
+        self.postings = {term: post for term, post in postings.items() if post[0]}
+        self.doc_len = doc_len
+        self.doc_count = len(doc_len)
+        self.avg_len = (sum(doc_len) / self.doc_count) if self.doc_count else 0.0
+
+    def idf(self, term: str) -> float:
+        df = len(self.postings[term][0]) if term in self.postings else 0
+        return math.log(1 + (self.doc_count - df + 0.5) / (df + 0.5))
+
+    def arrays(self) -> Dict[str, Tuple["np.ndarray", "np.ndarray"]]:
+        """The postings as NumPy ``(docs, term frequencies)`` arrays."""
+        return {
+            term: (np.asarray(docs, dtype=np.intp), np.asarray(tfs, dtype=np.float64))
+            for term, (docs, tfs) in self.postings.items()
+        }
+
+
+def _accumulate(index: InvertedIndex, weighted_terms: List[Tuple[str, float]], doc_norm) -> Dict[int, float]:
+    """Sparse BM25 sums ``doc -> score`` over the postings of *weighted_terms*."""
+    scores: Dict[int, float] = {}
+    for term, weight in weighted_terms:
+        docs, tfs = index.postings[term]
+        for d, tf in zip(docs, tfs):
+            scores[d] = scores.get(d, 0.0) + weight * tf / (tf + doc_norm[d])
+    return scores
+
+
+def _accumulate_np(
+    postings: Dict, doc_count: int, weighted_terms: List[Tuple[str, float]], doc_norm
+) -> "np.ndarray":
+    """:func:`_accumulate` over :meth:`InvertedIndex.arrays`; documents without postings score 0."""
+    scores = np.zeros(doc_count)
+    for term, weight in weighted_terms:
+        docs, tfs = postings[term]
+        scores[docs] += weight * tfs / (tfs + doc_norm[docs])  # docs are unique per term
+    return scores
+
+
+def _item_text(item: ItemLike, fields: Sequence[str]) -> str:
+    if isinstance(item, Item) and fields == DEFAULT_FIELDS:
+        return f"{item.title} {item.snippet}"
+    return " ".join(str(item.get(f) or "") for f in fields)
+
+
+def bm25_relevance(
+    items: List[ItemLike],
+    topics_config: List[Dict],
+    k1: float = DEFAULT_K1,
+    b: float = DEFAULT_B,
+    fields: Sequence[str] = DEFAULT_FIELDS,
+) -> List[float]:
+    """Relevance in [0, 1] of each item to its best-matching topic."""
+    relevance = [0.0] * len(items)
+    profiles = _profiles(topics_config)
+    if not items or not profiles:
+        return relevance
+    vocabulary = frozenset(term for _, keywords in profiles for kw in keywords for term in kw)
+    # A generator, so each item's term list is dropped as soon as it is indexed.
+    index = InvertedIndex(terms_of_texts(_item_text(item, fields) for item in items), vocabulary)
+    if not index.avg_len:
+        return relevance
+    idf = {term: index.idf(term) for term in vocabulary}
+    weighted: List[List[Tuple[str, float]]] = []
+    for _, keywords in profiles:
+        # Terms no item contains cannot contribute, nor raise the bar for the rest.
+        ideal = max(sum(idf[t] for t in set(kw) if t in index.postings) for kw in keywords)
+        if ideal > 0:
+            present = sorted({t for kw in keywords for t in kw if t in index.postings})
+            weighted.append([(t, idf[t] * (k1 + 1) / ideal) for t in present])
+
+    if np is not None:
+        doc_norm = k1 * (1 - b + b * np.asarray(index.doc_len, dtype=np.float64) / index.avg_len)
+        postings = index.arrays()
+        best = np.zeros(index.doc_count)
+        for terms_ in weighted:
+            np.maximum(best, _accumulate_np(postings, index.doc_count, terms_, doc_norm), out=best)
+        return np.minimum(best, 1.0).tolist()
+
+    doc_norm = [k1 * (1 - b + b * n / index.avg_len) for n in index.doc_len]
+    for terms_ in weighted:
+        for d, score in _accumulate(index, terms_, doc_norm).items():
+            if score > relevance[d]:
+                relevance[d] = score
+    return [min(r, 1.0) for r in relevance]
+
+
+def relevance_from_config(items: List[ItemLike], config: Dict) -> List[float]:
+    """:func:`bm25_relevance` with the ``ranking.bm25`` settings."""
+    cfg = (config.get("ranking") or {}).get("bm25") or {}
+    return bm25_relevance(
+        items,
+        config.get("topics", []),
+        k1=float(cfg.get("k1", DEFAULT_K1)),
+        b=float(cfg.get("b", DEFAULT_B)),
+        fields=tuple(cfg.get("fields", DEFAULT_FIELDS)),
+    )
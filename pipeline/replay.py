@@ -0,0 +1,160 @@
+"""Record/replay of raw HTTP traffic for deterministic offline ingest.
+
+``Recorder`` captures every response that passes through the shared session
+(status, headers, decoded body) and writes them to a compact zip archive:
+``index.json`` lists the requests and each body is a deflated member.
+``Replayer`` mounts a transport adapter that serves those responses back
+through the very same fetch path -- parsers, cache, cursors and all -- with
+no network access.  Archives let benchmarks and regression tests run the
+full pipeline on real feed payloads.
+"""
+
+import hashlib
+import io
+import json
+import logging
+import threading
+import zipfile
+from collections import defaultdict, deque
+from pathlib import Path
+from typing import Deque, Dict, List, Optional, Tuple
+
+import requests
+from requests.adapters import BaseAdapter
+from requests.structures import CaseInsensitiveDict
+from requests.utils import get_encoding_from_headers
+
+logger = logging.getLogger(__name__)
+
+ARCHIVE_VERSION = "1"
+# Headers describing the wire encoding; bodies are archived already decoded.
+_DROP_HEADERS = {"content-encoding", "content-length", "transfer-encoding", "connection", "keep-alive"}
+
+
+def request_key(method: str, url: str, body: Optional[bytes] = None) -> str:
+    """Lookup key for a request: method, URL and a digest of any body."""
+    key = f"{method.upper()} {url}"
+    if body:
+        if isinstance(body, str):
+            body = body.encode("utf-8")
+        key += " #" + hashlib.sha1(body).hexdigest()[:12]
+    return key
+
+
+class Recorder:
+    """Capture responses from a session into a zip archive at *path*."""
+
+    def __init__(self, path: Path):
+        self.path = Path(path)
+        self._lock = threading.Lock()
+        self._records: List[Tuple[Dict, bytes]] = []
+
+    def install(self, session: requests.Session) -> None:
+        session.hooks["response"].append(self._hook)
+
+    def _hook(self, resp: requests.Response, *args, **kwargs) -> requests.Response:
+        body = resp.content  # reads streamed bodies too; iter_content still works afterwards
+        req = resp.request
+        record = {
+            "key": request_key(req.method, req.url, req.body),
+            "status": resp.status_code,
+            "reason": resp.reason,
+            "headers": {k: v for k, v in resp.headers.items() if k.lower() not in _DROP_HEADERS},
+        }
+        with self._lock:
+            self._records.append((record, body or b""))
+        return resp
+
+    def __len__(self) -> int:
+        return len(self._records)
+
+    def save(self) -> Path:
+        """Write the archive; bodies are deflated individually."""
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        with self._lock:
+            records = list(self._records)
+        index = []
+        with zipfile.ZipFile(self.path, "w", compression=zipfile.ZIP_DEFLATED, compresslevel=9) as zf:
+            for n, (record, body) in enumerate(records):
+                name = f"bodies/{n:06d}"
+                zf.writestr(name, body)
+                index.append(dict(record, body=name))
+            zf.writestr("index.json", json.dumps({"version": ARCHIVE_VERSION, "responses": index}))
+        logger.info("Recorded %d responses to %s", len(records), self.path)
+        return self.path
+
+
+class _ReplayAdapter(BaseAdapter):
+    def __init__(self, replayer: "Replayer"):
+        super().__init__()
+        self._replayer = replayer
+
+    def send(self, request, **kwargs):
+        return self._replayer.response_for(request)
+
+    def close(self):
+        pass
+
+
+class Replayer:
+    """Serve archived responses through a session instead of the network.
+
+    Responses recorded for the same request are served in recorded order;
+    once exhausted the last one is repeated.  Requests missing from the
+    archive get a 404 so they fail like any other unavailable source.
+    """
+
+    def __init__(self, path: Path):
+        self.path = Path(path)
+        self._lock = threading.Lock()
+        self._queues: Dict[str, Deque[Dict]] = defaultdict(deque)
+        self._bodies: Dict[str, bytes] = {}
+        self.served = 0
+        self.missed: List[str] = []
+        with zipfile.ZipFile(self.path) as zf:
+            index = json.loads(zf.read("index.json"))
+            if index.get("version") != ARCHIVE_VERSION:
+                raise ValueError(f"Unsupported replay archive version: {index.get('version')}")
+            for record in index["responses"]:
+                self._queues[record["key"]].append(record)
+                self._bodies[record["body"]] = zf.read(record["body"])
+
+    def install(self, session: requests.Session) -> None:
+        adapter = _ReplayAdapter(self)
+        for prefix in list(session.adapters) or ["https://", "http://"]:
+            session.mount(prefix, adapter)
+
+    def response_for(self, request: requests.PreparedRequest) -> requests.Response:
+        key = request_key(request.method, request.url, request.body)
+        with self._lock:
+            queue = self._queues.get(key)
+            if queue:
+                record = queue.popleft() if len(queue) > 1 else queue[0]
+                self.served += 1
+            else:
+                record = None
+                self.missed.append(key)
+        if record is None:
+            logger.warning("Not in replay archive: %s", key)
+            return self._build(request, 404, "Not in replay archive", {}, b"")
+        return self._build(
+            request, record["status"], record.get("reason", ""), record["headers"], self._bodies[record["body"]]
+        )
+
+    @staticmethod
+    def _build(request, status: int, reason: str, headers: Dict[str, str], body: bytes) -> requests.Response:
+        resp = requests.Response()
+        resp.status_code = status
+        resp.reason = reason
+        resp.headers = CaseInsensitiveDict(headers)
+        resp.encoding = get_encoding_from_headers(resp.headers)
+        resp.url = request.url
+        resp.request = request
+        resp.raw = io.BytesIO(body)
+        resp._content = body
+        resp._content_consumed = True
+        return resp
+
+    def stats(self) -> Dict:
+        with self._lock:
+            return {"served": self.served, "missed": len(self.missed)}
@@ -0,0 +1,302 @@
+"""Persistent cross-run index of item IDs with first- and last-seen times.
+
+The index is an open-addressing hash table (linear probing, power-of-two
+capacity) stored as fixed 16-byte records after a 64-byte header::
+
+    record = item key (u64, 0 = empty slot) | first seen (u32) | last seen (u32)
+
+Item IDs are hex SHA-256 prefixes (:func:`pipeline.urls.item_id`), so their
+64-bit value is used directly as the hash.  The file is memory-mapped
+read-only, and a lookup reads one or two records however many IDs it holds.
+
+Sightings are buffered and written by :meth:`SeenIndex.save`, which patches
+a copy of the file and swaps it in with ``os.replace`` once the reports are
+out, like the cursor and health stores.  The table is rebuilt (compacted)
+when it passes its load limit or ``compact_every_days`` after the last
+rebuild; IDs not seen for ``retention_days`` are dropped then.
+"""
+
+import hashlib
+import logging
+import mmap
+import os
+import shutil
+import struct
+import time
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+try:
+    import numpy as np
+except ImportError:  # optional: compaction then reinserts records one by one
+    np = None
+
+from .item import Item, ItemLike
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_SEEN_PATH = Path("data/state/seen.idx")
+DEFAULT_RETENTION_DAYS = 365
+DEFAULT_COMPACT_EVERY_DAYS = 7
+
+_MAGIC = b"AISEEN01"
+_HEADER = struct.Struct("<8sI4xQQd24x")  # magic, version, capacity, count, compacted at
+_RECORD = struct.Struct("<QII")
+_VERSION = 1
+_MIN_CAPACITY = 1024
+_MAX_LOAD = 0.7  # rebuild beyond this ...
+_REBUILD_LOAD = 0.5  # ... into a table at most this full
+
+
+def item_key(item_id: str) -> int:
+    """Non-zero 64-bit key of *item_id*."""
+    key = 0
+    if len(item_id) == 16:
+        try:
+            key = int(item_id, 16)
+        except ValueError:
+            key = 0
+    if not key:
+        key = int.from_bytes(hashlib.blake2b(item_id.encode(), digest_size=8).digest(), "little")
+    return key or 1
+
+
+def _capacity_for(count: int) -> int:
+    capacity = _MIN_CAPACITY
+    while count > capacity * _REBUILD_LOAD:
+        capacity *= 2
+    return capacity
+
+
+def _probe(buf, mask: int, key: int) -> Tuple[int, int, int, int]:
+    """``(slot, key, first, last)`` of *key*'s record, or of the empty slot where it belongs."""
+    slot = key & mask
+    while True:
+        found, first, last = _RECORD.unpack_from(buf, _HEADER.size + slot * _RECORD.size)
+        if found == key or not found:
+            return slot, found, first, last
+        slot = (slot + 1) & mask
+
+
+class SeenIndex:
+    """Item ID -> ``(first seen, last seen)`` in epoch seconds, kept across runs."""
+
+    def __init__(
+        self,
+        path: Path = DEFAULT_SEEN_PATH,
+        retention_days: float = DEFAULT_RETENTION_DAYS,
+        compact_every_days: float = DEFAULT_COMPACT_EVERY_DAYS,
+    ):
+        self.path = Path(path)
+        self.retention_days = retention_days
+        self.compact_every_days = compact_every_days
+        self.capacity = 0
+        self.count = 0
+        self.compacted_at = 0.0
+        self._file = None
+        self._map: Optional[mmap.mmap] = None
+        self._pending: Dict[int, Tuple[int, int]] = {}
+        self._open()
+
+    @classmethod
+    def from_config(cls, cfg: Optional[Dict]) -> "SeenIndex":
+        """Build an index from the ``seen`` section of topics.yaml."""
+        cfg = cfg or {}
+        return cls(
+            path=Path(cfg.get("path", DEFAULT_SEEN_PATH)),
+            retention_days=float(cfg.get("retention_days", DEFAULT_RETENTION_DAYS)),
+            compact_every_days=float(cfg.get("compact_every_days", DEFAULT_COMPACT_EVERY_DAYS)),
+        )
+
+    def _open(self) -> None:
+        if not self.path.exists():
+            return
+        try:
+            fh = open(self.path, "rb")
+        except OSError as exc:
+            logger.warning("Ignoring unreadable seen index %s: %s", self.path, exc)
+            return
+        try:
+            mapped = mmap.mmap(fh.fileno(), 0, access=mmap.ACCESS_READ)
+            magic, version, capacity, count, compacted_at = _HEADER.unpack_from(mapped)
+        except (ValueError, OSError, struct.error) as exc:
+            fh.close()
+            logger.warning("Ignoring unreadable seen index %s: %s", self.path, exc)
+            return
+        valid = (
+            magic == _MAGIC and version == _VERSION and capacity and capacity & (capacity - 1) == 0
+            and len(mapped) == _HEADER.size + capacity * _RECORD.size
+        )
+        if not valid:
+            mapped.close()
+            fh.close()
+            logger.warning("Ignoring seen index %s with an unknown layout", self.path)
+            return
+        self._file, self._map = fh, mapped
+        self.capacity, self.count, self.compacted_at = capacity, count, compacted_at
+
+    def close(self) -> None:
+        if self._map is not None:
+            self._map.close()
+            self._file.close()
+        self._map = self._file = None
+
+    def lookup(self, item_id: str) -> Optional[Tuple[int, int]]:
+        """``(first seen, last seen)`` of *item_id*, or None if it was never seen."""
+        return self._get(item_key(item_id))
+
+    def _get(self, key: int) -> Optional[Tuple[int, int]]:
+        hit = self._pending.get(key)
+        if hit is not None or self._map is None:
+            return hit
+        _, found, first, last = _probe(self._map, self.capacity - 1, key)
+        return (first, last) if found else None
+
+    def __contains__(self, item_id: str) -> bool:
+        return self.lookup(item_id) is not None
+
+    def __len__(self) -> int:
+        """IDs in the index, counting unsaved sightings (an upper bound until saved)."""
+        return self.count + len(self._pending)
+
+    def observe(self, items: List[ItemLike], now: Optional[datetime] = None) -> List[bool]:
+        """Record a sighting of each item; True for items first seen today (UTC).
+
+        Each item's ``first_seen`` is set to its first sighting, so items
+        first seen earlier the same day still count as new when a run is
+        repeated.  Items without an ID are not recorded and count as new.
+        """
+        ts = int((now or datetime.now(tz=timezone.utc)).timestamp())
+        day_start = ts - ts % 86400
+        stamps: Dict[int, str] = {}
+        new = []
+        for item in items:
+            item_id = item.id if isinstance(item, Item) else item.get("id", "")
+            if not item_id:
+                new.append(True)
+                continue
+            key = item_key(item_id)
+            known = self._get(key)
+            first = known[0] if known else ts
+            self._pending[key] = (first, ts)
+            stamp = stamps.get(first)
+            if stamp is None:
+                stamp = stamps[first] = datetime.fromtimestamp(first, tz=timezone.utc).isoformat()
+            item["first_seen"] = stamp
+            new.append(first >= day_start)
+        return new
+
+    # -- persistence --------------------------------------------------------
+
+    def _compaction_due(self, now: float) -> bool:
+        if not self.capacity:
+            return True
+        if self.count + len(self._pending) > self.capacity * _MAX_LOAD:
+            return True
+        return self.compact_every_days > 0 and now - self.compacted_at >= self.compact_every_days * 86400
+
+    def save(self, now: Optional[float] = None) -> None:
+        """Write buffered sightings, compacting the table when due."""
+        now = time.time() if now is None else now
+        if not self._pending and not (self.capacity and self._compaction_due(now)):
+            return
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = self.path.with_suffix(self.path.suffix + ".tmp")
+        if self._compaction_due(now):
+            self._write_compacted(tmp, now)
+        else:
+            self._write_patched(tmp)
+        self.close()
+        os.replace(tmp, self.path)
+        self._pending = {}
+        self._open()
+
+    def compact(self, now: Optional[float] = None) -> None:
+        """Rebuild the table now, dropping IDs past their retention."""
+        now = time.time() if now is None else now
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = self.path.with_suffix(self.path.suffix + ".tmp")
+        self._write_compacted(tmp, now)
+        self.close()
+        os.replace(tmp, self.path)
+        self._pending = {}
+        self._open()
+
+    def _write_patched(self, tmp: Path) -> None:
+        shutil.copyfile(self.path, tmp)
+        mask = self.capacity - 1
+        added = 0
+        with open(tmp, "r+b") as fh, mmap.mmap(fh.fileno(), 0) as buf:
+            for key, (first, last) in self._pending.items():
+                slot, found, _, _ = _probe(buf, mask, key)
+                added += not found
+                _RECORD.pack_into(buf, _HEADER.size + slot * _RECORD.size, key, first, last)
+            _HEADER.pack_into(buf, 0, _MAGIC, _VERSION, self.capacity, self.count + added, self.compacted_at)
+            buf.flush()
+
+    def _records(self, cutoff: int):
+        """Live ``(keys, firsts, lasts)`` merged with pending sightings, last seen at or after *cutoff*."""
+        keys: List[int] = []
+        firsts: List[int] = []
+        lasts: List[int] = []
+        if np is not None and self._map is not None:
+            table = np.frombuffer(
+                self._map, dtype=np.dtype([("key", "<u8"), ("first", "<u4"), ("last", "<u4")]),
+                offset=_HEADER.size,
+            )
+            live = table[(table["key"] != 0) & (table["last"] >= cutoff)]
+            if self._pending:
+                pending = np.fromiter(self._pending, dtype=np.uint64, count=len(self._pending))
+                live = live[~np.isin(live["key"], pending)]
+            keys, firsts, lasts = live["key"].tolist(), live["first"].tolist(), live["last"].tolist()
+            del table, live  # release the buffer export before the map is closed
+        elif self._map is not None:
+            for slot in range(self.capacity):
+                key, first, last = _RECORD.unpack_from(self._map, _HEADER.size + slot * _RECORD.size)
+                if key and last >= cutoff and key not in self._pending:
+                    keys.append(key)
+                    firsts.append(first)
+                    lasts.append(last)
+        for key, (first, last) in self._pending.items():
+            if last >= cutoff:
+                keys.append(key)
+                firsts.append(first)
+                lasts.append(last)
+        return keys, firsts, lasts
+
+    def _write_compacted(self, tmp: Path, now: float) -> None:
+        cutoff = int(now - self.retention_days * 86400) if self.retention_days > 0 else 0
+        keys, firsts, lasts = self._records(max(cutoff, 0))
+        count = len(keys)
+        capacity = _capacity_for(count)
+        buf = bytearray(_HEADER.size + capacity * _RECORD.size)
+        _HEADER.pack_into(buf, 0, _MAGIC, _VERSION, capacity, count, now)
+        if np is not None:
+            table = np.zeros(capacity, dtype=np.dtype([("key", "<u8"), ("first", "<u4"), ("last", "<u4")]))
+            key_arr = np.asarray(keys, dtype=np.uint64)
+            first_arr = np.asarray(firsts, dtype=np.uint32)
+            last_arr = np.asarray(lasts, dtype=np.uint32)
+            slots = (key_arr & np.uint64(capacity - 1)).astype(np.intp)
+            waiting = np.arange(count)
+            # Linear probing in rounds: each free target slot takes the first
+            # waiting record aimed at it, and the rest move one slot on.
+            while len(waiting):
+                free = table["key"][slots] == 0
+                _, first_claim = np.unique(slots[free], return_index=True)
+                placed = np.flatnonzero(free)[first_claim]
+                rows = waiting[placed]
+                table["key"][slots[placed]] = key_arr[rows]
+                table["first"][slots[placed]] = first_arr[rows]
+                table["last"][slots[placed]] = last_arr[rows]
+                keep = np.ones(len(waiting), dtype=bool)
+                keep[placed] = False
+                waiting, slots = waiting[keep], (slots[keep] + 1) & (capacity - 1)
+            buf[_HEADER.size:] = table.tobytes()
+        else:
+            for key, first, last in zip(keys, firsts, lasts):
+                slot, _, _, _ = _probe(buf, capacity - 1, key)
+                _RECORD.pack_into(buf, _HEADER.size + slot * _RECORD.size, key, first, last)
+        with open(tmp, "wb") as fh:
+            fh.write(buf)
+        self.count = count
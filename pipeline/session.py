@@ -0,0 +1,132 @@
+"""Shared HTTP session: pooled keep-alive connections for every pipeline fetch."""
+
+import threading
+from typing import Dict, Optional
+from urllib.parse import urlparse
+
+import requests
+from requests.adapters import HTTPAdapter
+
+DEFAULT_POOL_MAXSIZE = 4
+DEFAULT_POOL_CONNECTIONS = 16  # distinct host pools kept alive at once
+
+_DEFAULT_HEADERS = {
+    "Accept-Encoding": "gzip, deflate",
+    "Connection": "keep-alive",
+    "User-Agent": "daily-ai-docs-pipeline",
+}
+
+
+class CountingAdapter(HTTPAdapter):
+    """HTTPAdapter that counts requests and newly opened connections per host.
+
+    urllib3 keeps a running ``num_connections`` total on each host pool; the
+    difference between requests sent and connections opened is the number of
+    requests that reused a kept-alive connection (i.e. skipped a TCP/TLS
+    handshake).
+    """
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self._stats_lock = threading.Lock()
+        self._requests: Dict[str, int] = {}
+        self._connections: Dict[str, int] = {}
+        self._pool_seen: Dict[int, int] = {}  # id(pool) -> num_connections already counted
+
+    def send(self, request, **kwargs):
+        resp = None
+        try:
+            resp = super().send(request, **kwargs)
+            return resp
+        finally:
+            pool = getattr(resp.raw, "_pool", None) if resp is not None else None
+            self._record(request.url, pool)
+
+    def _record(self, url: str, pool) -> None:
+        host = urlparse(url).netloc
+        with self._stats_lock:
+            self._requests[host] = self._requests.get(host, 0) + 1
+            if pool is not None:
+                opened = pool.num_connections - self._pool_seen.get(id(pool), 0)
+                self._pool_seen[id(pool)] = pool.num_connections
+                self._connections[host] = self._connections.get(host, 0) + opened
+
+    def stats(self) -> Dict[str, Dict[str, int]]:
+        with self._stats_lock:
+            return {
+                host: {
+                    "requests": count,
+                    "new_connections": self._connections.get(host, 0),
+                    "reused_connections": max(count - self._connections.get(host, 0), 0),
+                }
+                for host, count in self._requests.items()
+            }
+
+
+_lock = threading.Lock()
+_session: Optional[requests.Session] = None
+_adapters: Dict[str, CountingAdapter] = {}
+
+
+def configure(
+    pool_maxsize: int = DEFAULT_POOL_MAXSIZE,
+    host_pool_sizes: Optional[Dict[str, int]] = None,
+    transport=None,
+) -> requests.Session:
+    """(Re)build the shared session.
+
+    *pool_maxsize* is the number of keep-alive connections kept per host;
+    *host_pool_sizes* overrides it for individual hosts, e.g.
+    ``{"api.github.com": 8}``.  *transport* is installed on the new session
+    last (a :class:`pipeline.replay.Recorder` or ``Replayer``).  Any
+    previous session is closed and its connection counters are discarded.
+    """
+    global _session, _adapters
+    session = requests.Session()
+    session.headers.update(_DEFAULT_HEADERS)
+
+    adapters = {"": CountingAdapter(pool_connections=DEFAULT_POOL_CONNECTIONS, pool_maxsize=pool_maxsize)}
+    session.mount("https://", adapters[""])
+    session.mount("http://", adapters[""])
+    for host, size in (host_pool_sizes or {}).items():
+        adapter = CountingAdapter(pool_connections=1, pool_maxsize=int(size))
+        adapters[host] = adapter
+        session.mount(f"https://{host}/", adapter)
+        session.mount(f"http://{host}/", adapter)
+    if transport is not None:
+        transport.install(session)
+
+    with _lock:
+        old, _session, _adapters = _session, session, adapters
+    if old is not None:
+        old.close()
+    return session
+
+
+def get_session() -> requests.Session:
+    """Return the shared session, creating it with default pool sizes if needed."""
+    with _lock:
+        session = _session
+    return session if session is not None else configure()
+
+
+def connection_stats() -> Dict[str, Dict[str, int]]:
+    """Per-host request, new-connection and reused-connection counts."""
+    with _lock:
+        adapters = list(_adapters.values())
+    merged: Dict[str, Dict[str, int]] = {}
+    for adapter in adapters:
+        for host, counts in adapter.stats().items():
+            totals = merged.setdefault(host, {k: 0 for k in counts})
+            for key, value in counts.items():
+                totals[key] += value
+    return merged
+
+
+def close() -> None:
+    """Close the shared session and drop its pooled connections."""
+    global _session, _adapters
+    with _lock:
+        old, _session, _adapters = _session, None, {}
+    if old is not None:
+        old.close()
@@ -0,0 +1,255 @@
+"""Persistent SQLite store of the items each run has ranked.
+
+One row per item in ``items`` (indexed on ``published_ts``, ``source``,
+``source_type`` and ``score``; ``id`` is the primary key) and one row per
+(item, topic) in ``item_topics``.  The topic rows repeat the item's
+``published_ts`` and ``score`` so "top items for a topic in a date range"
+is answered from the ``(topic, published_ts)`` index alone, touching only
+that topic's rows in the range however long the history is.
+
+:meth:`ItemStore.upsert` writes a run's items in one transaction.  A
+re-ingested item keeps its earliest ``first_seen`` and any enrichment it
+already had, and takes the new score and topics.
+"""
+
+import json
+import sqlite3
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Union
+
+from .dates import parse_timestamp
+from .item import FIELDS, Item, ItemLike
+
+DEFAULT_STORE_PATH = Path("data/state/items.sqlite")
+SCHEMA_VERSION = 1
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS items (
+    id             TEXT PRIMARY KEY,
+    published_ts   REAL,
+    published_at   TEXT NOT NULL DEFAULT '',
+    source         TEXT NOT NULL DEFAULT '',
+    source_type    TEXT NOT NULL DEFAULT '',
+    score          REAL NOT NULL DEFAULT 0,
+    title          TEXT NOT NULL DEFAULT '',
+    url            TEXT NOT NULL DEFAULT '',
+    snippet        TEXT NOT NULL DEFAULT '',
+    why_it_matters TEXT NOT NULL DEFAULT '',
+    action         TEXT NOT NULL DEFAULT '',
+    topics         TEXT NOT NULL DEFAULT '[]',
+    first_seen     TEXT,
+    extra          TEXT
+);
+CREATE INDEX IF NOT EXISTS items_published ON items (published_ts);
+CREATE INDEX IF NOT EXISTS items_source ON items (source, published_ts);
+CREATE INDEX IF NOT EXISTS items_source_type ON items (source_type, published_ts);
+CREATE INDEX IF NOT EXISTS items_score ON items (score);
+CREATE TABLE IF NOT EXISTS item_topics (
+    topic        TEXT NOT NULL,
+    item_id      TEXT NOT NULL REFERENCES items (id) ON DELETE CASCADE,
+    published_ts REAL,
+    score        REAL NOT NULL DEFAULT 0,
+    PRIMARY KEY (topic, item_id)
+) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS item_topics_recent ON item_topics (topic, published_ts, score);
+CREATE INDEX IF NOT EXISTS item_topics_item ON item_topics (item_id);
+"""
+
+_COLUMNS = (
+    "id", "published_ts", "published_at", "source", "source_type", "score",
+    "title", "url", "snippet", "why_it_matters", "action", "topics", "first_seen", "extra",
+)
+_STORED = frozenset(_COLUMNS) | {"_schema_version"}
+
+_UPSERT = f"""
+INSERT INTO items ({", ".join(_COLUMNS)}) VALUES ({", ".join("?" * len(_COLUMNS))})
+ON CONFLICT (id) DO UPDATE SET
+    published_ts = excluded.published_ts,
+    published_at = excluded.published_at,
+    source = excluded.source,
+    source_type = excluded.source_type,
+    score = excluded.score,
+    title = excluded.title,
+    url = excluded.url,
+    snippet = excluded.snippet,
+    why_it_matters = COALESCE(NULLIF(excluded.why_it_matters, ''), items.why_it_matters),
+    action = COALESCE(NULLIF(excluded.action, ''), items.action),
+    topics = excluded.topics,
+    first_seen = COALESCE(items.first_seen, excluded.first_seen),
+    extra = excluded.extra
+"""
+
+_SELECT = f"SELECT {', '.join('i.' + c for c in _COLUMNS)} FROM items i "
+
+Since = Union[datetime, float, None]  # datetime or epoch seconds
+
+
+def _ts(value: Since) -> Optional[float]:
+    return value.timestamp() if isinstance(value, datetime) else value
+
+
+class ItemStore:
+    """Repository of items kept across runs, backed by one SQLite file."""
+
+    def __init__(self, path: Path = DEFAULT_STORE_PATH, readonly: bool = False):
+        """Open (creating it if need be) the store at *path*.
+
+        With *readonly* the file must already exist and is opened with
+        SQLite's ``mode=ro``: nothing, not even the schema, is written.
+        """
+        self.path = Path(path)
+        if readonly:
+            self._db = sqlite3.connect(self.path.resolve().as_uri() + "?mode=ro", uri=True)
+        else:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            self._db = sqlite3.connect(str(self.path))
+            self._db.execute("PRAGMA journal_mode=WAL")
+            self._db.execute("PRAGMA synchronous=NORMAL")
+            self._db.execute("PRAGMA foreign_keys=ON")
+        version = self._db.execute("PRAGMA user_version").fetchone()[0]
+        if version not in (0, SCHEMA_VERSION):
+            raise ValueError(f"{self.path}: item store schema {version} is newer than {SCHEMA_VERSION}")
+        if readonly:
+            if version != SCHEMA_VERSION:
+                raise ValueError(f"{self.path}: not an item store")
+            return
+        with self._db:
+            self._db.executescript(_SCHEMA)
+            self._db.execute(f"PRAGMA user_version={SCHEMA_VERSION}")
+
+    @classmethod
+    def from_config(cls, cfg: Optional[Dict]) -> "ItemStore":
+        """Open the store named by the ``store`` section of topics.yaml."""
+        return cls(Path((cfg or {}).get("path", DEFAULT_STORE_PATH)))
+
+    def close(self) -> None:
+        self._db.close()
+
+    def __enter__(self) -> "ItemStore":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+    def __len__(self) -> int:
+        return self._db.execute("SELECT count(*) FROM items").fetchone()[0]
+
+    # -- writes ---------------------------------------------------------------
+
+    def upsert(self, items: Iterable[ItemLike]) -> int:
+        """Insert or update *items* (those with an ID) in one transaction; returns how many."""
+        rows = []
+        topic_rows = []
+        for item in items:
+            if isinstance(item, Item):
+                item_id, published_ts, published_at = item.id, item.published_ts, item.published_at
+                topics, score = item.topics, item.score
+                extra = {k: v for k, v in item.extra.items() if k not in _STORED} if item.extra else None
+            else:
+                item_id, published_at = item.get("id", ""), item.get("published_at", "")
+                published_ts = item.get("published_ts")
+                topics, score = item.get("topics") or [], item.get("score", 0.0)
+                extra = {k: v for k, v in item.items() if k not in _STORED and k not in FIELDS} or None
+            if not item_id:
+                continue
+            if published_ts is None:
+                published_ts = parse_timestamp(published_at)
+            score = float(score or 0.0)
+            rows.append((
+                item_id, published_ts, published_at or "", item.get("source", ""), item.get("source_type", ""),
+                score, item.get("title", ""), item.get("url", ""), item.get("snippet", ""),
+                item.get("why_it_matters", ""), item.get("action", ""), json.dumps(topics), item.get("first_seen"),
+                json.dumps(extra, sort_keys=True) if extra else None,
+            ))
+            topic_rows.extend((topic, item_id, published_ts, score) for topic in dict.fromkeys(topics))
+        with self._db:
+            self._db.executemany(_UPSERT, rows)
+            self._db.executemany("DELETE FROM item_topics WHERE item_id = ?", ((r[0],) for r in rows))
+            self._db.executemany("INSERT OR IGNORE INTO item_topics VALUES (?, ?, ?, ?)", topic_rows)
+        return len(rows)
+
+    def prune(self, before: Since) -> int:
+        """Delete items published before *before*; returns how many."""
+        with self._db:
+            return self._db.execute("DELETE FROM items WHERE published_ts < ?", (_ts(before),)).rowcount
+
+    # -- reads ----------------------------------------------------------------
+
+    def _items(self, sql: str, params: Iterable) -> List[Item]:
+        out = []
+        for row in self._db.execute(sql, tuple(params)):
+            values = dict(zip(_COLUMNS, row))
+            values["topics"] = json.loads(values["topics"])
+            raw_extra = values.pop("extra")
+            extra = json.loads(raw_extra) if raw_extra else {}
+            first_seen = values.pop("first_seen")
+            if first_seen:
+                extra["first_seen"] = first_seen
+            out.append(Item(**values, **extra))
+        return out
+
+    def get(self, item_id: str) -> Optional[Item]:
+        found = self._items(_SELECT + "WHERE i.id = ?", (item_id,))
+        return found[0] if found else None
+
+    def query(
+        self,
+        topic: Optional[str] = None,
+        since: Since = None,
+        until: Since = None,
+        source: Optional[str] = None,
+        source_type: Optional[str] = None,
+        min_score: Optional[float] = None,
+        limit: Optional[int] = 20,
+    ) -> List[Item]:
+        """Items published in ``[since, until)`` matching the filters, best score first.
+
+        Ties go to the most recently published item, then to the ID.
+        """
+        # With a topic, the range is read from that topic's rows through the
+        # (topic, published_ts) index and only the matches are joined.
+        prefix = "t" if topic is not None else "i"
+        where, params = [], []
+        if topic is not None:
+            where.append("t.topic = ?")
+            params.append(topic)
+        if since is not None:
+            where.append(f"{prefix}.published_ts >= ?")
+            params.append(_ts(since))
+        if until is not None:
+            where.append(f"{prefix}.published_ts < ?")
+            params.append(_ts(until))
+        for column, value in (("source", source), ("source_type", source_type)):
+            if value is not None:
+                where.append(f"i.{column} = ?")
+                params.append(value)
+        if min_score is not None:
+            where.append(f"{prefix}.score >= ?")
+            params.append(min_score)
+        sql = _SELECT
+        if topic is not None:
+            sql += "JOIN item_topics t ON t.item_id = i.id "
+        if where:
+            sql += f"WHERE {' AND '.join(where)} "
+        sql += f"ORDER BY {prefix}.score DESC, {prefix}.published_ts DESC, i.id"
+        if limit is not None:
+            sql += " LIMIT ?"
+            params.append(limit)
+        return self._items(sql, params)
+
+    def topic_counts(self, since: Since = None, until: Since = None) -> Dict[str, int]:
+        """Items per topic published in ``[since, until)``."""
+        # The window is read through items_published and each item's topics
+        # through item_topics_item (CROSS JOIN fixes that order), so the cost
+        # follows the window, not the history.
+        where, params = [], []
+        if since is not None:
+            where.append("i.published_ts >= ?")
+            params.append(_ts(since))
+        if until is not None:
+            where.append("i.published_ts < ?")
+            params.append(_ts(until))
+        sql = "SELECT t.topic, count(*) FROM items i CROSS JOIN item_topics t ON t.item_id = i.id"
+        sql += (f" WHERE {' AND '.join(where)}" if where else "") + " GROUP BY t.topic ORDER BY t.topic"
+        return dict(self._db.execute(sql, params).fetchall())
@@ -0,0 +1,169 @@
+"""Plain-text snippet extraction from feed HTML and release-note markdown.
+
+Both extractors stop as soon as *limit* visible characters have been
+produced, so the cost of a snippet depends on the snippet length rather
+than on the size of the post.  Entities are decoded, tags, comments and
+``script``/``style`` content are dropped, and whitespace runs collapse to a
+single space.
+"""
+
+import re
+from html import unescape
+from typing import List
+
+DEFAULT_SNIPPET_CHARS = 400
+
+# Elements whose content is never visible text.
+_SKIP_CONTENT = ("script", "style", "template", "head")
+# Elements that separate words when rendered.
+_BLOCK_TAGS = frozenset(
+    "address article aside blockquote br dd div dl dt figcaption figure footer form h1 h2 h3 h4 h5 h6 "
+    "header hr li main nav ol p pre section summary table tbody td tfoot th thead tr ul".split()
+)
+_TAG_NAME_RE = re.compile(r"/?([A-Za-z][A-Za-z0-9-]*)")
+_CLOSE_TAG_RE = {name: re.compile(rf"</{name}\s*>", re.IGNORECASE) for name in _SKIP_CONTENT}
+# What follows a "<" when the input ends inside a tag: a bare name, or a name
+# with attributes (an "=" among them).  "x<y comparison" is text.
+_TRUNCATED_TAG_RE = re.compile(r"[/!?]?[A-Za-z][^<>\s]*(?:\s[^<>]*=[^<>]*)?\Z")
+_LONGEST_ENTITY = 32  # characters; a window edge never splits an entity
+
+
+class _Collector:
+    """Accumulate collapsed, entity-decoded text up to *limit* characters."""
+
+    __slots__ = ("limit", "parts", "size", "space")
+
+    def __init__(self, limit: int):
+        self.limit = limit
+        self.parts: List[str] = []
+        self.size = 0
+        self.space = False  # whitespace seen since the last word
+
+    @property
+    def full(self) -> bool:
+        return self.size >= self.limit
+
+    def add(self, text: str) -> None:
+        if "&" in text:
+            text = unescape(text)
+        words = text.split()
+        if not words:
+            self.space = self.space or bool(text)
+            return
+        piece = " ".join(words)
+        if self.size and (self.space or text[0].isspace()):
+            piece = " " + piece
+        self.parts.append(piece)
+        self.size += len(piece)
+        self.space = text[-1].isspace()
+
+    def text(self) -> str:
+        return "".join(self.parts)[: self.limit].rstrip()
+
+
+def html_snippet(markup: str, limit: int = DEFAULT_SNIPPET_CHARS) -> str:
+    """First *limit* visible characters of an HTML fragment, as plain text."""
+    if not markup or limit <= 0:
+        return ""
+    out = _Collector(limit)
+    pos, length = 0, len(markup)
+    while pos < length and not out.full:
+        lt = markup.find("<", pos)
+        end = length if lt == -1 else lt
+        if end > pos:
+            # Never hand more raw text to the collector than the snippet can use.
+            window = pos + 2 * (limit - out.size) + _LONGEST_ENTITY
+            if end > window:
+                amp = markup.rfind("&", window - _LONGEST_ENTITY, window)
+                end = amp if amp > pos else window
+            out.add(markup[pos:end])
+            pos = end
+            continue
+        # At a "<": a comment, a tag, or a literal less-than sign.
+        nxt = markup[lt + 1:lt + 2]
+        if markup.startswith("<!--", lt):
+            close = markup.find("-->", lt + 4)
+            pos = length if close == -1 else close + 3
+            continue
+        if not (nxt.isalpha() or nxt in ("/", "!", "?")):
+            out.add("<")
+            pos = lt + 1
+            continue
+        gt = markup.find(">", lt)
+        if gt == -1 and _TRUNCATED_TAG_RE.match(markup, lt + 1):
+            break  # truncated markup; the rest is an unfinished tag
+        if gt == -1 or markup.find("<", lt + 1, gt) != -1:
+            out.add("<")  # never closed before the next tag: a literal less-than sign
+            pos = lt + 1
+            continue
+        match = _TAG_NAME_RE.match(markup, lt + 1, gt)
+        name = match.group(1).lower() if match else ""
+        pos = gt + 1
+        if name in _SKIP_CONTENT and nxt != "/" and markup[gt - 1] != "/":
+            close = _CLOSE_TAG_RE[name].search(markup, pos)
+            pos = close.end() if close else length
+        if name in _BLOCK_TAGS:
+            out.space = True
+    return out.text()
+
+
+# Markdown syntax, applied to whole blocks of lines at once.
+_DROP_LINE_RE = re.compile(r"^[ \t]*(?:```|~~~|(?:[-*_][ \t]*){3,}$|\|?[ \t]*:?-{3,}).*$", re.MULTILINE)
+_LINE_PREFIX_RE = re.compile(
+    r"^[ \t]{0,3}(?:#{1,6}[ \t]+|(?:>[ \t]?)+|[-*+][ \t]+\[[ xX]\][ \t]+|[-*+][ \t]+|\d{1,9}[.)][ \t]+)",
+    re.MULTILINE,
+)
+_AUTOLINK_RE = re.compile(r"<((?:https?|mailto):[^>\s]+)>")
+_LINK_RE = re.compile(r"!?\[([^\]\n]*)\](?:\([^)\n]*\)|\[[^\]\n]*\])")
+_EMPHASIS_RE = re.compile(r"\*\*|__|~~|`+|(?<![\w\\])[*_](?=\S)|(?<=\S)[*_](?!\w)")
+_ESCAPE_RE = re.compile(r"\\([\\`*_{}\[\]()#+\-.!|>~])")
+_CODE_SPAN_RE = re.compile(r"(?<!`)(`+)(?!`)(.+?)(?<!`)\1(?!`)")
+# Code is literal: hide what the emphasis/escape passes and the HTML pass would eat.
+_CODE_ESCAPES = str.maketrans({
+    "&": "&amp;", "<": "&lt;", ">": "&gt;", "*": "&#42;", "_": "&#95;", "~": "&#126;", "\\": "&#92;", "`": "&#96;",
+})
+
+
+def _code_span(match: "re.Match[str]") -> str:
+    return match.group(2).translate(_CODE_ESCAPES)
+
+
+def _markdown_text(block: str) -> str:
+    """Strip markdown syntax from a block of whole lines."""
+    block = _DROP_LINE_RE.sub("", block)
+    block = _LINE_PREFIX_RE.sub("", block)
+    if "`" in block:
+        block = _CODE_SPAN_RE.sub(_code_span, block)
+    if "<" in block:
+        block = _AUTOLINK_RE.sub(r"\1", block)
+    if "]" in block:
+        block = _LINK_RE.sub(r"\1", block)
+    block = _EMPHASIS_RE.sub("", block)
+    if "\\" in block:
+        block = _ESCAPE_RE.sub(r"\1", block)
+    return block.replace("|", " ")
+
+
+def markdown_snippet(source: str, limit: int = DEFAULT_SNIPPET_CHARS) -> str:
+    """First *limit* visible characters of a markdown document, as plain text.
+
+    Headings, list and quote markers, emphasis, code fences, link and image
+    syntax are removed; embedded HTML is handled as in :func:`html_snippet`.
+    Inline code is kept literally (``Vec<T>`` is not a tag).
+    The document is converted a block of lines at a time, only until the
+    snippet is full.
+    """
+    if not source or limit <= 0:
+        return ""
+    blocks: List[str] = []
+    pos, length = 0, len(source)
+    budget = 2 * limit
+    while True:
+        end = source.find("\n", min(pos + budget, length))
+        end = length if end == -1 else end
+        blocks.append(_markdown_text(source[pos:end]))
+        pos = end + 1
+        snippet = html_snippet("\n".join(blocks), limit)
+        if len(snippet) >= limit or pos >= length:
+            return snippet
+        budget *= 4  # mostly markup so far (comments, tags); read further ahead
@@ -0,0 +1,235 @@
+"""Append-only store of daily topic counts with running totals.
+
+Layout of a store directory (``data/trends/`` by default)::
+
+    2026-03.jsonl   one segment per month: {"seq", "date", "counts"} per line
+    totals.json     running total per topic, the last sequence number applied
+    trends.lock     taken (``fcntl.flock``) around every update
+
+:meth:`TrendsStore.record` appends one line for a day and adjusts the
+totals, so a run costs the same however long the history is: it reads only
+the day's own segment (to find the record a same-day rerun replaces) and
+rewrites only ``totals.json``.  The last record of a date wins.
+
+The record is written to ``totals.json`` as ``pending`` before it is
+appended and cleared once the totals include it, so a run that dies half
+way is completed by the next one.  :meth:`TrendsStore.export` renders the
+``data/trends.json`` schema from the segments for existing consumers.
+"""
+
+import json
+import logging
+import os
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Dict, Iterator, List, Optional, Tuple
+
+try:
+    import fcntl
+except ImportError:  # not on Windows: updates are then unlocked
+    fcntl = None
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_TRENDS_DIR = Path("data/trends")
+SCHEMA_VERSION = "1"
+
+_TOTALS = "totals.json"
+_LOCK = "trends.lock"
+
+Counts = Dict[str, int]
+
+
+def _segment_name(date: str) -> str:
+    return f"{date[:7]}.jsonl"
+
+
+class TrendsStore:
+    """Daily topic counts in monthly append-only segments, plus running totals."""
+
+    def __init__(self, path: Path = DEFAULT_TRENDS_DIR):
+        self.path = Path(path)
+        self.path.mkdir(parents=True, exist_ok=True)
+        self._state = self._read_state()
+
+    @classmethod
+    def from_config(cls, cfg: Optional[Dict]) -> "TrendsStore":
+        """Open the store named by the ``trends`` section of topics.yaml."""
+        return cls(Path((cfg or {}).get("dir", DEFAULT_TRENDS_DIR)))
+
+    # -- state --------------------------------------------------------------
+
+    def _read_state(self) -> Dict:
+        try:
+            state = json.loads((self.path / _TOTALS).read_text(encoding="utf-8"))
+        except FileNotFoundError:
+            return {"seq": 0, "last_updated": "", "totals": {}, "pending": None}
+        except (OSError, json.JSONDecodeError) as exc:
+            logger.warning("Rebuilding unreadable trends totals %s: %s", self.path / _TOTALS, exc)
+            return self._rebuilt_state()
+        return state
+
+    def _write_state(self) -> None:
+        path = self.path / _TOTALS
+        tmp = path.with_suffix(path.suffix + ".tmp")
+        tmp.write_text(json.dumps(self._state, sort_keys=True), encoding="utf-8")
+        os.replace(tmp, path)
+
+    def _rebuilt_state(self) -> Dict:
+        totals: Counts = {}
+        seq, last = 0, ""
+        for date, counts in self.history():
+            for topic, count in counts.items():
+                totals[topic] = totals.get(topic, 0) + count
+            last = max(last, date)
+        for segment in self._segments():
+            for entry in self._entries(segment):
+                seq = max(seq, entry["seq"])
+        return {"seq": seq, "last_updated": last, "totals": totals, "pending": None}
+
+    def rebuild(self) -> None:
+        """Recompute the totals from the segments (reads the whole history)."""
+        with self._locked():
+            self._state = self._rebuilt_state()
+            self._write_state()
+
+    @contextmanager
+    def _locked(self) -> Iterator[None]:
+        with open(self.path / _LOCK, "a") as fh:
+            if fcntl is not None:
+                fcntl.flock(fh, fcntl.LOCK_EX)
+            try:
+                yield
+            finally:
+                if fcntl is not None:
+                    fcntl.flock(fh, fcntl.LOCK_UN)
+
+    # -- segments -----------------------------------------------------------
+
+    def _segments(self) -> List[Path]:
+        return sorted(self.path.glob("????-??.jsonl"))
+
+    @staticmethod
+    def _entries(segment: Path) -> Iterator[Dict]:
+        try:
+            fh = open(segment, encoding="utf-8")
+        except FileNotFoundError:
+            return
+        with fh:
+            for line in fh:
+                try:
+                    yield json.loads(line)
+                except json.JSONDecodeError:  # a torn final line from an interrupted append
+                    continue
+
+    def _latest(self, date: str, before_seq: Optional[int] = None) -> Optional[Dict]:
+        """Last record of *date* (older than *before_seq*, if given) in its segment."""
+        found = None
+        for entry in self._entries(self.path / _segment_name(date)):
+            if entry["date"] == date and (before_seq is None or entry["seq"] < before_seq):
+                found = entry
+        return found
+
+    def _append(self, entry: Dict) -> None:
+        segment = self.path / _segment_name(entry["date"])
+        line = json.dumps(entry, sort_keys=True, separators=(",", ":")) + "\n"
+        if segment.exists() and segment.stat().st_size:
+            with open(segment, "rb") as fh:
+                fh.seek(-1, os.SEEK_END)
+                if fh.read(1) != b"\n":  # finish off a torn line first
+                    line = "\n" + line
+        with open(segment, "a", encoding="utf-8") as fh:
+            fh.write(line)
+            fh.flush()
+            os.fsync(fh.fileno())
+
+    def _apply(self, entry: Dict) -> None:
+        """Fold *entry* into the totals, replacing the earlier record of its date."""
+        previous = self._latest(entry["date"], before_seq=entry["seq"])
+        totals = self._state["totals"]
+        for topic, count in (previous or {}).get("counts", {}).items():
+            totals[topic] = totals.get(topic, 0) - count
+        for topic, count in entry["counts"].items():
+            totals[topic] = totals.get(topic, 0) + count
+        for topic in [t for t, n in totals.items() if n <= 0]:
+            del totals[topic]
+        self._state["seq"] = entry["seq"]
+        self._state["last_updated"] = max(self._state["last_updated"], entry["date"])
+        self._state["pending"] = None
+        self._write_state()
+
+    def _recover(self) -> None:
+        pending = self._state.get("pending")
+        if pending is None:
+            return
+        logger.warning("Completing interrupted trends update for %s", pending["date"])
+        if not any(e["seq"] == pending["seq"] for e in self._entries(self.path / _segment_name(pending["date"]))):
+            self._append(pending)
+        self._apply(pending)
+
+    # -- API ----------------------------------------------------------------
+
+    def record(self, date: str, counts: Counts) -> None:
+        """Store *counts* as the topic counts of *date* (``YYYY-MM-DD``)."""
+        with self._locked():
+            self._state = self._read_state()  # another run may have written since we opened
+            self._recover()
+            entry = {
+                "seq": self._state["seq"] + 1,
+                "date": date,
+                "counts": {t: int(n) for t, n in counts.items() if n},
+            }
+            self._state["pending"] = entry
+            self._write_state()
+            self._append(entry)
+            self._apply(entry)
+
+    def totals(self) -> Counts:
+        """Total count per topic over the whole history."""
+        return dict(self._state["totals"])
+
+    @property
+    def last_updated(self) -> str:
+        return self._state["last_updated"]
+
+    def __len__(self) -> int:
+        return self._state["seq"]
+
+    def counts(self, date: str) -> Counts:
+        """Topic counts recorded for *date*."""
+        entry = self._latest(date)
+        return dict(entry["counts"]) if entry else {}
+
+    def history(self, since: str = "", until: str = "9999") -> Iterator[Tuple[str, Counts]]:
+        """``(date, counts)`` for each recorded date in ``[since, until)``, in date order.
+
+        Only the segments of the months in the range are read.
+        """
+        for segment in self._segments():
+            month = segment.stem
+            if month < since[:7] or month > until[:7]:
+                continue
+            days: Dict[str, Counts] = {}
+            for entry in self._entries(segment):
+                if since <= entry["date"] < until:
+                    days[entry["date"]] = entry["counts"]
+            yield from sorted(days.items())
+
+    def import_json(self, data: Dict) -> None:
+        """Load the daily history of a ``data/trends.json`` document (for migration)."""
+        days: Dict[str, Counts] = {}
+        for topic, info in (data.get("topics") or {}).items():
+            for date, count in (info.get("daily") or {}).items():
+                days.setdefault(date, {})[topic] = count
+        for date in sorted(days):
+            self.record(date, days[date])
+
+    def export(self) -> Dict:
+        """The whole history in the ``data/trends.json`` schema."""
+        topics: Dict[str, Dict] = {}
+        for date, counts in self.history():
+            for topic, count in counts.items():
+                topics.setdefault(topic, {"total_items": 0, "daily": {}})["daily"][date] = count
+        for topic, info in topics.items():
+            info["total_items"] = self._state["totals"].get(topic, 0)
+        return {"last_updated": self.last_updated, "schema_version": SCHEMA_VERSION, "topics": topics}
@@ -0,0 +1,246 @@
+"""URL canonicalization for deduplication and stable item IDs.
+
+URLs are rebuilt from their parsed components (RFC 3986 section 6):
+
+* scheme and host lower-cased, trailing host dot and default ports dropped;
+* percent-encoding normalised (unreserved characters decoded, hex upper-cased);
+* ``.``/``..`` path segments resolved, an empty path becomes ``/`` and a
+  trailing slash on any other path is removed;
+* tracking parameters removed, empty pairs dropped and the remaining
+  parameters sorted, so parameter order no longer matters;
+* the fragment removed.
+
+Per-host rules (the ``urls.hosts`` section of topics.yaml) then apply site
+knowledge such as GitHub's case-insensitive ``owner/repo`` or WordPress
+``/amp/`` and ``/feed/`` variants of a post.  Results are memoised in a
+bounded LRU cache together with the item ID derived from them.
+"""
+
+import fnmatch
+import hashlib
+import re
+from functools import lru_cache
+from typing import Dict, List, Optional, Pattern, Tuple
+from urllib.parse import urlsplit, urlunsplit
+
+DEFAULT_CACHE_SIZE = 65536
+DEFAULT_STRIP_PARAMS = (
+    "utm_*", "ref", "s", "src", "from", "fbclid", "gclid", "msclkid", "mc_cid", "mc_eid", "ocid",
+)
+# Built-in host rules, in the shape of the ``urls.hosts`` config section.
+DEFAULT_HOSTS: Dict[str, Dict] = {
+    "github.com": {
+        "lowercase_segments": 2,  # owner/repo are case-insensitive
+        "keep_params": [],
+        # /releases/v1.2 redirects to /releases/tag/v1.2
+        "path_rewrites": [[
+            r"^(/[^/]+/[^/]+/releases)/(?!(?:tag|latest|download|expanded_assets|new|edit)(?:/|$))([^/]+)$",
+            r"\1/tag/\2",
+        ]],
+        "force_https": True,
+    },
+    "www.github.com": {"alias_of": "github.com"},
+    "devblogs.microsoft.com": {
+        "keep_params": ["p"],  # WordPress post id; everything else is feed/campaign noise
+        "path_rewrites": [[r"/(?:amp|feed)/?$", "/"]],  # AMP and per-post feed variants
+        "force_https": True,
+    },
+}
+_DEFAULT_PORTS = {"http": 80, "https": 443}
+_UNRESERVED = frozenset("ABCDEFGHIJKLMNOPQRSTUVWXYZabcdefghijklmnopqrstuvwxyz0123456789-._~")
+_PCT_RE = re.compile(r"%([0-9A-Fa-f]{2})")
+
+
+def _normalize_pct(text: str) -> str:
+    if "%" not in text:
+        return text
+
+    def _fix(m: "re.Match") -> str:
+        char = chr(int(m.group(1), 16))
+        return char if char in _UNRESERVED else "%" + m.group(1).upper()
+
+    return _PCT_RE.sub(_fix, text)
+
+
+def _remove_dot_segments(path: str) -> str:
+    if "." not in path:
+        return path
+    out: List[str] = []
+    segments = path.split("/")
+    for i, seg in enumerate(segments):
+        if seg == ".":
+            if i == len(segments) - 1:
+                out.append("")
+        elif seg == "..":
+            if len(out) > 1:
+                out.pop()
+            if i == len(segments) - 1:
+                out.append("")
+        else:
+            out.append(seg)
+    return "/".join(out) or "/"
+
+
+def item_id(url: str) -> str:
+    """Derive a short stable ID from a canonical URL."""
+    return hashlib.sha256(url.encode()).hexdigest()[:16]
+
+
+class HostRule:
+    """Site-specific canonicalization applied after the generic steps.
+
+    *lowercase_segments* lower-cases the first N path segments;
+    *keep_params* (if given) is an allow-list replacing the tracking
+    filter; *path_rewrites* are ``(pattern, replacement)`` regex pairs;
+    *force_https* upgrades the scheme; *alias_of* renames the host.
+    """
+
+    def __init__(
+        self,
+        lowercase_segments: int = 0,
+        keep_params: Optional[List[str]] = None,
+        path_rewrites: Optional[List[Tuple[str, str]]] = None,
+        force_https: bool = False,
+        alias_of: str = "",
+    ):
+        self.lowercase_segments = lowercase_segments
+        self.keep_params = None if keep_params is None else frozenset(keep_params)
+        self.path_rewrites: List[Tuple[Pattern, str]] = [(re.compile(p), r) for p, r in (path_rewrites or [])]
+        self.force_https = force_https
+        self.alias_of = alias_of.lower()
+
+    @classmethod
+    def from_config(cls, cfg: Dict) -> "HostRule":
+        return cls(
+            lowercase_segments=int(cfg.get("lowercase_segments", 0)),
+            keep_params=cfg.get("keep_params"),
+            path_rewrites=[tuple(pair) for pair in cfg.get("path_rewrites", [])],
+            force_https=bool(cfg.get("force_https", False)),
+            alias_of=cfg.get("alias_of", ""),
+        )
+
+
+class Canonicalizer:
+    """Memoising URL canonicalizer with per-host rules."""
+
+    def __init__(
+        self,
+        strip_params=DEFAULT_STRIP_PARAMS,
+        hosts: Optional[Dict[str, HostRule]] = None,
+        cache_size: int = DEFAULT_CACHE_SIZE,
+    ):
+        self._strip_exact = frozenset(p.lower() for p in strip_params if not any(c in p for c in "*?["))
+        self._strip_globs = tuple(p.lower() for p in strip_params if any(c in p for c in "*?["))
+        self._tracking: Dict[str, bool] = {}
+        self.hosts = {host.lower(): rule for host, rule in (hosts or {}).items()}
+        self.canonical_with_id = lru_cache(maxsize=cache_size)(self._canonical_with_id)
+
+    @classmethod
+    def from_config(cls, cfg: Optional[Dict]) -> "Canonicalizer":
+        """Build a canonicalizer from the ``urls`` section of topics.yaml."""
+        cfg = cfg or {}
+        return cls(
+            strip_params=tuple(cfg.get("strip_params", DEFAULT_STRIP_PARAMS)),
+            hosts=_host_rules(cfg.get("hosts", DEFAULT_HOSTS)),
+            cache_size=int(cfg.get("cache_size", DEFAULT_CACHE_SIZE)),
+        )
+
+    def canonicalize(self, url: str) -> str:
+        return self.canonical_with_id(url)[0]
+
+    def cache_info(self):
+        return self.canonical_with_id.cache_info()
+
+    def _is_tracking(self, key: str) -> bool:
+        hit = self._tracking.get(key)
+        if hit is None:
+            lower = key.lower()
+            hit = lower in self._strip_exact or any(fnmatch.fnmatchcase(lower, g) for g in self._strip_globs)
+            if len(self._tracking) < 4096:  # parameter names are few; bound it anyway
+                self._tracking[key] = hit
+        return hit
+
+    def _canonical_with_id(self, url: str) -> Tuple[str, str]:
+        canonical = self._canonicalize(url)
+        return canonical, item_id(canonical)
+
+    def _canonicalize(self, url: str) -> str:
+        url = url.strip()
+        try:
+            parts = urlsplit(url)
+            host = parts.hostname or ""
+            port = parts.port
+        except ValueError:
+            return url
+        scheme = parts.scheme.lower()
+        if scheme not in _DEFAULT_PORTS or not host:
+            return url
+
+        default_port = _DEFAULT_PORTS[scheme]
+        host = host.rstrip(".")
+        rule = self.hosts.get(host)
+        if rule is not None and rule.alias_of:
+            host = rule.alias_of
+            rule = self.hosts.get(host, rule)
+        if rule is not None and rule.force_https:
+            scheme = "https"
+        if ":" in host:
+            host = f"[{host}]"  # IPv6 literal
+        netloc = host if port is None or port == default_port else f"{host}:{port}"
+        if "@" in parts.netloc:
+            netloc = parts.netloc.rpartition("@")[0] + "@" + netloc
+
+        path = _remove_dot_segments(_normalize_pct(parts.path)) or "/"
+        if len(path) > 1 and path.endswith("/"):
+            path = path.rstrip("/") or "/"
+        if rule is not None:
+            if rule.lowercase_segments:
+                segs = path.split("/")
+                n = rule.lowercase_segments + 1
+                path = "/".join([s.lower() for s in segs[:n]] + segs[n:])
+            for pattern, replacement in rule.path_rewrites:
+                path = pattern.sub(replacement, path)
+            if len(path) > 1 and path.endswith("/"):
+                path = path.rstrip("/") or "/"
+
+        query = ""
+        if parts.query:
+            keep = rule.keep_params if rule is not None else None
+            pairs = []
+            for pair in parts.query.split("&"):
+                if not pair:
+                    continue
+                key = pair.partition("=")[0]
+                if keep is not None:
+                    if key not in keep:
+                        continue
+                elif self._is_tracking(key):
+                    continue
+                pairs.append(_normalize_pct(pair))
+            query = "&".join(sorted(pairs))
+
+        return urlunsplit((scheme, netloc, path, query, ""))
+
+
+def _host_rules(hosts: Optional[Dict[str, Dict]]) -> Dict[str, HostRule]:
+    return {host: HostRule.from_config(rule or {}) for host, rule in (hosts or {}).items()}
+
+
+_default = Canonicalizer(hosts=_host_rules(DEFAULT_HOSTS))
+
+
+def configure(cfg: Optional[Dict]) -> Canonicalizer:
+    """Replace the module-level canonicalizer from the ``urls`` config section."""
+    global _default
+    _default = Canonicalizer.from_config(cfg)
+    return _default
+
+
+def canonical_url(url: str) -> str:
+    """Canonical form of *url* under the configured rules."""
+    return _default.canonical_with_id(url)[0]
+
+
+def canonical_with_id(url: str) -> Tuple[str, str]:
+    """``(canonical_url, item_id)`` for *url*, memoised."""
+    return _default.canonical_with_id(url)
@@ -0,0 +1,76 @@
+"""Shared fixtures: a local HTTP stub server for network-facing pipeline code."""
+
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+
+
+class StubServer:
+    """Serve canned responses from a local keep-alive HTTP/1.1 server.
+
+    Register a handler per path with :meth:`route`; it receives the request
+    handler (for headers and body) and returns ``(status, headers, body)``.
+    Every request is appended to :attr:`requests` as ``(method, path, headers)``.
+    A ``Content-Length`` header larger than the body simulates a connection
+    dropped mid-body: the short body is sent and the connection closed.
+    """
+
+    def __init__(self):
+        self.routes = {}
+        self.requests = []
+        stub = self
+
+        class _Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+
+            def _dispatch(self, method):
+                path = self.path
+                stub.requests.append((method, path, dict(self.headers)))
+                length = int(self.headers.get("Content-Length") or 0)
+                self.body = self.rfile.read(length) if length else b""
+                route = stub.routes.get(path) or stub.routes.get(path.split("?")[0])
+                if route is None:
+                    status, headers, body = 404, {}, b"not found"
+                else:
+                    status, headers, body = route(self)
+                if isinstance(body, str):
+                    body = body.encode("utf-8")
+                self.send_response(status)
+                for key, value in headers.items():
+                    self.send_header(key, value)
+                if "Content-Length" not in headers:
+                    self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+                if int(headers.get("Content-Length", len(body))) > len(body):
+                    self.close_connection = True
+
+            def do_GET(self):  # noqa: N802
+                self._dispatch("GET")
+
+            def do_POST(self):  # noqa: N802
+                self._dispatch("POST")
+
+            def log_message(self, *args):
+                pass
+
+        self._server = ThreadingHTTPServer(("127.0.0.1", 0), _Handler)
+        self._server.daemon_threads = True
+        self.url = f"http://127.0.0.1:{self._server.server_address[1]}"
+        self._thread = threading.Thread(target=self._server.serve_forever, args=(0.05,), daemon=True)
+        self._thread.start()
+
+    def route(self, path, handler):
+        self.routes[path] = handler
+
+    def close(self):
+        self._server.shutdown()
+        self._server.server_close()
+
+
+@pytest.fixture
+def stub_server():
+    server = StubServer()
+    yield server
+    server.close()
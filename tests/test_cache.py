@@ -0,0 +1,113 @@
+"""Tests for the conditional-GET validator cache."""
+
+import pytest
+
+from pipeline import ingest, session
+from pipeline.cache import ResponseCache
+
+_FEED = """<?xml version="1.0"?>
+<rss version="2.0"><channel>
+  <item>
+    <title>Post one</title>
+    <link>https://blog.example.com/one</link>
+    <pubDate>Mon, 02 Mar 2026 10:00:00 +0000</pubDate>
+    <description>First post</description>
+  </item>
+</channel></rss>
+"""
+
+
+@pytest.fixture
+def feed_server(stub_server):
+    def _feed(handler):
+        if handler.headers.get("If-None-Match") == '"v1"':
+            return 304, {"ETag": '"v1"'}, b""
+        return 200, {"ETag": '"v1"', "Content-Type": "application/rss+xml"}, _FEED
+
+    stub_server.route("/feed", _feed)
+    yield stub_server
+    session.close()
+
+
+def test_validators_empty_for_unknown_url(tmp_path):
+    cache = ResponseCache(tmp_path / "c.json")
+    assert cache.validators("https://example.com/feed") == {}
+
+
+def test_store_and_validators_round_trip(tmp_path):
+    path = tmp_path / "c.json"
+    cache = ResponseCache(path)
+    cache.store("u", {"ETag": '"abc"', "Last-Modified": "Mon, 02 Mar 2026 10:00:00 GMT"}, [{"a": 1}])
+    cache.save()
+
+    reloaded = ResponseCache(path)
+    assert reloaded.validators("u") == {
+        "If-None-Match": '"abc"',
+        "If-Modified-Since": "Mon, 02 Mar 2026 10:00:00 GMT",
+    }
+    assert reloaded.items("u") == [{"a": 1}]
+
+
+def test_variant_mismatch_skips_validators(tmp_path):
+    cache = ResponseCache(tmp_path / "c.json")
+    cache.store("u", {"ETag": '"abc"'}, [], variant="topics-a")
+    assert cache.validators("u", variant="topics-b") == {}
+
+
+def test_response_without_validators_not_cached(tmp_path):
+    cache = ResponseCache(tmp_path / "c.json")
+    cache.store("u", {}, [{"a": 1}])
+    assert len(cache) == 0
+
+
+def test_lru_eviction_by_entry_count(tmp_path):
+    cache = ResponseCache(tmp_path / "c.json", max_entries=2)
+    for url in ("a", "b", "c"):
+        cache.store(url, {"ETag": url}, [])
+    cache.items("a")  # touch: "b" is now least recently used
+    cache.save()
+    reloaded = ResponseCache(tmp_path / "c.json")
+    assert reloaded.validators("b") == {}
+    assert reloaded.validators("a") != {} and reloaded.validators("c") != {}
+    assert cache.stats()["evictions"] == 1
+
+
+def test_eviction_by_size(tmp_path):
+    cache = ResponseCache(tmp_path / "c.json", max_bytes=300)
+    cache.store("big", {"ETag": "x"}, [{"snippet": "x" * 500}])
+    cache.store("small", {"ETag": "y"}, [{"snippet": "y"}])
+    cache.save()
+    reloaded = ResponseCache(tmp_path / "c.json")
+    assert reloaded.validators("big") == {}
+    assert reloaded.validators("small") != {}
+
+
+def test_fetch_rss_serves_304_from_cache(feed_server, tmp_path, monkeypatch):
+    monkeypatch.setattr(ingest, "_cache", ResponseCache(tmp_path / "c.json"))
+    url = f"{feed_server.url}/feed"
+    first = ingest.fetch_rss(url, "Blog", ["mcp"])
+    assert [i["title"] for i in first] == ["Post one"]
+
+    def _no_parse(*args, **kwargs):
+        raise AssertionError("body must not be reparsed on 304")
+
+    monkeypatch.setattr(ingest, "_parse_feed", _no_parse)
+    second = ingest.fetch_rss(url, "Blog", ["mcp"])
+    assert second == first
+    assert feed_server.requests[-1][2].get("If-None-Match") == '"v1"'
+    assert ingest._cache.stats()["hits"] == 1
+
+
+def test_ingest_all_without_cache_sends_unconditional_requests(feed_server, tmp_path):
+    config = {
+        "sources": {"rss_feeds": [{"url": f"{feed_server.url}/feed", "name": "Blog", "topics": []}]},
+    }
+    cache = ResponseCache(tmp_path / "c.json")
+    ingest.ingest_all(config, cache=cache)
+    ingest.ingest_all(config)
+    stats = {}
+    ingest.ingest_all(config, stats=stats, cache=cache)
+
+    sent = [headers.get("If-None-Match") for _, _, headers in feed_server.requests]
+    assert sent == [None, None, '"v1"']
+    assert stats["cache"]["hits"] == 1
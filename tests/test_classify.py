@@ -0,0 +1,84 @@
+"""Tests for keyword topic classification."""
+
+import pytest
+
+import pipeline.classify as classify_module
+from pipeline.classify import KeywordClassifier, classify_all, classify_from_config, compile_topics
+from pipeline.normalize import normalize
+
+CASES = [
+    ("New MCP Server released", ["mcp"]),
+    ("Model\n  Context   Protocol v2", ["mcp"]),
+    ("mcpx and xmcp are different tools", []),
+    ("Azure OpenAI adds MCP support", ["mcp", "azure-ai"]),
+    ("Docs for .github/skills and SKILL.md", ["skills"]),
+    ("Multi-Agent patterns: agentic!", ["agentic"]),
+    ("nonagentic systems", []),
+    ("xmcp then mcp", ["mcp"]),
+    ("", []),
+]
+TOPICS = [
+    {"id": "mcp", "keywords": ["mcp", "model context protocol", "mcp server"]},
+    {"id": "azure-ai", "keywords": ["azure openai", "ai foundry"]},
+    {"id": "skills", "keywords": [".github/skills", "skill.md", "agent skills"]},
+    {"id": "agentic", "keywords": ["agentic", "multi-agent"]},
+    {"id": "no-keywords"},
+]
+
+
+@pytest.fixture(scope="module")
+def classifier():
+    return KeywordClassifier(TOPICS)
+
+
+@pytest.mark.parametrize("text, expected", CASES)
+def test_classify_word_boundaries_and_case(classifier, text, expected):
+    assert classifier.classify(text) == expected
+
+
+@pytest.mark.parametrize("text, expected", CASES)
+def test_automaton_matches_direct_search(monkeypatch, text, expected):
+    monkeypatch.setattr(classify_module, "_SCAN_MAX", 0)  # force the automaton for a small keyword set
+    assert KeywordClassifier(TOPICS).classify(text) == expected
+
+
+def test_overlapping_keywords_share_a_pass(classifier):
+    # "mcp server" and "mcp" both end inside the same text; suffix outputs are reported.
+    assert classifier.classify("the mcp server") == ["mcp"]
+    assert KeywordClassifier([{"id": "a", "keywords": ["she", "he", "hers"]}]).classify("ushers") == []
+    assert KeywordClassifier([{"id": "a", "keywords": ["he"]}, {"id": "b", "keywords": ["she he"]}]).classify(
+        "she he"
+    ) == ["a", "b"]
+
+
+def test_matches_across_multiple_texts(classifier):
+    assert classifier.classify("Release 1.2", "Adds AI Foundry connectors") == ["azure-ai"]
+
+
+def test_compile_topics_is_cached():
+    assert compile_topics(TOPICS) is compile_topics([dict(t) for t in TOPICS])
+    assert compile_topics(TOPICS[:2]) is not compile_topics(TOPICS)
+
+
+def test_classify_all_adds_to_source_topics():
+    items = [
+        normalize({"url": "https://a.com/1", "title": "Azure OpenAI update", "topics": ["mcp"]}),
+        {"title": "Nothing here", "snippet": "", "topics": ["mcp"]},
+    ]
+    classify_all(items, TOPICS)
+    assert items[0]["topics"] == ["mcp", "azure-ai"]
+    assert items[1]["topics"] == ["mcp"]
+
+
+def test_classify_all_can_replace_source_topics():
+    items = [{"title": "Agentic workflows", "topics": ["mcp"]}, {"title": "Other", "topics": ["mcp"]}]
+    classify_all(items, TOPICS, keep_source_topics=False)
+    assert [i["topics"] for i in items] == [["agentic"], ["mcp"]]
+
+
+def test_classify_from_config_can_be_disabled():
+    items = [{"title": "MCP", "topics": []}]
+    classify_from_config(items, {"topics": TOPICS, "classify": {"enabled": False}})
+    assert items[0]["topics"] == []
+    classify_from_config(items, {"topics": TOPICS})
+    assert items[0]["topics"] == ["mcp"]
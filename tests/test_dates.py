@@ -0,0 +1,84 @@
+"""Tests for the shared timestamp parser."""
+
+from datetime import datetime, timedelta, timezone
+
+import pytest
+
+from pipeline import dates, rank
+from pipeline.normalize import normalize
+
+EPOCH = datetime(2026, 3, 2, 10, 0, tzinfo=timezone.utc).timestamp()
+
+
+@pytest.mark.parametrize("raw", [
+    "2026-03-02T10:00:00Z",
+    "2026-03-02T10:00:00+00:00",
+    "2026-03-02T11:30:00+01:30",
+    "2026-03-02T10:00:00.250Z",
+    "2026-03-02T10:00Z",
+    "2026-03-02 05:00:00-0500",
+    "Mon, 02 Mar 2026 10:00:00 +0000",
+    "Mon, 02 Mar 2026 10:00:00 GMT",
+    "Mon, 2 Mar 2026 10:00 GMT",
+    "Mon, 02 Mar 2026 02:00:00 PST",
+    "Mon, 02 Mar 2026 05:00:00 EST",
+    "02 Mar 26 10:00:00 UT",
+    "Monday, 02-Mar-2026 10:00:00 GMT",
+    "Mon, 02 Mar 2026 10:00:00 +0000 (UTC)",
+])
+def test_parse_timestamp_formats(raw):
+    assert dates.parse_timestamp(raw) == EPOCH
+
+
+def test_parse_timestamp_date_only_is_midnight_utc():
+    assert dates.parse_timestamp("2026-03-02") == EPOCH - 10 * 3600
+
+
+@pytest.mark.parametrize("raw", ["", None, "garbage", "2026-02-30T00:00:00Z", "Mon, 02 Foo 2026 10:00:00 GMT",
+                                 "Mon, 02 Mar 2026 10:00:00 XYZ"])
+def test_parse_timestamp_failures_return_none(raw):
+    assert dates.parse_timestamp(raw) is None
+
+
+def test_fast_paths_agree_with_datetime():
+    for hours in range(0, 24 * 400 * 5, 37):
+        dt = datetime(2024, 1, 1, tzinfo=timezone(timedelta(hours=-7))) + timedelta(hours=hours, seconds=hours % 60)
+        assert dates.parse_timestamp(dt.isoformat()) == dt.timestamp()
+        assert dates.parse_timestamp(dt.strftime("%a, %d %b %Y %H:%M:%S %z")) == dt.timestamp()
+
+
+def test_results_are_memoised():
+    before = dates.cache_info().hits
+    dates.parse_timestamp("Tue, 03 Mar 2026 10:00:00 GMT")
+    dates.parse_timestamp("Tue, 03 Mar 2026 10:00:00 GMT")
+    assert dates.cache_info().hits == before + 1
+
+
+def test_normalize_date_emits_utc_iso_or_empty():
+    assert dates.normalize_date("Mon, 02 Mar 2026 05:00:00 EST") == "2026-03-02T10:00:00+00:00"
+    assert dates.normalize_date("soon") == ""
+
+
+def test_normalize_stores_epoch_and_leaves_unknown_dates_unknown():
+    assert normalize({"url": "https://x", "published_at": "2026-03-02T10:00:00Z"})["published_ts"] == EPOCH
+    item = normalize({"url": "https://x", "published_at": ""})
+    assert item["published_ts"] is None and item["published_at"]
+
+
+def test_score_item_uses_precomputed_timestamp(monkeypatch):
+    def _no_parsing(raw):
+        raise AssertionError("rank parsed a date string")
+
+    monkeypatch.setattr(rank, "parse_timestamp", _no_parsing)
+    now = datetime.fromtimestamp(EPOCH, tz=timezone.utc)
+    fresh = {"published_at": "ignored", "published_ts": EPOCH, "source_type": "rss", "topics": []}
+    unknown = {"published_at": "ignored", "published_ts": None, "source_type": "rss", "topics": []}
+    weights = {"recency": 1.0, "source_quality": 0.0, "topic_relevance": 0.0}
+    assert rank.score_item(fresh, [], weights=weights, now=now) == pytest.approx(1.0)
+    assert rank.score_item(unknown, [], weights=weights, now=now) == pytest.approx(0.5)
+
+
+def test_week_bounds_match_the_report_week_format():
+    start, end = dates.week_bounds("2026-41")
+    assert start == datetime(2026, 10, 12, tzinfo=timezone.utc) and end - start == timedelta(days=7)
+    assert start.strftime("%Y-%W") == (end - timedelta(seconds=1)).strftime("%Y-%W") == "2026-41"
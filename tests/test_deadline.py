@@ -0,0 +1,107 @@
+"""Tests for the run deadline: cancelled fetches and partial publishing."""
+
+import time
+from datetime import datetime, timedelta, timezone
+
+import pytest
+
+from pipeline import ingest, main, publish, session
+from pipeline.cursors import CursorStore
+from pipeline.deadline import Deadline
+from pipeline.trends import TrendsStore
+
+
+@pytest.fixture(autouse=True)
+def _fresh_session():
+    yield
+    session.close()
+
+
+def _rss(prefix, n=3):
+    items = "".join(
+        f"<item><title>{prefix} {i}</title><link>https://example.com/{prefix}/{i}</link>"
+        f"<pubDate>Mon, 02 Mar 2026 10:0{i}:00 +0000</pubDate></item>"
+        for i in range(n)
+    )
+    return f"<rss><channel>{items}</channel></rss>"
+
+
+def test_deadline_clock_arithmetic():
+    now = [100.0]
+    deadline = Deadline(10, clock=lambda: now[0])
+    assert deadline.remaining() == 10 and not deadline.expired()
+    assert deadline.clamp(30) == 10
+    assert deadline.reserve(4).remaining() == pytest.approx(7.5)  # at most a quarter held back
+    now[0] += 10
+    assert deadline.expired() and deadline.clamp(30) == pytest.approx(0.1)
+    assert Deadline(None).remaining() is None and not Deadline(None).expired()
+
+
+@pytest.mark.parametrize("workers", [1, 4])
+def test_ingest_all_abandons_sources_past_the_deadline(stub_server, tmp_path, workers):
+    def _slow(h):
+        time.sleep(1.5)
+        return 200, {}, _rss("slow")
+
+    stub_server.route("/fast", lambda h: (200, {}, _rss("fast")))
+    stub_server.route("/slow", _slow)
+    config = {
+        "ingest": {"max_workers": workers},
+        "sources": {"rss_feeds": [
+            {"url": f"{stub_server.url}/fast", "name": "Fast", "topics": []},
+            {"url": f"{stub_server.url}/slow", "name": "Slow", "topics": []},
+        ]},
+    }
+    cursors = CursorStore(tmp_path / "cursors.json")
+    stats = {}
+    start = time.perf_counter()
+    items = ingest.ingest_all(config, stats=stats, cursors=cursors, deadline=Deadline(0.4))
+    assert time.perf_counter() - start < 1.2
+    assert [i["source"] for i in items] == ["Fast"] * 3
+    assert stats["cut_short"] == ["rss:Slow"]
+    assert cursors.get("rss:Fast") is not None
+    assert cursors.get("rss:Slow") is None
+
+
+def test_run_publishes_partial_reports(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    config = {"topics": [{"id": "mcp", "display": "MCP"}], "ingest": {}}
+    sample = main._sample_items(config, "2026-03-02")
+    batches = [sample, []]  # the second run's fetchers drop everything up to the saved cursors
+
+    def _fake_ingest(config, stats=None, **kwargs):
+        stats.update({"wall_seconds": 0, "sequential_seconds": 0, "saved_seconds": 0, "cut_short": ["rss:Slow"]})
+        return batches.pop(0)
+
+    monkeypatch.setattr(main, "ingest_all", _fake_ingest)
+    monkeypatch.setattr(main, "CursorStore", lambda path: CursorStore(tmp_path / "cursors.json"))
+    summary = main.run(config, "2026-03-02", "2026-09", deadline=0)
+
+    assert summary["partial"] is True
+    assert summary["cut_short"] == {"sources": ["rss:Slow"], "stages": ["watchlist"]}
+    assert summary["outputs"]["watchlist"] is None and "weekly" not in summary["outputs"]
+    daily = (tmp_path / summary["outputs"]["daily"]).read_text(encoding="utf-8")
+    assert "Partial report" in daily and "rss:Slow" in daily
+
+    # The next day's run finds nothing past the cursors; the late run's items were still counted.
+    today = datetime.now(tz=timezone.utc)
+
+    class _Tomorrow(datetime):
+        @classmethod
+        def now(cls, tz=None):
+            return today + timedelta(days=1)
+
+    monkeypatch.setattr(publish, "datetime", _Tomorrow)
+    main.run(config, "2026-03-03", "2026-09")
+    trends = TrendsStore(tmp_path / "data" / "trends")
+    assert trends.counts(today.strftime("%Y-%m-%d")) == {"mcp": len(sample)}
+    assert trends.totals() == {"mcp": len(sample)}
+
+
+def test_run_without_deadline_is_complete(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    config = {"topics": [{"id": "mcp", "display": "MCP"}]}
+    summary = main.run(config, "2026-03-02", "2026-09", dry_run=True)
+    assert summary["partial"] is False
+    assert all(summary["outputs"].values())
+    assert "Partial report" not in (tmp_path / summary["outputs"]["daily"]).read_text(encoding="utf-8")
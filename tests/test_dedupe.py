@@ -1,8 +1,19 @@
 """Tests for the deduplication module."""
 
+import random
+
 import pytest
 
-from pipeline.dedupe import dedupe
+import pipeline.dedupe as dedupe_module
+from pipeline.dedupe import (
+    dedupe,
+    lsh_shape,
+    merge_near_duplicates,
+    near_dedupe,
+    near_duplicate_clusters,
+    near_params_from_config,
+    stream_dedupe,
+)
 
 
 def _item(id_: str, title: str, url: str, score: float = 0.5) -> dict:
@@ -93,3 +104,130 @@ def test_items_with_empty_url_not_url_deduped():
     result = dedupe(items)
     assert len(result) == 1
     assert result[0]["id"] == "b"
+
+
+# ---------------------------------------------------------------------------
+# stream_dedupe
+# ---------------------------------------------------------------------------
+
+def _random_items(seed: int, n: int) -> list:
+    rng = random.Random(seed)
+    return [
+        _item(str(i), rng.choice(["", f"Title {rng.randrange(n // 3 + 1)}"]),
+              rng.choice(["", f"https://x.com/{rng.randrange(n // 3 + 1)}"]), score=rng.random())
+        for i in range(n)
+    ]
+
+
+@pytest.mark.parametrize("seed", range(20))
+def test_stream_with_full_window_matches_dedupe(seed):
+    items = _random_items(seed, 60)
+    expected = [i["id"] for i in dedupe(items)]
+    assert [i["id"] for i in stream_dedupe(iter(items), window=len(items))] == expected
+
+
+def test_stream_without_window_keeps_first_copy():
+    items = [
+        _item("a", "Post", "https://a.com", score=0.1),
+        _item("b", "Other", "https://a.com", score=0.9),
+        _item("c", "post", "https://c.com", score=0.9),
+        _item("d", "New", "https://d.com"),
+    ]
+    assert [i["id"] for i in stream_dedupe(iter(items))] == ["a", "d"]
+
+
+def test_stream_window_replaces_only_held_items():
+    items = [
+        _item("a", "A", "https://a.com", score=0.1),
+        _item("b", "B", "https://b.com", score=0.1),
+        _item("c", "C", "https://c.com", score=0.1),
+        _item("a2", "A", "https://a2.com", score=0.9),  # "a" was already yielded: dropped
+        _item("c2", "C", "https://c2.com", score=0.9),  # "c" is still held: replaced
+    ]
+    assert [i["id"] for i in stream_dedupe(iter(items), window=1)] == ["a", "b", "c2"]
+
+
+def test_stream_is_lazy():
+    def source():
+        yield _item("a", "A", "https://a.com")
+        raise AssertionError("read past the first item")
+
+    assert next(stream_dedupe(source()))["id"] == "a"
+
+
+# ---------------------------------------------------------------------------
+# near duplicates
+# ---------------------------------------------------------------------------
+
+ANNOUNCEMENT = (
+    "Agent mode in Visual Studio Code lets Copilot edit files across your workspace, run terminal "
+    "commands and call MCP tools until the task is done."
+)
+
+
+def _near(id_: str, title: str, snippet: str = ANNOUNCEMENT, score: float = 0.5) -> dict:
+    item = _item(id_, title, f"https://{id_}.example.com/post", score=score)
+    item["snippet"] = snippet
+    return item
+
+
+def _copies() -> list:
+    return [
+        _near("release", "Copilot agent mode is now generally available", score=0.6),
+        _near("unrelated", "Azure OpenAI regional pricing update", "Prices change in three regions.", score=0.9),
+        _near("vscode-blog", "Copilot agent mode now generally available", score=0.8),
+        _near("github-blog", "Copilot agent mode is generally available", ANNOUNCEMENT + " Try it today.", score=0.7),
+    ]
+
+
+def test_near_duplicates_cluster_across_sources():
+    assert near_duplicate_clusters(_copies()) == [[0, 2, 3]]
+
+
+def test_merge_keeps_highest_score_and_records_merged_ids():
+    items = _copies()
+    kept = merge_near_duplicates(items)
+    assert kept == [1, 2]
+    assert items[2]["merged"] == ["release", "github-blog"]
+    assert "merged" not in items[1]
+
+
+def test_merge_uses_given_scores_and_ties_keep_earliest():
+    items = _copies()
+    assert merge_near_duplicates(items, [0.5, 0.5, 0.5, 0.5]) == [0, 1]
+    assert [i["id"] for i in near_dedupe(_copies(), threshold=0.99)] == [i["id"] for i in _copies()]
+
+
+def test_empty_texts_are_never_merged():
+    items = [_near("a", "", ""), _near("b", "", ""), _near("c", "!!", "")]
+    assert near_duplicate_clusters(items) == []
+    assert near_duplicate_clusters([]) == []
+
+
+def test_pure_python_path_matches_numpy(monkeypatch):
+    pytest.importorskip("numpy")
+    rng = random.Random(4)
+    words = [f"w{i}" for i in range(60)]
+    base = [[rng.choice(words) for _ in range(20)] for _ in range(30)]
+    items = []
+    for i in range(150):
+        toks = list(base[i % 30])
+        toks[rng.randrange(20)] = rng.choice(words)
+        items.append(_near(str(i), " ".join(toks[:6]), " ".join(toks[6:])))
+    with_numpy = near_duplicate_clusters(items, threshold=0.7)
+    assert with_numpy
+    monkeypatch.setattr(dedupe_module, "np", None)
+    assert near_duplicate_clusters(items, threshold=0.7) == with_numpy
+
+
+def test_lsh_shape_stays_under_threshold():
+    for threshold in (0.5, 0.7, 0.8, 0.9):
+        bands, rows = lsh_shape(threshold, 64)
+        assert bands * rows <= 64
+        assert (1 / bands) ** (1 / rows) <= threshold
+
+
+def test_near_params_from_config():
+    assert near_params_from_config({}) is None
+    params = near_params_from_config({"dedupe": {"near": {"enabled": True, "threshold": 0.7}}})
+    assert params["threshold"] == 0.7 and params["fields"] == ("title", "snippet")
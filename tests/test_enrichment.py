@@ -0,0 +1,96 @@
+"""Tests for compiled enrichment rules."""
+
+from pipeline.enrichment import EnrichmentEngine, compile_rules, default_action, default_why
+from pipeline.normalize import normalize
+from pipeline.publish import enrich
+
+TOPICS = [
+    {"id": "mcp", "why_matters_template": "MCP why.", "action_template": "MCP action."},
+    {"id": "azure-ai", "why_matters_template": "Azure why."},
+    {"id": "plain"},
+]
+RULES = [
+    {"keywords": ["breaking change", "deprecated"], "priority": 10, "why": "Breaking.", "action": "Check upgrade."},
+    {"source": "openai-blog", "why": "From OpenAI."},
+    {"source_type": "github_release", "topic": "mcp", "action": "Bump the MCP SDK."},
+    {"source_type": "rss", "priority": -1, "why": "Low-priority RSS note."},
+]
+
+
+def _item(**fields) -> dict:
+    item = {"title": "", "snippet": "", "source": "", "source_type": "", "topics": [],
+            "why_it_matters": "", "action": ""}
+    item.update(fields)
+    return item
+
+
+def _old_enrich(item: dict, topics_config) -> tuple:
+    """The original per-item lookup: first tagged topic with a template, else by source type."""
+    topic_map = {t["id"]: t for t in topics_config}
+    out = []
+    for key, default in (("why_matters_template", default_why), ("action_template", default_action)):
+        for tid in item["topics"]:
+            if topic_map.get(tid, {}).get(key):
+                out.append(topic_map[tid][key])
+                break
+        else:
+            out.append(default(item["source_type"]))
+    return tuple(out)
+
+
+def test_without_rules_matches_original_behaviour():
+    combos = [
+        _item(topics=t, source_type=s)
+        for t in ([], ["plain"], ["azure-ai", "mcp"], ["mcp", "azure-ai"], ["unknown", "azure-ai"])
+        for s in ("github_release", "rss_official", "rss", "reddit", "")
+    ]
+    enrich(combos, TOPICS)
+    for item in combos:
+        assert (item["why_it_matters"], item["action"]) == _old_enrich(item, TOPICS)
+
+
+def test_keyword_rule_outranks_topic_template():
+    items = [_item(title="MCP SDK: breaking change in tool calls", topics=["mcp"])]
+    enrich(items, TOPICS, RULES)
+    assert (items[0]["why_it_matters"], items[0]["action"]) == ("Breaking.", "Check upgrade.")
+
+
+def test_rules_fill_fields_independently_and_combine_conditions():
+    release = _item(topics=["mcp"], source_type="github_release", source="mcp-sdk")
+    rss = _item(topics=["mcp"], source_type="rss", source="blog")
+    enrich([release, rss], TOPICS, RULES)
+    # The release rule only sets ``action``; ``why`` comes from the topic template.
+    assert (release["why_it_matters"], release["action"]) == ("MCP why.", "Bump the MCP SDK.")
+    # source_type + topic must both hold, so the RSS item keeps the topic action.
+    assert rss["action"] == "MCP action."
+
+
+def test_negative_priority_yields_to_topic_templates_but_beats_defaults():
+    tagged = _item(topics=["mcp"], source_type="rss")
+    untagged = _item(source_type="rss")
+    enrich([tagged, untagged], TOPICS, RULES)
+    assert tagged["why_it_matters"] == "MCP why."
+    assert untagged["why_it_matters"] == "Low-priority RSS note."
+    assert untagged["action"] == default_action("rss")
+
+
+def test_equal_priority_goes_to_rule_order():
+    rules = [{"source": "openai-blog", "why": "First."}, {"source_type": "rss", "why": "Second."}]
+    items = [_item(source="openai-blog", source_type="rss", topics=["mcp"])]
+    enrich(items, TOPICS, rules)
+    assert items[0]["why_it_matters"] == "First."
+
+
+def test_apply_fills_items_and_keeps_existing_values():
+    item = normalize({"url": "https://a.com/1", "title": "Feature deprecated", "source": "openai-blog"})
+    kept = _item(why_it_matters="Custom.", action="", title="deprecated")
+    EnrichmentEngine(TOPICS, RULES).apply([item, kept])
+    assert (item.why_it_matters, item.action) == ("Breaking.", "Check upgrade.")
+    assert (kept["why_it_matters"], kept["action"]) == ("Custom.", "Check upgrade.")
+
+
+def test_compile_rules_is_cached_and_from_config():
+    assert compile_rules(TOPICS, RULES) is compile_rules([dict(t) for t in TOPICS], [dict(r) for r in RULES])
+    assert compile_rules(TOPICS) is not compile_rules(TOPICS, RULES)
+    engine = EnrichmentEngine.from_config({"topics": TOPICS, "enrichment": {"rules": RULES}})
+    assert len(engine.rules) == len(RULES)
@@ -0,0 +1,75 @@
+"""Tests for the streaming feed parser."""
+
+from xml.etree import ElementTree as ET
+
+import pytest
+
+from pipeline.feeds import iter_entries
+
+RSS = b"""<?xml version="1.0"?>
+<rss version="2.0"><channel><title>Blog</title>
+  <item><title>One</title><link>https://a.com/1</link>
+    <pubDate>Mon, 02 Mar 2026 10:00:00 +0000</pubDate>
+    <description>&lt;p&gt;First&lt;/p&gt;</description></item>
+  <item><title>Two</title><link>https://a.com/2</link><description>Second</description></item>
+  <item><title>Three</title><link>https://a.com/3</link></item>
+</channel></rss>
+"""
+
+ATOM = b"""<?xml version="1.0" encoding="utf-8"?>
+<feed xmlns="http://www.w3.org/2005/Atom"><title>Blog</title>
+  <entry><title>Atom one</title>
+    <link rel="self" href="https://a.com/self/1"/>
+    <link rel="alternate" href="https://a.com/post/1"/>
+    <published>2026-03-02T10:00:00Z</published>
+    <updated>2026-03-03T10:00:00Z</updated>
+    <summary>Summary one</summary></entry>
+  <entry><title>Atom two</title><link href="https://a.com/post/2"/>
+    <updated>2026-03-04T10:00:00Z</updated><content>Body two</content></entry>
+</feed>
+"""
+
+
+def _chunks(data: bytes, size: int = 16):
+    for i in range(0, len(data), size):
+        yield data[i:i + size]
+
+
+def test_rss_items_parsed_across_chunk_boundaries():
+    entries = list(iter_entries(_chunks(RSS)))
+    assert [e["title"] for e in entries] == ["One", "Two", "Three"]
+    assert entries[0]["link"] == "https://a.com/1"
+    assert entries[0]["published"] == "Mon, 02 Mar 2026 10:00:00 +0000"
+    assert entries[0]["summary"] == "<p>First</p>"
+    assert all(e["format"] == "rss" for e in entries)
+
+
+def test_atom_entries_prefer_alternate_link_and_published():
+    entries = list(iter_entries(_chunks(ATOM)))
+    assert [e["link"] for e in entries] == ["https://a.com/post/1", "https://a.com/post/2"]
+    assert entries[0]["published"] == "2026-03-02T10:00:00Z"
+    assert entries[1]["published"] == "2026-03-04T10:00:00Z"
+    assert entries[1]["summary"] == "Body two"
+    assert all(e["format"] == "atom" for e in entries)
+
+
+def test_max_items_stops_reading_chunks():
+    consumed = []
+
+    def _tracked():
+        for chunk in _chunks(RSS):
+            consumed.append(chunk)
+            yield chunk
+
+    entries = list(iter_entries(_tracked(), max_items=1))
+    assert [e["title"] for e in entries] == ["One"]
+    assert sum(map(len, consumed)) < len(RSS)
+
+
+def test_malformed_feed_raises_after_valid_entries():
+    broken = RSS.replace(b"</channel></rss>", b"<item><title>bad</ti")
+    seen = []
+    with pytest.raises(ET.ParseError):
+        for entry in iter_entries([broken, b"tle></item></channel>"]):
+            seen.append(entry["title"])
+    assert seen == ["One", "Two", "Three"]
@@ -0,0 +1,159 @@
+"""Tests for the batched GitHub GraphQL release backend, against a local stand-in endpoint."""
+
+import json
+import time
+
+import pytest
+
+from pipeline import ingest, session
+from pipeline.deadline import Deadline
+
+_RELEASES = {
+    ("o", "a"): [(12, "v1.2"), (11, "v1.1")],
+    ("o", "b"): [(21, "v2.1")],
+    ("o", "c"): [(31, None)],
+}
+
+
+def _rest_release(rid, name, tag):
+    return {
+        "id": rid,
+        "name": name,
+        "tag_name": tag,
+        "html_url": f"https://github.com/x/releases/tag/{tag}",
+        "published_at": f"2026-03-{rid % 28 + 1:02d}T00:00:00Z",
+        "created_at": "2026-01-01T00:00:00Z",
+        "body": f"Notes for {tag}",
+    }
+
+
+def _node(rid, name, tag):
+    rel = _rest_release(rid, name, tag)
+    return {
+        "databaseId": rel["id"],
+        "name": rel["name"],
+        "tagName": rel["tag_name"],
+        "url": rel["html_url"],
+        "publishedAt": rel["published_at"],
+        "createdAt": rel["created_at"],
+        "description": rel["body"],
+    }
+
+
+@pytest.fixture
+def github_server(stub_server, monkeypatch):
+    monkeypatch.setattr(ingest, "GITHUB_API", stub_server.url)
+    monkeypatch.setenv("GITHUB_TOKEN", "test-token")
+    stub_server.graphql_ok = True
+    stub_server.graphql_delay = 0.0
+
+    def _graphql(handler):
+        time.sleep(stub_server.graphql_delay)
+        if not stub_server.graphql_ok:
+            return 502, {}, "bad gateway"
+        body = json.loads(handler.body)
+        assert "rateLimit" in body["query"]
+        variables = body["variables"]
+        data, errors = {"rateLimit": {"cost": 1, "remaining": 4999}}, []
+        for i in range(len(variables) // 2):
+            key = (variables[f"o{i}"], variables[f"n{i}"])
+            if key not in _RELEASES:
+                data[f"r{i}"] = None
+                errors.append({"message": f"Could not resolve to a Repository: {key[1]}"})
+                continue
+            nodes = [_node(rid, name, f"v{rid}") for rid, name in _RELEASES[key]]
+            data[f"r{i}"] = {"releases": {"pageInfo": {"hasNextPage": False}, "nodes": nodes}}
+        return 200, {"Content-Type": "application/json"}, json.dumps({"data": data, "errors": errors})
+
+    def _rest(handler):
+        owner, repo = handler.path.split("/")[2:4]
+        rels = [_rest_release(rid, name, f"v{rid}") for rid, name in _RELEASES.get((owner, repo), [])]
+        return 200, {"Content-Type": "application/json"}, json.dumps(rels)
+
+    stub_server.route("/graphql", _graphql)
+    for owner, repo in list(_RELEASES) + [("o", "gone")]:
+        stub_server.route(f"/repos/{owner}/{repo}/releases", _rest)
+    yield stub_server
+    session.close()
+
+
+def _repos(*names):
+    return [{"owner": "o", "repo": n, "topics": ["mcp"], "since": None} for n in names]
+
+
+def _posts(server):
+    return [path for method, path, _ in server.requests if method == "POST"]
+
+
+def test_graphql_items_match_rest_items(github_server):
+    batched = ingest.fetch_github_releases_graphql(_repos("a", "b", "c"))
+    assert len(_posts(github_server)) == 1
+    for (owner, repo), items in zip([("o", "a"), ("o", "b"), ("o", "c")], batched):
+        assert items == ingest.fetch_github_releases(owner, repo, ["mcp"])
+
+
+def test_graphql_batches_by_size(github_server):
+    stats = {}
+    ingest.fetch_github_releases_graphql(_repos("a", "b", "c"), batch_size=2, stats=stats)
+    assert len(_posts(github_server)) == 2
+    assert stats["batches"] == 2 and stats["cost"] == 2
+
+
+def test_graphql_applies_cursor(github_server):
+    repos = _repos("a")
+    repos[0]["since"] = {"raw_id": "11", "published_at": ""}
+    assert [i["raw_id"] for i in ingest.fetch_github_releases_graphql(repos)[0]] == ["12"]
+
+
+def test_unresolved_repo_marked_for_rest_fallback(github_server):
+    stats = {}
+    result = ingest.fetch_github_releases_graphql(_repos("a", "gone"), stats=stats)
+    assert result[0] is not None and result[1] is None
+    assert stats["fallbacks"] == 1
+
+
+def test_no_token_falls_back_entirely(github_server, monkeypatch):
+    monkeypatch.delenv("GITHUB_TOKEN")
+    assert ingest.fetch_github_releases_graphql(_repos("a", "b")) == [None, None]
+    assert _posts(github_server) == []
+
+
+@pytest.mark.parametrize("graphql_ok", [True, False])
+def test_ingest_all_graphql_backend_matches_rest(github_server, graphql_ok):
+    github_server.graphql_ok = graphql_ok
+    sources = {"github_releases": [
+        {"owner": "o", "repo": n, "topics": ["mcp"]} for n in ("a", "b", "c")
+    ]}
+    rest = ingest.ingest_all({"sources": sources})
+    rest_calls = len(github_server.requests)
+
+    stats = {}
+    batched = ingest.ingest_all({"sources": sources, "ingest": {"github_backend": "graphql"}}, stats=stats)
+    assert batched == rest
+    new_calls = github_server.requests[rest_calls:]
+    if graphql_ok:
+        assert [m for m, _, _ in new_calls] == ["POST"]
+    else:
+        assert [m for m, _, _ in new_calls] == ["POST", "GET", "GET", "GET"]
+        assert stats["graphql"]["fallbacks"] == 3
+
+
+def test_graphql_stops_batching_at_the_deadline(github_server):
+    assert ingest.fetch_github_releases_graphql(_repos("a", "b"), deadline=Deadline(0)) == [None, None]
+    assert _posts(github_server) == []
+
+
+def test_slow_graphql_cannot_spend_the_run_deadline(github_server):
+    github_server.graphql_delay = 3.0
+    sources = {"github_releases": [{"owner": "o", "repo": n, "topics": []} for n in ("a", "b")]}
+    stats = {}
+    start = time.perf_counter()
+    items = ingest.ingest_all(
+        {"sources": sources, "ingest": {"github_backend": "graphql", "graphql_batch_size": 1}},
+        stats=stats,
+        deadline=Deadline(0.5),
+    )
+    assert time.perf_counter() - start < 2.0
+    assert items == []
+    assert len(_posts(github_server)) == 1  # the second batch was never sent
+    assert stats["cut_short"] == ["github:o/a", "github:o/b"]
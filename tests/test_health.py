@@ -0,0 +1,110 @@
+"""Tests for per-source health tracking and the circuit breaker."""
+
+import time
+
+import pytest
+
+from pipeline import ingest, session
+from pipeline.health import HealthStore, p95
+
+
+@pytest.fixture(autouse=True)
+def _fresh_session():
+    yield
+    session.close()
+
+
+def _store(tmp_path, **kwargs):
+    now = [time.time()]
+    store = HealthStore(tmp_path / "health.json", clock=lambda: now[0], **kwargs)
+    return store, now
+
+
+def test_p95_nearest_rank():
+    assert p95([1.0]) == 1.0
+    assert p95([float(i) for i in range(1, 101)]) == 95.0
+
+
+def test_timeout_follows_p95_within_bounds(tmp_path):
+    store, _ = _store(tmp_path, timeout_factor=3.0, min_timeout=2.0, max_timeout=10.0)
+    assert store.timeout("rss:A") == 10.0  # no history yet
+    store.record("rss:A", [1.0] * 19 + [1.5])
+    assert store.timeout("rss:A") == pytest.approx(3.0)
+    store.record("rss:B", [0.05] * 10)
+    assert store.timeout("rss:B") == 2.0
+    store.record("rss:C", [9.0] * 10)
+    assert store.timeout("rss:C") == 10.0
+
+
+def test_ewma_latency_and_window(tmp_path):
+    store, _ = _store(tmp_path, alpha=0.5, window=3)
+    store.record("rss:A", [1.0, 3.0, 3.0, 3.0])
+    rec = store.get("rss:A")
+    assert rec["ewma_latency"] == pytest.approx(2.75)
+    assert rec["latencies"] == [3.0, 3.0, 3.0]
+
+
+def test_circuit_opens_after_consecutive_failures_and_cools_down(tmp_path):
+    store, now = _store(tmp_path, failure_threshold=2, cooldown_hours=1)
+    store.record("rss:A", [], error="boom")
+    assert store.allow("rss:A")
+    store.record("rss:A", [], error="boom")
+    assert not store.allow("rss:A")
+    assert store.summary()["skipped_sources"] == ["rss:A"]
+
+    now[0] += 3601
+    assert store.allow("rss:A")  # half-open: one more try
+    store.record("rss:A", [], error="still down")
+    assert not store.allow("rss:A")  # reopened straight away
+
+    now[0] += 3601
+    store.record("rss:A", [0.2])
+    assert store.get("rss:A")["consecutive_failures"] == 0
+    assert store.get("rss:A")["open_until"] is None
+
+
+def test_state_persists_across_runs(tmp_path):
+    store, _ = _store(tmp_path, failure_threshold=1)
+    store.record("rss:A", [], error="boom")
+    store.save()
+    reloaded = HealthStore(tmp_path / "health.json")
+    assert not reloaded.allow("rss:A")
+    assert reloaded.get("rss:A")["failures"] == 1
+
+
+def test_ingest_all_skips_open_circuit_without_requesting(stub_server, tmp_path):
+    stub_server.route("/down", lambda h: (503, {}, "unavailable"))
+    stub_server.route("/up", lambda h: (200, {}, "<rss><channel></channel></rss>"))
+    config = {"sources": {"rss_feeds": [
+        {"url": f"{stub_server.url}/down", "name": "Down", "topics": []},
+        {"url": f"{stub_server.url}/up", "name": "Up", "topics": []},
+    ]}}
+    store, _ = _store(tmp_path, failure_threshold=2)
+    for _ in range(2):
+        ingest.ingest_all(config, health=store)
+    assert store.get("rss:Down")["consecutive_failures"] == 2
+    assert store.get("rss:Up")["successes"] == 2
+    assert len(store.get("rss:Up")["latencies"]) == 2
+
+    stub_server.requests.clear()
+    stats = {}
+    ingest.ingest_all(config, stats=stats, health=store)
+    assert [path for _, path, _ in stub_server.requests] == ["/up"]
+    assert stats["health"]["skipped_sources"] == ["rss:Down"]
+
+
+def test_adaptive_timeout_cuts_slow_requests_short(stub_server, tmp_path):
+    def _slow(h):
+        time.sleep(0.5)
+        return 200, {}, "<rss><channel></channel></rss>"
+
+    stub_server.route("/slow", _slow)
+    config = {"sources": {"rss_feeds": [{"url": f"{stub_server.url}/slow", "name": "Slow", "topics": []}]}}
+    store, _ = _store(tmp_path, min_timeout=0.1, max_timeout=10.0)
+    store.record("rss:Slow", [0.02] * 10)
+    assert store.timeout("rss:Slow") == pytest.approx(0.1)
+
+    start = time.perf_counter()
+    ingest.ingest_all(config, health=store)
+    assert time.perf_counter() - start < 0.45
+    assert "timed out" in store.get("rss:Slow")["last_error"].lower()
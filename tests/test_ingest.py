@@ -0,0 +1,246 @@
+"""Tests for the ingest module."""
+
+import threading
+import time
+
+import pytest
+
+from pipeline import ingest, session
+from pipeline.cursors import CursorStore
+from pipeline.health import HealthStore
+
+# ---------------------------------------------------------------------------
+# Helpers
+# ---------------------------------------------------------------------------
+
+_CONFIG = {
+    "sources": {
+        "github_releases": [
+            {"owner": "acme", "repo": "slow", "topics": ["mcp"]},
+            {"owner": "acme", "repo": "fast", "topics": ["mcp"]},
+        ],
+        "rss_feeds": [
+            {"url": "https://blog.example.com/feed", "name": "Blog A", "topics": []},
+            {"url": "https://blog.example.com/other", "name": "Blog B", "topics": []},
+        ],
+    },
+}
+
+_DELAYS = {"acme/slow": 0.15, "acme/fast": 0.0, "Blog A": 0.05, "Blog B": 0.10}
+
+
+@pytest.fixture
+def fake_fetchers(monkeypatch):
+    in_flight = {}
+    peak = {}
+    lock = threading.Lock()
+
+    def _track(host, name):
+        with lock:
+            in_flight[host] = in_flight.get(host, 0) + 1
+            peak[host] = max(peak.get(host, 0), in_flight[host])
+        time.sleep(_DELAYS[name])
+        with lock:
+            in_flight[host] -= 1
+        return [{"raw_id": name, "source": name}]
+
+    monkeypatch.setattr(
+        ingest, "fetch_github_releases",
+        lambda owner, repo, topics, **kw: _track("api.github.com", f"{owner}/{repo}"),
+    )
+    monkeypatch.setattr(
+        ingest, "fetch_rss",
+        lambda url, name, topics, **kw: _track("blog.example.com", name),
+    )
+    return peak
+
+
+# ---------------------------------------------------------------------------
+# ingest_all
+# ---------------------------------------------------------------------------
+
+def test_ingest_all_preserves_config_order(fake_fetchers):
+    items = ingest.ingest_all(dict(_CONFIG, ingest={"max_workers": 4}))
+    assert [i["raw_id"] for i in items] == ["acme/slow", "acme/fast", "Blog A", "Blog B"]
+
+
+def test_ingest_all_sequential_matches_concurrent(fake_fetchers):
+    seq = ingest.ingest_all(dict(_CONFIG, ingest={"max_workers": 1}))
+    conc = ingest.ingest_all(dict(_CONFIG, ingest={"max_workers": 4}))
+    assert seq == conc
+
+
+def test_ingest_all_respects_per_host_limit(fake_fetchers):
+    ingest.ingest_all(dict(_CONFIG, ingest={"max_workers": 4, "per_host_limit": 1}))
+    assert fake_fetchers == {"api.github.com": 1, "blog.example.com": 1}
+
+
+def test_ingest_all_reports_time_saved(fake_fetchers):
+    stats = {}
+    ingest.ingest_all(dict(_CONFIG, ingest={"max_workers": 4}), stats=stats)
+    assert stats["sources"] == 4
+    assert stats["sequential_seconds"] >= 0.29
+    assert stats["saved_seconds"] > 0
+    assert stats["wall_seconds"] < stats["sequential_seconds"]
+
+
+# ---------------------------------------------------------------------------
+# fetch_rss
+# ---------------------------------------------------------------------------
+
+def _rss(n: int) -> str:
+    items = "".join(
+        f"<item><title>Post {i}</title><link>https://blog.example.com/{i}</link>"
+        f"<pubDate>Mon, 02 Mar 2026 10:00:00 +0000</pubDate>"
+        f"<description>&lt;b&gt;Body {i}&lt;/b&gt;</description></item>"
+        for i in range(n)
+    )
+    return f'<?xml version="1.0"?><rss version="2.0"><channel>{items}</channel></rss>'
+
+
+def test_fetch_rss_streams_and_caps_items(stub_server):
+    stub_server.route("/feed", lambda h: (200, {"Content-Type": "application/rss+xml"}, _rss(20)))
+    items = ingest.fetch_rss(f"{stub_server.url}/feed", "Blog", ["mcp"], max_items=5)
+    session.close()
+    assert [i["title"] for i in items] == [f"Post {i}" for i in range(5)]
+    assert items[0]["snippet"] == "Body 0"
+    assert items[0]["published_at"] == "2026-03-02T10:00:00+00:00"
+
+
+def test_fetch_rss_bad_xml_returns_empty(stub_server):
+    stub_server.route("/feed", lambda h: (200, {}, "<html>not a feed"))
+    assert ingest.fetch_rss(f"{stub_server.url}/feed", "Blog", []) == []
+    session.close()
+
+
+def test_fetch_rss_truncated_body_keeps_parsed_items(stub_server):
+    body = _rss(2000).encode()
+    stub_server.route("/feed", lambda h: (200, {"Content-Length": str(len(body))}, body[: len(body) // 2]))
+    items = ingest.fetch_rss(f"{stub_server.url}/feed", "Blog", [])
+    session.close()
+    assert len(items) < 2000
+    assert [i["title"] for i in items] == [f"Post {i}" for i in range(len(items))]
+
+
+def test_ingest_all_survives_a_truncated_feed(stub_server, tmp_path):
+    body = _rss(2000).encode()
+    stub_server.route("/cut", lambda h: (200, {"Content-Length": str(len(body))}, body[:5000]))
+    stub_server.route("/ok", lambda h: (200, {}, _rss(3)))
+    config = {"sources": {"rss_feeds": [
+        {"name": "Cut", "url": f"{stub_server.url}/cut", "topics": []},
+        {"name": "Ok", "url": f"{stub_server.url}/ok", "topics": []},
+    ]}}
+    health = HealthStore(tmp_path / "health.json")
+    items = ingest.ingest_all(config, health=health)
+    session.close()
+    assert [i["title"] for i in items if i["source"] == "Ok"] == ["Post 0", "Post 1", "Post 2"]
+    assert health.get("rss:Cut")["failures"] == 1 and health.get("rss:Ok")["failures"] == 0
+
+
+# ---------------------------------------------------------------------------
+# Incremental ingestion: pagination and cursors
+# ---------------------------------------------------------------------------
+
+def _release(n: int) -> dict:
+    return {
+        "id": n,
+        "name": f"v{n}",
+        "html_url": f"https://github.com/o/r/releases/tag/v{n}",
+        "published_at": f"2026-03-{n:02d}T00:00:00Z",
+        "body": f"Release {n}",
+    }
+
+
+@pytest.fixture
+def releases_server(stub_server, monkeypatch):
+    """Three pages of two releases each, newest first (v6 .. v1)."""
+    import json
+
+    base = "/repos/o/r/releases"
+    pages = {1: [6, 5], 2: [4, 3], 3: [2, 1]}
+
+    def _page(handler):
+        page = int(handler.path.rsplit("page=", 1)[1]) if "&page=" in handler.path else 1
+        headers = {"Content-Type": "application/json"}
+        if page < 3:
+            headers["Link"] = f'<{stub_server.url}{base}?per_page=100&page={page + 1}>; rel="next"'
+        return 200, headers, json.dumps([_release(n) for n in pages[page]])
+
+    stub_server.route(base, _page)
+    monkeypatch.setattr(ingest, "GITHUB_API", stub_server.url)
+    yield stub_server
+    session.close()
+
+
+def test_fetch_github_releases_backfills_all_pages(releases_server):
+    items = ingest.fetch_github_releases("o", "r", ["mcp"])
+    assert [i["title"] for i in items] == ["v6", "v5", "v4", "v3", "v2", "v1"]
+    assert len(releases_server.requests) == 3
+
+
+def test_fetch_github_releases_respects_max_pages(releases_server):
+    items = ingest.fetch_github_releases("o", "r", [], max_pages=2)
+    assert [i["title"] for i in items] == ["v6", "v5", "v4", "v3"]
+
+
+def test_fetch_github_releases_stops_at_cursor(releases_server):
+    cursor = {"raw_id": "4", "published_at": "2026-03-04T00:00:00Z"}
+    items = ingest.fetch_github_releases("o", "r", [], since=cursor)
+    assert [i["title"] for i in items] == ["v6", "v5"]
+    assert len(releases_server.requests) == 2
+
+
+def test_fetch_rss_stops_at_cursor(stub_server):
+    stub_server.route("/feed", lambda h: (200, {}, _rss(10)))
+    cursor = {"raw_id": "https://blog.example.com/3", "published_at": ""}
+    items = ingest.fetch_rss(f"{stub_server.url}/feed", "Blog", [], since=cursor)
+    session.close()
+    assert [i["title"] for i in items] == ["Post 0", "Post 1", "Post 2"]
+
+
+def test_cursor_store_never_moves_backwards(tmp_path):
+    store = CursorStore(tmp_path / "cursors.json")
+    store.advance("k", [{"raw_id": "2", "published_at": "2026-03-02T00:00:00Z"}])
+    store.advance("k", [{"raw_id": "1", "published_at": "2026-03-01T00:00:00Z"}])
+    assert store.get("k")["raw_id"] == "2"
+    store.save()
+    assert CursorStore(tmp_path / "cursors.json").get("k")["raw_id"] == "2"
+
+
+def test_ingest_all_second_run_fetches_only_delta(releases_server, tmp_path):
+    config = {"sources": {"github_releases": [{"owner": "o", "repo": "r", "topics": []}]}}
+    cursors = CursorStore(tmp_path / "cursors.json")
+    assert len(ingest.ingest_all(config, cursors=cursors)) == 6
+    assert cursors.get("github:o/r")["raw_id"] == "6"
+    assert ingest.ingest_all(config, cursors=cursors) == []
+
+
+def test_ingest_all_keeps_cursor_when_pagination_stops_short(releases_server, tmp_path):
+    config = {
+        "sources": {"github_releases": [{"owner": "o", "repo": "r", "topics": []}]},
+        "ingest": {"max_pages": 2},
+    }
+    cursors = CursorStore(tmp_path / "cursors.json")
+    cursors.advance("github:o/r", [{"raw_id": "1", "published_at": "2026-03-01T00:00:00Z"}])
+    stats: dict = {}
+    items = ingest.ingest_all(config, stats=stats, cursors=cursors)
+    assert [i["title"] for i in items] == ["v6", "v5", "v4", "v3"]  # v2 is on page 3
+    assert stats["incomplete"] == ["github:o/r"]
+    assert cursors.get("github:o/r")["raw_id"] == "1"
+
+
+def test_ingest_all_keeps_cursor_when_a_later_page_fails(releases_server, tmp_path):
+    page = releases_server.routes["/repos/o/r/releases"]
+    releases_server.route(
+        "/repos/o/r/releases", lambda h: (500, {}, "boom") if "&page=2" in h.path else page(h)
+    )
+    config = {"sources": {"github_releases": [{"owner": "o", "repo": "r", "topics": []}]}}
+    cursors = CursorStore(tmp_path / "cursors.json")
+    cursors.advance("github:o/r", [{"raw_id": "1", "published_at": "2026-03-01T00:00:00Z"}])
+    items = ingest.ingest_all(config, cursors=cursors)
+    assert [i["title"] for i in items] == ["v6", "v5"]
+    assert cursors.get("github:o/r")["raw_id"] == "1"
+    # Once the pages come through, the cursor moves.
+    releases_server.route("/repos/o/r/releases", page)
+    assert [i["title"] for i in ingest.ingest_all(config, cursors=cursors)] == ["v6", "v5", "v4", "v3", "v2"]
+    assert cursors.get("github:o/r")["raw_id"] == "6"
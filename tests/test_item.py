@@ -0,0 +1,83 @@
+"""Tests for the slotted Item record and its dict compatibility."""
+
+import copy
+import pickle
+
+import pytest
+
+from pipeline.dedupe import dedupe
+from pipeline.item import FIELDS, Item, as_item
+from pipeline.normalize import normalize
+from pipeline.publish import enrich
+from pipeline.rank import rank
+
+
+def _raw(i: int, **kw) -> dict:
+    raw = {
+        "title": f"Item {i}",
+        "url": f"https://example.com/{i}",
+        "published_at": "2026-01-09T00:00:00+00:00",
+        "source": "test",
+        "source_type": "rss",
+        "topics": ["mcp"],
+    }
+    raw.update(kw)
+    return raw
+
+
+def test_item_has_no_instance_dict():
+    item = Item(id="a")
+    assert not hasattr(item, "__dict__")
+
+
+def test_mapping_access_matches_attributes():
+    item = normalize(_raw(1))
+    assert item["title"] == item.title == "Item 1"
+    assert item.get("score") == 0.0
+    assert item.get("missing", "x") == "x"
+    assert list(item) == list(FIELDS)
+    assert len(item) == len(FIELDS)
+    item["score"] = 0.5
+    assert item.score == 0.5
+
+
+def test_unknown_keys_go_to_extra():
+    item = Item()
+    assert "cluster" not in item
+    item["cluster"] = 3
+    assert item["cluster"] == 3 and "cluster" in item
+    assert list(item)[-1] == "cluster"
+    del item["cluster"]
+    with pytest.raises(KeyError):
+        item["cluster"]
+
+
+def test_from_dict_leaves_missing_fields_unset():
+    item = Item.from_dict({"id": "a", "title": "T", "note": "n"})
+    assert "url" not in item and item.get("url", "") == ""
+    with pytest.raises(KeyError):
+        item["url"]
+    assert item.to_dict() == {"id": "a", "title": "T", "note": "n"}
+
+
+def test_equals_dict_and_round_trips():
+    item = normalize(_raw(2))
+    assert item == item.to_dict()
+    assert as_item(item.to_dict()) == item
+    assert as_item(item) is item
+    assert pickle.loads(pickle.dumps(item)) == item
+    clone = copy.deepcopy(item)
+    clone.topics.append("other")
+    assert item.topics == ["mcp"]
+
+
+def test_stages_accept_items_and_dicts_alike():
+    config = {"topics": [{"id": "mcp", "why_matters_template": "Because."}]}
+    as_items = [normalize(_raw(i)) for i in range(3)] + [normalize(_raw(9, title="item 0"))]
+    as_dicts = [i.to_dict() for i in as_items]
+    results = []
+    for items in (as_items, as_dicts):
+        out = enrich(rank(dedupe(items), config), config["topics"])
+        results.append([(i["id"], i["score"], i["why_it_matters"]) for i in out])
+    assert results[0] == results[1]
+    assert len(results[0]) == 3
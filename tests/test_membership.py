@@ -0,0 +1,53 @@
+"""Tests for the Bloom filter and the disk-backed exact set."""
+
+import os
+
+import pytest
+
+import pipeline.membership as membership
+from pipeline.membership import BloomFilter, SpillSet
+
+
+def test_bloom_has_no_false_negatives_and_bounded_false_positives():
+    bloom = BloomFilter(capacity=5000, fp_rate=0.01)
+    for i in range(5000):
+        bloom.add(f"key-{i}")
+    assert all(f"key-{i}" in bloom for i in range(5000))
+    false_positives = sum(f"other-{i}" in bloom for i in range(20000))
+    assert false_positives / 20000 < 0.02
+    assert bloom.nbytes == pytest.approx(5000 * 9.585 / 8, rel=0.01)  # -ln(0.01) / ln(2)^2 bits per key
+    assert bloom.hashes == 7
+
+
+def test_bloom_rejects_bad_parameters():
+    with pytest.raises(ValueError):
+        BloomFilter(capacity=0)
+    with pytest.raises(ValueError):
+        BloomFilter(fp_rate=1.0)
+    assert BloomFilter(capacity=10, fp_rate=1e-9).hashes == membership.MAX_HASHES
+
+
+def test_spill_set_is_exact_past_capacity(monkeypatch):
+    monkeypatch.setattr(membership, "_FLUSH_EVERY", 64)
+    with SpillSet(capacity=100, fp_rate=0.05) as keys:
+        for i in range(2000):  # 20x over capacity: the filter saturates, SQLite stays exact
+            keys.add(f"key-{i}")
+        assert len(keys) == 2000
+        assert all(f"key-{i}" in keys for i in range(0, 2000, 7))
+        assert not any(f"other-{i}" in keys for i in range(500))
+        assert keys.disk_lookups > 0
+
+
+def test_spill_set_temp_file_is_removed_and_given_path_is_scratch(tmp_path):
+    with SpillSet(capacity=10) as keys:
+        temp = keys._owned
+        keys.add("a")
+    assert temp is not None and not os.path.exists(temp)
+
+    path = tmp_path / "spill.sqlite"
+    with SpillSet(capacity=10, path=path) as keys:
+        keys.add("a")
+        keys._flush()
+    with SpillSet(capacity=10, path=path) as keys:
+        assert "a" not in keys
+    assert path.exists()
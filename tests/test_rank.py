@@ -8,6 +8,7 @@ from pipeline.rank import (
     DEFAULT_SOURCE_QUALITY,
     rank,
     recency_score,
+    score_all,
     score_item,
     source_quality_score,
     topic_relevance_score,
@@ -147,3 +148,82 @@ def test_rank_deterministic():
 
 def test_rank_empty_input():
     assert rank([], _BASE_CONFIG, now=NOW) == []
+
+
+# ---------------------------------------------------------------------------
+# ItemBatch (NumPy scoring)
+# ---------------------------------------------------------------------------
+
+def _varied_items(n: int) -> list:
+    types = ["github_release", "rss", "reddit", "unknown"]
+    topic_sets = [[], ["mcp"], ["mcp", "vscode-insiders"], ["a", "b", "c"]]
+    dates = ["2026-01-09T12:00:00+00:00", "2025-12-01T00:00:00Z", "", "not a date", "2026-01-11T00:00:00Z"]
+    return [
+        _make_item(str(i), dates[i % 5], types[i % 4], topic_sets[(i // 4) % 4]) for i in range(n)
+    ]
+
+
+def test_batch_scores_match_score_item():
+    np = pytest.importorskip("numpy")
+    from pipeline.rank import ItemBatch
+
+    items = _varied_items(200)
+    all_topics = ["mcp", "vscode-insiders"]
+    expected = [round(score_item(i, all_topics, now=NOW), 4) for i in items]
+    got = ItemBatch(items).scores(all_topics, now=NOW)
+    assert np.array_equal(got, expected)
+
+
+def test_batch_order_is_stable_and_top_k_matches_full_sort():
+    np = pytest.importorskip("numpy")
+    from pipeline.rank import ItemBatch
+
+    scores = np.array([0.5, 0.9, 0.5, 0.7, 0.9, 0.1, 0.5])
+    assert ItemBatch.order(scores).tolist() == [1, 4, 3, 0, 2, 6, 5]
+    for k in range(len(scores) + 2):
+        assert ItemBatch.order(scores, k).tolist() == ItemBatch.order(scores).tolist()[:k]
+
+
+def test_rank_batch_path_matches_loop(monkeypatch):
+    pytest.importorskip("numpy")
+    import pipeline.rank as rank_module
+
+    items = _varied_items(600)
+    batch = rank(items, _BASE_CONFIG, now=NOW)
+    monkeypatch.setattr(rank_module, "BATCH_MIN_ITEMS", 10 ** 9)
+    loop = rank([dict(i) for i in items], _BASE_CONFIG, now=NOW)
+    assert [(i["id"], i["score"]) for i in batch] == [(i["id"], i["score"]) for i in loop]
+
+
+# ---------------------------------------------------------------------------
+# score_all / Ranking views
+# ---------------------------------------------------------------------------
+
+@pytest.mark.parametrize("n", [40, 600])  # per-item loop and batch path
+def test_ranking_views_match_full_sort(n):
+    items = _varied_items(n)
+    full = [i["id"] for i in rank([dict(i) for i in items], _BASE_CONFIG, now=NOW)]
+    ranking = score_all(items, _BASE_CONFIG, now=NOW)
+    for k in (0, 1, 5, n // 2, n, n + 3):
+        assert [i["id"] for i in ranking.top(k)] == full[:k]
+    assert [i["id"] for i in ranking.top()] == full
+    threshold = sorted(i["score"] for i in items)[n // 3]
+    above = ranking.at_least(threshold)
+    assert [i["id"] for i in above] == [f for f in full if items[int(f)]["score"] >= threshold]
+    assert ranking.at_least(2.0) == []
+
+
+def test_score_all_assigns_scores_in_place():
+    items = _varied_items(10)
+    score_all(items, _BASE_CONFIG, now=NOW)
+    assert all(i["score"] > 0 for i in items)
+
+
+@pytest.mark.parametrize("n", [40, 600])
+def test_ranking_subset_keeps_scores_and_order(n):
+    items = _varied_items(n)
+    ranking = score_all(items, _BASE_CONFIG, now=NOW)
+    keep = list(range(0, n, 3))
+    subset = ranking.subset(keep)
+    assert subset.items == [items[i] for i in keep]
+    assert [i["id"] for i in subset.top()] == [i["id"] for i in ranking.top() if int(i["id"]) % 3 == 0]
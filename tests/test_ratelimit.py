@@ -0,0 +1,143 @@
+"""Tests for the GitHub rate-limit scheduler, against a local stub server."""
+
+import json
+import time
+
+import pytest
+
+from pipeline import ingest, session
+from pipeline.health import HealthStore
+from pipeline.ratelimit import GitHubScheduler
+
+
+@pytest.fixture(autouse=True)
+def _fresh_session():
+    yield
+    session.close()
+
+
+def _scheduler(**kwargs):
+    """Scheduler on a fake clock that only advances when it sleeps."""
+    now = [time.time()]
+    sleeps = []
+
+    def _sleep(seconds):
+        sleeps.append(seconds)
+        now[0] += seconds
+
+    sched = GitHubScheduler(sleep=_sleep, clock=lambda: now[0], **kwargs)
+    return sched, sleeps
+
+
+def _limit_headers(remaining, reset_in=3600):
+    return {
+        "X-RateLimit-Limit": "60",
+        "X-RateLimit-Remaining": str(remaining),
+        "X-RateLimit-Reset": str(int(time.time() + reset_in)),
+    }
+
+
+def test_observe_tracks_budget(stub_server):
+    stub_server.route("/x", lambda h: (200, _limit_headers(41), "[]"))
+    sched, _ = _scheduler()
+    assert sched.get(f"{stub_server.url}/x").status_code == 200
+    summary = sched.summary()
+    assert summary["limit"] == 60
+    assert summary["remaining"] == 41
+    assert summary["budget_used"] == 1
+    assert summary["requests_sent"] == 1
+
+
+def test_retry_after_is_honoured(stub_server):
+    calls = []
+
+    def _route(handler):
+        calls.append(1)
+        if len(calls) == 1:
+            return 429, {"Retry-After": "2"}, "slow down"
+        return 200, _limit_headers(10), "[]"
+
+    stub_server.route("/x", _route)
+    sched, sleeps = _scheduler()
+    assert sched.get(f"{stub_server.url}/x").status_code == 200
+    assert len(sleeps) == 1 and 2 <= sleeps[0] <= 3
+    assert sched.retries == 1
+
+
+def test_server_errors_retry_with_backoff_within_budget(stub_server):
+    stub_server.route("/x", lambda h: (502, {}, "bad gateway"))
+    sched, sleeps = _scheduler(retry_budget=2, max_retries=5, backoff=0.5)
+    assert sched.get(f"{stub_server.url}/x") is None
+    assert len(stub_server.requests) == 3
+    assert sleeps[0] < sleeps[1] * 1.5 + 0.75  # jittered, roughly doubling
+    assert sched.summary()["retry_budget_left"] == 0
+
+
+def test_permission_error_is_not_retried(stub_server):
+    stub_server.route("/x", lambda h: (403, _limit_headers(30), "Resource not accessible"))
+    sched, sleeps = _scheduler()
+    assert sched.get(f"{stub_server.url}/x") is None
+    assert sleeps == []
+    assert len(stub_server.requests) == 1
+    assert sched.summary()["skipped_sources"] == []  # a failure, not a rate-limit skip
+
+
+def test_permission_error_counts_against_source_health(stub_server, tmp_path, monkeypatch):
+    stub_server.route("/repos/o/private/releases", lambda h: (403, _limit_headers(30), "Resource not accessible"))
+    monkeypatch.setattr(ingest, "GITHUB_API", stub_server.url)
+    config = {"sources": {"github_releases": [{"owner": "o", "repo": "private", "topics": []}]}}
+    health = HealthStore(tmp_path / "health.json")
+    sched, _ = _scheduler()
+    stats = {}
+    ingest.ingest_all(config, stats=stats, scheduler=sched, health=health)
+    assert health.get("github:o/private")["failures"] == 1
+    assert stats["github"]["skipped_sources"] == []
+
+
+def test_rate_limited_give_up_is_listed_as_skipped(stub_server):
+    stub_server.route("/x", lambda h: (403, _limit_headers(0, reset_in=3600), "API rate limit exceeded"))
+    sched, sleeps = _scheduler(max_wait=60)
+    assert sched.get(f"{stub_server.url}/x", key="github:a/b") is None
+    assert sleeps == []
+    assert sched.summary()["skipped_sources"] == ["github:a/b"]
+
+
+def test_exhausted_budget_refuses_without_sending(stub_server):
+    stub_server.route("/x", lambda h: (200, _limit_headers(0, reset_in=3600), "[]"))
+    sched, sleeps = _scheduler(max_wait=60)
+    sched.get(f"{stub_server.url}/x", key="github:a/b")
+    assert sched.get(f"{stub_server.url}/x", key="github:c/d") is None
+    assert len(stub_server.requests) == 1
+    assert sleeps == []
+    assert sched.summary()["skipped_sources"] == ["github:c/d"]
+
+
+def test_short_reset_window_is_waited_out(stub_server):
+    stub_server.route("/x", lambda h: (200, _limit_headers(0, reset_in=5), "[]"))
+    sched, sleeps = _scheduler(max_wait=60)
+    sched.get(f"{stub_server.url}/x")
+    assert sched.get(f"{stub_server.url}/x") is not None
+    assert len(sleeps) == 1 and 0 < sleeps[0] <= 6
+
+
+def test_ingest_all_spends_short_budget_on_highest_value_source(stub_server, monkeypatch):
+    reset = int(time.time() + 3600)
+    stub_server.route("/rate_limit", lambda h: (
+        200, {}, json.dumps({"resources": {"core": {"limit": 60, "remaining": 1, "reset": reset}}}),
+    ))
+    for repo in ("low", "high"):
+        stub_server.route(f"/repos/o/{repo}/releases", lambda h: (200, _limit_headers(0), "[]"))
+    monkeypatch.setattr(ingest, "GITHUB_API", stub_server.url)
+
+    config = {"sources": {"github_releases": [
+        {"owner": "o", "repo": "low", "topics": []},
+        {"owner": "o", "repo": "high", "topics": [], "priority": 5},
+    ]}}
+    sched, _ = _scheduler()
+    stats = {}
+    ingest.ingest_all(config, stats=stats, scheduler=sched)
+
+    fetched = [path for _, path, _ in stub_server.requests if "/releases" in path]
+    assert fetched == ["/repos/o/high/releases?per_page=100"]
+    assert stats["github"]["skipped_sources"] == ["github:o/low"]
+    assert stats["github"]["remaining_at_start"] == 1
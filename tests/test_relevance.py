@@ -0,0 +1,80 @@
+"""Tests for BM25 topic relevance."""
+
+from datetime import datetime, timezone
+
+import pytest
+
+import pipeline.relevance as relevance_module
+from pipeline.rank import rank
+from pipeline.relevance import InvertedIndex, bm25_relevance, terms
+
+NOW = datetime(2026, 1, 10, tzinfo=timezone.utc)
+TOPICS = [
+    {"id": "mcp", "keywords": ["mcp", "model context protocol", "mcp server"]},
+    {"id": "azure-ai", "keywords": ["azure openai", "ai foundry"]},
+    {"id": "evals", "keywords": ["agent eval", "benchmark"]},
+    {"id": "empty"},
+]
+
+
+def _item(id_: str, title: str, snippet: str = "", topics=None) -> dict:
+    return {
+        "id": id_, "title": title, "snippet": snippet, "url": f"https://example.com/{id_}",
+        "published_at": "2026-01-09T00:00:00+00:00", "source": "test", "source_type": "rss",
+        "topics": topics or [], "score": 0.0,
+    }
+
+
+CORPUS = [
+    _item("mcp", "Model Context Protocol server released", "The new MCP server adds streaming."),
+    _item("azure", "Azure OpenAI pricing update", "Regional pricing changes."),
+    _item("weak", "Weekly digest", "A long roundup of many things, with a brief benchmark mention " + "filler " * 40),
+    _item("none", "Unrelated gardening tips", "Tomatoes and peppers."),
+]
+
+
+def test_terms_fold_case_and_split_punctuation():
+    assert terms("Multi-Agent: MCP_server, v1.2!") == ["multi", "agent", "mcp_server", "v1", "2"]
+
+
+def test_inverted_index_postings():
+    index = InvertedIndex([["a", "b", "a"], ["c"], ["a"]], frozenset({"a", "c", "z"}))
+    assert index.postings == {"a": ([0, 2], [2, 1]), "c": ([1], [1])}
+    assert index.doc_len == [3, 1, 1]
+    assert index.idf("a") < index.idf("c") < index.idf("z")
+
+
+def test_strong_match_scores_high_and_unrelated_zero():
+    rel = dict(zip((i["id"] for i in CORPUS), bm25_relevance(CORPUS, TOPICS)))
+    assert rel["mcp"] == pytest.approx(1.0)
+    assert rel["azure"] > 0.9
+    assert 0 < rel["weak"] < 0.7  # one mention in a long item is damped by length
+    assert rel["none"] == 0.0
+    assert all(0.0 <= r <= 1.0 for r in rel.values())
+
+
+def test_no_keywords_or_items():
+    assert bm25_relevance(CORPUS, [{"id": "x"}]) == [0.0] * len(CORPUS)
+    assert bm25_relevance([], TOPICS) == []
+
+
+def test_pure_python_path_matches_numpy(monkeypatch):
+    pytest.importorskip("numpy")
+    with_numpy = bm25_relevance(CORPUS * 3, TOPICS)
+    monkeypatch.setattr(relevance_module, "np", None)
+    assert bm25_relevance(CORPUS * 3, TOPICS) == pytest.approx(with_numpy)
+
+
+def test_rank_with_bm25_prefers_strong_single_topic_match():
+    items = [
+        _item("tagged", "Weekly digest", "nothing specific", topics=["mcp", "azure-ai", "evals"]),
+        _item("strong", "MCP server for model context protocol tools", topics=["mcp"]),
+    ]
+    config = {"topics": TOPICS, "ranking": {"relevance": "bm25"}}
+    assert rank([dict(i) for i in items], {"topics": TOPICS}, now=NOW)[0]["id"] == "tagged"
+    assert rank(items, config, now=NOW)[0]["id"] == "strong"
+
+
+def test_unknown_relevance_backend_is_rejected():
+    with pytest.raises(ValueError):
+        rank(list(CORPUS), {"topics": TOPICS, "ranking": {"relevance": "tfidf"}}, now=NOW)
@@ -0,0 +1,138 @@
+"""Tests for recording and replaying raw ingest responses."""
+
+import gzip
+import json
+import shutil
+import zipfile
+from pathlib import Path
+
+import pytest
+
+from pipeline import ingest, main, session
+from pipeline.replay import Recorder, Replayer, request_key
+
+
+@pytest.fixture(autouse=True)
+def _fresh_session():
+    yield
+    session.close()
+
+
+def _rss(n):
+    items = "".join(
+        f"<item><title>Post {i}</title><link>https://example.com/{i}</link>"
+        f"<pubDate>Mon, 02 Mar 2026 10:0{i % 10}:00 +0000</pubDate>"
+        f"<description>&lt;p&gt;Body {i}&lt;/p&gt;</description></item>"
+        for i in range(n)
+    )
+    return f"<rss><channel>{items}</channel></rss>"
+
+
+def _config(url):
+    return {
+        "ingest": {"max_workers": 2},
+        "sources": {"rss_feeds": [
+            {"url": f"{url}/feed", "name": "Blog", "topics": ["mcp"]},
+            {"url": f"{url}/gz", "name": "Gzip Blog", "topics": []},
+        ]},
+    }
+
+
+@pytest.fixture
+def feed_server(stub_server):
+    stub_server.route("/feed", lambda h: (200, {"Content-Type": "application/rss+xml"}, _rss(5)))
+    stub_server.route("/gz", lambda h: (200, {"Content-Encoding": "gzip"}, gzip.compress(_rss(3).encode())))
+    return stub_server
+
+
+def test_replay_reproduces_recorded_ingest_offline(feed_server, tmp_path):
+    archive = tmp_path / "run.zip"
+    config = _config(feed_server.url)
+    recorder = Recorder(archive)
+    recorded = ingest.ingest_all(config, transport=recorder)
+    recorder.save()
+    assert len(recorded) == 8 and len(recorder) == 2
+    feed_server.close()  # replay must not touch the network
+
+    replayer = Replayer(archive)
+    replayed = ingest.ingest_all(config, transport=replayer)
+    assert replayed == recorded
+    assert replayer.stats() == {"served": 2, "missed": 0}
+
+
+def test_archive_stores_decoded_bodies_without_wire_headers(feed_server, tmp_path):
+    archive = tmp_path / "run.zip"
+    recorder = Recorder(archive)
+    ingest.ingest_all(_config(feed_server.url), transport=recorder)
+    recorder.save()
+
+    with zipfile.ZipFile(archive) as zf:
+        index = json.loads(zf.read("index.json"))["responses"]
+        gz = next(r for r in index if r["key"].endswith("/gz"))
+        assert zf.read(gz["body"]).startswith(b"<rss>")
+    assert not any(k.lower() in ("content-encoding", "content-length") for k in gz["headers"])
+
+
+def test_missing_requests_fail_like_unavailable_sources(feed_server, tmp_path):
+    archive = tmp_path / "run.zip"
+    recorder = Recorder(archive)
+    recorder.install(session.configure())
+    session.get_session().get(f"{feed_server.url}/feed")
+    recorder.save()
+
+    replayer = Replayer(archive)
+    assert ingest.ingest_all(_config(feed_server.url), transport=replayer)[0]["source"] == "Blog"
+    assert replayer.stats() == {"served": 1, "missed": 1}
+
+
+def test_repeated_requests_replay_in_recorded_order(stub_server, tmp_path):
+    calls = []
+
+    def _count(h):
+        calls.append(1)
+        return 200, {}, str(len(calls))
+
+    stub_server.route("/n", _count)
+    recorder = Recorder(tmp_path / "run.zip")
+    recorder.install(session.configure())
+    for _ in range(2):
+        session.get_session().get(f"{stub_server.url}/n")
+    recorder.save()
+
+    replayer = Replayer(tmp_path / "run.zip")
+    replayer.install(session.configure())
+    bodies = [session.get_session().get(f"{stub_server.url}/n").text for _ in range(3)]
+    assert bodies == ["1", "2", "2"]
+
+
+def test_request_key_distinguishes_post_bodies():
+    url = "https://api.github.com/graphql"
+    assert request_key("post", url, b'{"a": 1}') != request_key("POST", url, b'{"a": 2}')
+    assert request_key("GET", url) == f"GET {url}"
+
+
+def test_replayed_run_leaves_reports_and_state_alone(feed_server, tmp_path, monkeypatch):
+    archive = tmp_path / "run.zip"
+    config = dict(_config(feed_server.url), topics=[{"id": "mcp", "display": "MCP"}])
+    recorder = Recorder(archive)
+    ingest.ingest_all(config, transport=recorder)
+    recorder.save()
+    feed_server.close()
+
+    work = tmp_path / "work"
+    work.mkdir()
+    monkeypatch.chdir(work)
+    summary = main.run(config, "2026-03-02", "2026-09", replay=archive)
+    scratch = Path(summary["outputs"]["daily"]).parents[2]
+    try:
+        assert scratch.name.startswith("replay-") and scratch != work
+        assert (scratch / "data" / "trends").is_dir()
+        assert list(work.iterdir()) == []  # no reports, trends, cursors, cache or seen index
+    finally:
+        shutil.rmtree(scratch)
+
+    out = tmp_path / "out"
+    summary = main.run(config, "2026-03-02", "2026-09", replay=archive, output_dir=out)
+    assert Path(summary["outputs"]["daily"]) == out / "reports" / "daily" / "2026-03-02.md"
+    assert summary["outputs"]["trends"] == str(out / "data" / "trends")  # export_json is off by default
+    assert list(work.iterdir()) == []
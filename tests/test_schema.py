@@ -2,6 +2,7 @@
 
 import json
 import tempfile
+from datetime import datetime, timezone
 from pathlib import Path
 
 import pytest
@@ -15,6 +16,7 @@ from pipeline.publish import (
     write_watchlist,
     write_weekly,
 )
+from pipeline.trends import TrendsStore
 
 # ---------------------------------------------------------------------------
 # Sample data
@@ -242,6 +244,30 @@ def test_write_trends_reruns_are_idempotent():
         assert data1["topics"]["mcp"]["total_items"] == data2["topics"]["mcp"]["total_items"]
 
 
+def test_write_trends_counts_items_only_on_their_first_sighting():
+    today = datetime.now(tz=timezone.utc).strftime("%Y-%m-%d")
+    items = [
+        dict(SAMPLE_ITEMS[0], topics=["mcp"], first_seen=f"{today}T06:00:00+00:00"),
+        dict(SAMPLE_ITEMS[0], topics=["mcp"], first_seen="2020-01-01T06:00:00+00:00"),
+        dict(SAMPLE_ITEMS[0], topics=["mcp"]),  # no seen index: always counted
+    ]
+    with tempfile.TemporaryDirectory() as tmpdir:
+        trends_path = str(Path(tmpdir) / "trends.json")
+        write_trends(items, trends_path=trends_path)
+        data = json.loads(Path(trends_path).read_text())
+        assert data["topics"]["mcp"]["daily"][today] == 2
+
+
+def test_write_trends_appends_to_the_store_without_export():
+    today = datetime.now(tz=timezone.utc).strftime("%Y-%m-%d")
+    with tempfile.TemporaryDirectory() as tmpdir:
+        trends_path = Path(tmpdir) / "trends.json"
+        store_dir = Path(tmpdir) / "store"
+        assert write_trends(SAMPLE_ITEMS, trends_path=str(trends_path), store_dir=str(store_dir), export=False) == store_dir
+        assert not trends_path.exists()
+        assert TrendsStore(store_dir).counts(today)["mcp"] >= 1
+
+
 # ---------------------------------------------------------------------------
 # write_watchlist
 # ---------------------------------------------------------------------------
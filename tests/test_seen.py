@@ -0,0 +1,96 @@
+"""Tests for the persistent seen-item index."""
+
+from datetime import datetime, timedelta, timezone
+
+import pytest
+
+import pipeline.seen as seen_module
+from pipeline.item import Item
+from pipeline.seen import SeenIndex, item_key
+from pipeline.urls import item_id
+
+NOW = datetime(2026, 3, 2, 12, tzinfo=timezone.utc)
+DAY = 86400
+
+
+def _items(n: int, start: int = 0) -> list:
+    return [Item(id=item_id(f"https://example.com/{i}"), title=str(i)) for i in range(start, start + n)]
+
+
+def test_item_key_uses_hex_ids_and_hashes_others():
+    assert item_key("00000000000000ff") == 255
+    assert item_key("0000000000000000") != 0
+    assert item_key("custom-id") == item_key("custom-id") != item_key("other-id")
+
+
+def test_observe_marks_new_items_and_first_seen(tmp_path):
+    index = SeenIndex(tmp_path / "seen.idx")
+    items = _items(3)
+    assert index.observe(items, NOW) == [True, True, True]
+    assert items[0]["first_seen"] == NOW.isoformat()
+    index.save(NOW.timestamp())
+
+    reopened = SeenIndex(tmp_path / "seen.idx")
+    later = _items(4)
+    # Same day (a rerun) still counts as a first sighting; the next day does not.
+    assert reopened.observe(later, NOW + timedelta(hours=2)) == [True, True, True, True]
+    next_day = SeenIndex(tmp_path / "seen.idx")
+    assert next_day.observe(later, NOW + timedelta(days=1)) == [False, False, False, True]
+    assert later[0]["first_seen"] == NOW.isoformat()
+    assert next_day.lookup(later[0]["id"]) == (int(NOW.timestamp()), int(NOW.timestamp()) + DAY)
+    assert later[3]["id"] in next_day and "0123456789abcdef" not in next_day
+
+
+def test_items_without_id_count_as_new(tmp_path):
+    index = SeenIndex(tmp_path / "seen.idx")
+    assert index.observe([{"title": "no id"}], NOW) == [True]
+    assert len(index) == 0
+
+
+def test_save_patches_in_place_and_grows_when_full(tmp_path):
+    path = tmp_path / "seen.idx"
+    index = SeenIndex(path)
+    index.observe(_items(100), NOW)
+    index.save(NOW.timestamp())
+    assert (index.capacity, len(index)) == (1024, 100)
+
+    index.observe(_items(300, start=100), NOW + timedelta(days=1))
+    index.save(NOW.timestamp() + DAY)  # patched: under the load limit, compacted recently
+    assert (index.capacity, len(index), index.compacted_at) == (1024, 400, NOW.timestamp())
+
+    index.observe(_items(600, start=400), NOW + timedelta(days=2))
+    index.save(NOW.timestamp() + 2 * DAY)  # 1000 > 70% of 1024: rebuilt larger
+    assert (index.capacity, len(index)) == (2048, 1000)
+    assert all(i["id"] in SeenIndex(path) for i in _items(1000))
+
+
+@pytest.mark.parametrize("use_numpy", [True, False])
+def test_compaction_drops_expired_ids(tmp_path, monkeypatch, use_numpy):
+    if use_numpy:
+        pytest.importorskip("numpy")
+    else:
+        monkeypatch.setattr(seen_module, "np", None)
+    index = SeenIndex(tmp_path / "seen.idx", retention_days=30)
+    old, recent = _items(500), _items(500, start=500)
+    index.observe(old, NOW)
+    index.save(NOW.timestamp())
+    index.observe(recent, NOW + timedelta(days=40))
+    index.compact(NOW.timestamp() + 40 * DAY)
+    assert len(index) == 500
+    assert not any(i["id"] in index for i in old)
+    assert all(index.lookup(i["id"])[0] == int(NOW.timestamp()) + 40 * DAY for i in recent)
+
+
+def test_unreadable_index_starts_empty(tmp_path):
+    path = tmp_path / "seen.idx"
+    path.write_bytes(b"not an index")
+    index = SeenIndex(path)
+    assert len(index) == 0
+    assert index.observe(_items(1), NOW) == [True]
+    index.save(NOW.timestamp())
+    assert len(SeenIndex(path)) == 1
+
+
+def test_from_config(tmp_path):
+    index = SeenIndex.from_config({"path": str(tmp_path / "s.idx"), "retention_days": 10})
+    assert index.path == tmp_path / "s.idx" and index.retention_days == 10.0
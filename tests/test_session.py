@@ -0,0 +1,43 @@
+"""Tests for the shared pooled HTTP session."""
+
+import pytest
+
+from pipeline import session
+
+
+@pytest.fixture(autouse=True)
+def _fresh_session():
+    session.close()
+    yield
+    session.close()
+
+
+def test_get_session_is_shared():
+    assert session.get_session() is session.get_session()
+
+
+def test_session_negotiates_gzip():
+    assert "gzip" in session.get_session().headers["Accept-Encoding"]
+
+
+def test_keep_alive_reuses_connections(stub_server):
+    stub_server.route("/feed", lambda h: (200, {"Content-Type": "text/plain"}, "ok"))
+    s = session.configure(pool_maxsize=2)
+    for _ in range(5):
+        assert s.get(f"{stub_server.url}/feed", timeout=5).text == "ok"
+
+    host = stub_server.url.split("//", 1)[1]
+    stats = session.connection_stats()[host]
+    assert stats["requests"] == 5
+    assert stats["new_connections"] == 1
+    assert stats["reused_connections"] == 4
+
+
+def test_host_pool_sizes_mount_dedicated_adapter(stub_server):
+    stub_server.route("/x", lambda h: (200, {}, "x"))
+    host = stub_server.url.split("//", 1)[1]
+    s = session.configure(pool_maxsize=1, host_pool_sizes={host: 8})
+    adapter = s.get_adapter(f"{stub_server.url}/x")
+    assert adapter._pool_maxsize == 8
+    s.get(f"{stub_server.url}/x", timeout=5)
+    assert session.connection_stats()[host]["requests"] == 1
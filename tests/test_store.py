@@ -0,0 +1,183 @@
+"""Tests for the SQLite item store."""
+
+import json
+import sqlite3
+from datetime import datetime, timedelta, timezone
+
+import pytest
+
+from pipeline import main
+from pipeline.item import Item
+from pipeline.store import ItemStore
+from pipeline.trends import TrendsStore
+
+NOW = datetime(2026, 3, 2, 12, tzinfo=timezone.utc)
+DAY = 86400
+
+
+def _item(n: int, days_ago: float, topics, score: float, **kw) -> Item:
+    ts = NOW.timestamp() - days_ago * DAY
+    return Item(
+        id=f"{n:016x}",
+        title=f"Item {n}",
+        url=f"https://example.com/{n}",
+        published_at=datetime.fromtimestamp(ts, tz=timezone.utc).isoformat(),
+        published_ts=ts,
+        source=kw.pop("source", "Example"),
+        source_type=kw.pop("source_type", "rss"),
+        topics=list(topics),
+        score=score,
+        **kw,
+    )
+
+
+@pytest.fixture
+def store(tmp_path):
+    with ItemStore(tmp_path / "items.sqlite") as opened:
+        yield opened
+
+
+def test_round_trip_keeps_fields_topics_and_extras(store):
+    item = _item(1, 0, ["mcp", "agents"], 0.8, why_it_matters="Why", first_seen=NOW.isoformat(), merged=["x"])
+    assert store.upsert([item]) == 1
+    assert store.get(item.id).to_dict() == item.to_dict()
+    assert store.get("missing") is None
+    assert len(store) == 1
+
+
+def test_round_trip_without_extras_adds_no_fields(store):
+    item = _item(1, 0, ["mcp"], 0.8)
+    store.upsert([item])
+    got = store.get(item.id)
+    assert "extra" not in got and not got.extra
+    assert got.to_dict() == item.to_dict()
+
+
+def test_accepts_plain_dicts_and_skips_items_without_id(store):
+    rows = [
+        {"id": "a", "published_at": "2026-03-01T00:00:00+00:00", "topics": ["mcp"], "score": 0.5, "note": "n"},
+        {"title": "no id"},
+    ]
+    assert store.upsert(rows) == 1
+    got = store.get("a")
+    assert got.published_ts == datetime(2026, 3, 1, tzinfo=timezone.utc).timestamp()
+    assert got["note"] == "n"
+
+
+def test_query_by_topic_and_window_orders_by_score(store):
+    store.upsert([
+        _item(1, 1, ["mcp"], 0.5),
+        _item(2, 2, ["mcp", "agents"], 0.9),
+        _item(3, 10, ["mcp"], 0.99),  # outside the window
+        _item(4, 3, ["agents"], 0.7),
+        _item(5, 4, ["mcp"], 0.5),  # tie with 1: the more recent first
+    ])
+    since = NOW - timedelta(days=7)
+    assert [i.title for i in store.query("mcp", since=since)] == ["Item 2", "Item 1", "Item 5"]
+    assert [i.title for i in store.query("mcp", since=since, limit=1)] == ["Item 2"]
+    assert [i.title for i in store.query("agents", since=since.timestamp(), min_score=0.8)] == ["Item 2"]
+    assert [i.title for i in store.query(since=since, until=NOW - timedelta(days=2))] == ["Item 4", "Item 5"]
+    assert [i.title for i in store.query(limit=None)][0] == "Item 3"
+    assert store.query("unknown") == []
+
+
+def test_query_filters_by_source_and_source_type(store):
+    store.upsert([
+        _item(1, 1, ["mcp"], 0.5, source="A", source_type="rss"),
+        _item(2, 1, ["mcp"], 0.6, source="B", source_type="github_release"),
+    ])
+    assert [i.title for i in store.query(source="A")] == ["Item 1"]
+    assert [i.title for i in store.query("mcp", source_type="github_release")] == ["Item 2"]
+
+
+def test_upsert_updates_score_and_topics_but_keeps_history(store):
+    store.upsert([_item(1, 1, ["mcp"], 0.5, why_it_matters="Why", first_seen="2026-03-01T00:00:00+00:00")])
+    store.upsert([_item(1, 1, ["agents"], 0.9, first_seen="2026-03-02T00:00:00+00:00")])
+    got = store.get(f"{1:016x}")
+    assert (got.score, got.topics, got.why_it_matters) == (0.9, ["agents"], "Why")
+    assert got["first_seen"] == "2026-03-01T00:00:00+00:00"
+    assert store.query("mcp") == []
+    assert store.topic_counts() == {"agents": 1}
+    assert len(store) == 1
+
+
+def test_topic_counts_and_prune(store):
+    store.upsert([_item(1, 1, ["mcp", "agents"], 0.5), _item(2, 40, ["mcp"], 0.5)])
+    assert store.topic_counts() == {"agents": 1, "mcp": 2}
+    assert store.topic_counts(since=NOW - timedelta(days=7)) == {"agents": 1, "mcp": 1}
+    assert store.prune(NOW - timedelta(days=30)) == 1
+    assert store.topic_counts() == {"agents": 1, "mcp": 1}
+    assert len(store) == 1
+
+
+def test_persists_across_reopen(tmp_path):
+    path = tmp_path / "state" / "items.sqlite"
+    with ItemStore.from_config({"path": str(path)}) as store:
+        store.upsert([_item(1, 1, ["mcp"], 0.5)])
+    with ItemStore(path) as reopened:
+        assert [i.title for i in reopened.query("mcp")] == ["Item 1"]
+
+
+def test_readonly_open_writes_nothing(tmp_path):
+    path = tmp_path / "items.sqlite"
+    with ItemStore(path) as store:
+        store.upsert([_item(1, 1, ["mcp"], 0.5)])
+    before = path.read_bytes()
+    with ItemStore(path, readonly=True) as reader:
+        assert [i.title for i in reader.query("mcp")] == ["Item 1"]
+        with pytest.raises(sqlite3.OperationalError):
+            reader.upsert([_item(2, 1, ["mcp"], 0.5)])
+    assert path.read_bytes() == before
+    with pytest.raises(sqlite3.OperationalError):
+        ItemStore(tmp_path / "missing.sqlite", readonly=True)
+    assert not (tmp_path / "missing.sqlite").exists()
+
+
+def test_topic_query_uses_the_topic_index(store):
+    plan = store._db.execute(
+        "EXPLAIN QUERY PLAN SELECT i.id FROM items i JOIN item_topics t ON t.item_id = i.id "
+        "WHERE t.topic = ? AND t.published_ts >= ? ORDER BY t.score DESC LIMIT 20",
+        ("mcp", 0.0),
+    ).fetchall()
+    assert "item_topics_recent" in " ".join(row[-1] for row in plan)
+
+
+def test_run_weekly_builds_the_week_from_the_store(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    config = {"topics": [{"id": "mcp"}, {"id": "agents"}], "store": {"path": "items.sqlite"}}
+    with ItemStore(tmp_path / "items.sqlite") as store:
+        # NOW is Monday 2026-03-02, the first day of week 2026-09.
+        store.upsert([
+            _item(1, -1, ["mcp"], 0.1),
+            _item(2, -6, ["agents"], 0.1),
+            _item(3, 1, ["mcp"], 0.9),  # the week before
+        ])
+
+    def _no_ingest(*args, **kwargs):
+        raise AssertionError("the weekly build fetched sources")
+
+    monkeypatch.setattr(main, "ingest_all", _no_ingest)
+    TrendsStore(tmp_path / "data" / "trends").record("2026-03-02", {"mcp": 2})
+    store_bytes = (tmp_path / "items.sqlite").read_bytes()
+    summary = main.run_weekly(config, "2026-09", now=NOW + timedelta(days=30))
+    assert summary["items_in_week"] == 2
+    report = (tmp_path / summary["outputs"]["weekly"]).read_text(encoding="utf-8")
+    assert "Week 2026-09" in report and "Item 1" in report and "Item 2" in report and "Item 3" not in report
+    trends = json.loads((tmp_path / summary["outputs"]["trends"]).read_text(encoding="utf-8"))
+    assert trends["topics"]["mcp"] == {"total_items": 2, "daily": {"2026-03-02": 2}}
+    assert (tmp_path / "items.sqlite").read_bytes() == store_bytes  # opened read-only
+    with ItemStore(tmp_path / "items.sqlite") as store:
+        assert store.get(f"{1:016x}").score == 0.1  # reranking does not write back
+
+    # Rebuilding a finished week later gives the same report (past the generated-at line).
+    first = report.split("\n", 2)[2]
+    again = main.run_weekly(config, "2026-09", now=NOW + timedelta(days=60))
+    assert (tmp_path / again["outputs"]["weekly"]).read_text(encoding="utf-8").split("\n", 2)[2] == first
+
+
+def test_run_weekly_without_a_store_writes_an_empty_report(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    summary = main.run_weekly({"topics": []}, "2026-09")
+    assert summary["items_in_week"] == 0 and summary["outputs"]["trends"] is None
+    assert not (tmp_path / "data" / "trends.json").exists()
+    assert not (tmp_path / "data" / "state" / "items.sqlite").exists()
@@ -0,0 +1,71 @@
+"""Tests for the HTML and markdown snippet extractors."""
+
+from pipeline.text import html_snippet, markdown_snippet
+
+
+def test_html_snippet_strips_tags_and_decodes_entities():
+    markup = "<p>Copilot&nbsp;&amp; <b>agents</b></p>\n\n<p>now&#8217;s  the &lt;time&gt;</p>"
+    assert html_snippet(markup) == "Copilot & agents now’s the <time>"
+
+
+def test_html_snippet_separates_block_elements_but_not_inline_ones():
+    assert html_snippet("<li>one</li><li>two</li>") == "one two"
+    assert html_snippet("re<em>lease</em>d") == "released"
+
+
+def test_html_snippet_drops_comments_scripts_and_styles():
+    markup = "a<!-- hidden --> <script>if (x < 1) {}</script><style>p{}</style>b"
+    assert html_snippet(markup) == "a b"
+
+
+def test_html_snippet_keeps_literal_less_than():
+    assert html_snippet("latency < 10 ms") == "latency < 10 ms"
+
+
+def test_html_snippet_keeps_unclosed_less_than_before_letters():
+    assert html_snippet("a x<y comparison") == "a x<y comparison"
+    assert html_snippet("when a<b holds, <b>bold</b> too") == "when a<b holds, bold too"
+
+
+def test_html_snippet_stops_at_limit():
+    assert html_snippet("<p>" + "word " * 10_000 + "</p>", limit=14) == "word word word"
+    assert len(html_snippet("x" * 10_000, limit=400)) == 400
+
+
+def test_html_snippet_never_splits_an_entity_at_the_window_edge():
+    assert html_snippet("x" * 50 + "&amp;" + "y" * 50, limit=53) == "x" * 50 + "&yy"
+
+
+def test_html_snippet_handles_truncated_markup():
+    assert html_snippet("text <a href='unterminated") == "text"
+    assert html_snippet("text <scr") == "text"
+    assert html_snippet("") == ""
+
+
+def test_markdown_snippet_removes_syntax():
+    body = (
+        "## What's Changed\n\n"
+        "* Fix **bold** handling in `parser` by @dev in [#12](https://github.com/o/r/pull/12)\n"
+        "- [x] keep snake_case_names\n"
+        "> quoted\n"
+        "```\ncode\n```\n"
+        "![diagram](https://x/img.png) <https://example.com>\n"
+        "<!-- release-drafter\nmetadata -->\n"
+        "| a | b |\n|---|---|\n"
+    )
+    assert markdown_snippet(body) == (
+        "What's Changed Fix bold handling in parser by @dev in #12 keep snake_case_names "
+        "quoted code diagram https://example.com a b"
+    )
+
+
+def test_markdown_snippet_keeps_code_spans_literal():
+    assert markdown_snippet("Use `Vec<T>` here") == "Use Vec<T> here"
+    assert markdown_snippet("Returns `Result<T, E>` now") == "Returns Result<T, E> now"
+    assert markdown_snippet("Accept `**kwargs` and `a_b` in ``x`y``, not *this*") == "Accept **kwargs and a_b in x`y, not this"
+    assert markdown_snippet("`&amp;` and <b>html</b>") == "&amp; and html"
+
+
+def test_markdown_snippet_reads_past_long_markup():
+    body = "<!--\n" + "x\n" * 5_000 + "-->\nVisible notes"
+    assert markdown_snippet(body, limit=20) == "Visible notes"
@@ -0,0 +1,106 @@
+"""Tests for the append-only trends store."""
+
+import json
+import multiprocessing
+
+import pytest
+
+from pipeline.trends import TrendsStore
+
+
+@pytest.fixture
+def store(tmp_path):
+    return TrendsStore(tmp_path / "trends")
+
+
+def test_record_keeps_running_totals_and_monthly_segments(store):
+    store.record("2026-02-27", {"mcp": 2, "agents": 1})
+    store.record("2026-03-01", {"mcp": 3})
+    assert store.totals() == {"mcp": 5, "agents": 1}
+    assert store.last_updated == "2026-03-01"
+    assert sorted(p.name for p in store.path.glob("*.jsonl")) == ["2026-02.jsonl", "2026-03.jsonl"]
+    assert list(store.history()) == [("2026-02-27", {"agents": 1, "mcp": 2}), ("2026-03-01", {"mcp": 3})]
+    assert list(store.history(since="2026-03-01")) == [("2026-03-01", {"mcp": 3})]
+
+
+def test_same_day_rerun_replaces_the_day(store):
+    store.record("2026-03-01", {"mcp": 3, "agents": 1})
+    store.record("2026-03-01", {"mcp": 4})
+    assert store.totals() == {"mcp": 4}
+    assert store.counts("2026-03-01") == {"mcp": 4}
+    # Appended, not rewritten.
+    assert len((store.path / "2026-03.jsonl").read_text().splitlines()) == 2
+
+
+def test_backfilling_an_older_day_adjusts_totals(store):
+    store.record("2026-03-01", {"mcp": 3})
+    store.record("2026-03-02", {"mcp": 1})
+    store.record("2026-03-01", {"mcp": 1})
+    assert store.totals() == {"mcp": 2}
+    assert store.last_updated == "2026-03-02"
+
+
+def test_totals_persist_and_rebuild_matches(store):
+    store.record("2026-02-27", {"mcp": 2})
+    store.record("2026-03-01", {"mcp": 3, "agents": 1})
+    reopened = TrendsStore(store.path)
+    assert reopened.totals() == {"mcp": 5, "agents": 1}
+    reopened.rebuild()
+    assert reopened.totals() == {"mcp": 5, "agents": 1} and len(reopened) == 2
+
+
+def test_interrupted_update_is_completed_by_the_next_run(store):
+    store.record("2026-03-01", {"mcp": 3})
+    # Simulate a run that died after marking its record pending, before appending it.
+    state = json.loads((store.path / "totals.json").read_text())
+    state["pending"] = {"seq": state["seq"] + 1, "date": "2026-03-01", "counts": {"mcp": 5}}
+    (store.path / "totals.json").write_text(json.dumps(state))
+    with open(store.path / "2026-03.jsonl", "a") as fh:
+        fh.write('{"seq": 9, "date": "2026-03-0')  # and a torn line
+
+    reopened = TrendsStore(store.path)
+    reopened.record("2026-03-02", {"agents": 1})
+    assert reopened.totals() == {"mcp": 5, "agents": 1}
+    assert list(reopened.history()) == [("2026-03-01", {"mcp": 5}), ("2026-03-02", {"agents": 1})]
+
+
+def test_unreadable_totals_are_rebuilt(store):
+    store.record("2026-03-01", {"mcp": 3})
+    (store.path / "totals.json").write_text("{")
+    assert TrendsStore(store.path).totals() == {"mcp": 3}
+
+
+def test_export_and_import_round_trip_the_json_schema(store, tmp_path):
+    store.record("2026-02-27", {"mcp": 2})
+    store.record("2026-03-01", {"mcp": 3, "agents": 1})
+    exported = store.export()
+    assert exported == {
+        "last_updated": "2026-03-01",
+        "schema_version": "1",
+        "topics": {
+            "agents": {"total_items": 1, "daily": {"2026-03-01": 1}},
+            "mcp": {"total_items": 5, "daily": {"2026-02-27": 2, "2026-03-01": 3}},
+        },
+    }
+    copy = TrendsStore(tmp_path / "copy")
+    copy.import_json(exported)
+    assert copy.export() == exported
+
+
+def _record_many(path, worker):
+    store = TrendsStore(path)
+    for day in range(1, 11):
+        store.record(f"2026-03-{worker * 10 + day:02d}", {"mcp": 1})
+
+
+def test_concurrent_writers_do_not_lose_updates(tmp_path):
+    ctx = multiprocessing.get_context("fork") if "fork" in multiprocessing.get_all_start_methods() else None
+    if ctx is None:
+        pytest.skip("needs fork")
+    procs = [ctx.Process(target=_record_many, args=(tmp_path / "trends", w)) for w in range(3)]
+    for p in procs:
+        p.start()
+    for p in procs:
+        p.join()
+    store = TrendsStore(tmp_path / "trends")
+    assert store.totals() == {"mcp": 30} and len(store) == 30
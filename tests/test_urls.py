@@ -0,0 +1,67 @@
+"""Tests for URL canonicalization."""
+
+import pytest
+
+from pipeline import urls
+from pipeline.dedupe import dedupe
+from pipeline.normalize import normalize_all
+
+
+@pytest.mark.parametrize("raw, expected", [
+    ("https://example.com/page?a=1&utm_source=x&b=2", "https://example.com/page?a=1&b=2"),
+    ("https://example.com/page?utm_source=x&utm_medium=y", "https://example.com/page"),
+    ("HTTPS://Example.COM:443/Path/", "https://example.com/Path"),
+    ("http://example.com:80", "http://example.com/"),
+    ("http://example.com:8080/x", "http://example.com:8080/x"),
+    ("https://example.com./a/./b/../c", "https://example.com/a/c"),
+    ("https://example.com/post#comments", "https://example.com/post"),
+    ("https://example.com/?b=2&a=1&&", "https://example.com/?a=1&b=2"),
+    ("https://example.com/%7euser/a%2fb", "https://example.com/~user/a%2Fb"),
+    ("https://example.com/x?fbclid=abc&id=7", "https://example.com/x?id=7"),
+    ("  https://example.com/x  ", "https://example.com/x"),
+    ("mailto:someone@example.com", "mailto:someone@example.com"),
+    ("", ""),
+])
+def test_generic_canonicalization(raw, expected):
+    assert urls.canonical_url(raw) == expected
+
+
+@pytest.mark.parametrize("raw, expected", [
+    ("http://www.github.com/Microsoft/VSCode/releases/1.90.0?tab=x",
+     "https://github.com/microsoft/vscode/releases/tag/1.90.0"),
+    ("https://github.com/o/r/releases/tag/v1/", "https://github.com/o/r/releases/tag/v1"),
+    ("https://GitHub.com/O/R/releases/v1/#assets", "https://github.com/o/r/releases/tag/v1"),
+    ("https://github.com/o/r/releases/latest", "https://github.com/o/r/releases/latest"),
+    ("https://devblogs.microsoft.com/azure-ai/some-post/amp/?utm_source=rss&p=42",
+     "https://devblogs.microsoft.com/azure-ai/some-post?p=42"),
+    ("http://devblogs.microsoft.com/azure-ai/some-post/feed/", "https://devblogs.microsoft.com/azure-ai/some-post"),
+])
+def test_builtin_host_rules(raw, expected):
+    assert urls.canonical_url(raw) == expected
+
+
+def test_configured_rules_and_memo():
+    canon = urls.Canonicalizer.from_config({
+        "strip_params": ["session"],
+        "hosts": {"example.com": {"keep_params": ["id"], "path_rewrites": [["^/amp", ""]]}},
+        "cache_size": 2,
+    })
+    assert canon.canonicalize("https://example.com/amp/x?id=1&z=2") == "https://example.com/x?id=1"
+    assert canon.canonicalize("https://other.org/?session=1&utm_source=y") == "https://other.org/?utm_source=y"
+    canon.canonicalize("https://example.com/amp/x?id=1&z=2")
+    assert canon.cache_info().hits == 1
+    assert canon.cache_info().maxsize == 2
+
+
+def test_item_id_follows_canonical_form():
+    a, id_a = urls.canonical_with_id("https://Example.com/post?utm_source=rss")
+    b, id_b = urls.canonical_with_id("https://example.com/post/#top")
+    assert a == b and id_a == id_b == urls.item_id(a)
+
+
+def test_variants_now_collapse_in_dedupe():
+    raws = [
+        {"url": "https://github.com/Acme/Tool/releases/v2", "title": "Tool v2"},
+        {"url": "https://github.com/acme/tool/releases/tag/v2?utm_source=feed", "title": "Release v2 of Tool"},
+    ]
+    assert len(dedupe(normalize_all(raws))) == 1